@@ -1,21 +1,46 @@
-import os
-from contextlib import asynccontextmanager
+import time
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+# Vor allen anderen Imports, damit Startup.recordImport die ganze Importdauer
+# inkl. FastAPI misst; deshalb stehen die Imports darunter mit noqa: E402
+_importStart = time.perf_counter()
 
-from core.Database import initDB
-from routes.AuthRoutes import router as auth_router
-from routes.UserRoutes import router as users_router
-from routes.RecipeRoutes import router as recipes_router
+import os  # noqa: E402
+from contextlib import asynccontextmanager  # noqa: E402
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+
+from core import Catalogue, Replication, Startup  # noqa: E402
+from core.Database import closeReader, closeWriter  # noqa: E402
+from core.Metrics import MetricsMiddleware  # noqa: E402
+from core.Profiler import ProfilingMiddleware  # noqa: E402
+from routes.AuthRoutes import router as auth_router  # noqa: E402
+from routes.UserRoutes import router as users_router  # noqa: E402
+from routes.RecipeRoutes import router as recipes_router  # noqa: E402
+from routes.FavoriteRoutes import router as favorites_router  # noqa: E402
+from routes.AuthorRoutes import router as authors_router  # noqa: E402
+from routes.ShoppingListRoutes import router as shopping_list_router  # noqa: E402
+from routes.MetricsRoutes import router as metrics_router  # noqa: E402
+from routes.DebugRoutes import router as debug_router  # noqa: E402
+from routes.ExportRoutes import router as export_router  # noqa: E402
+from routes.HealthRoutes import router as health_router  # noqa: E402
+from routes.ReplicationRoutes import router as replication_router  # noqa: E402
 
 FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:8000")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    initDB()
+    Startup.startWorker()
+    Catalogue.startPolling()
+    Replication.startPolling()
+    Startup.markReady()
     yield
+    Startup.markNotReady()
+    Replication.stopPolling()
+    Catalogue.stopPolling()
+    closeWriter()
+    closeReader()
 
 
 app = FastAPI(title="LazyCook", lifespan=lifespan)
@@ -27,7 +52,20 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(Replication.ReplicaForwardMiddleware)
 
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(recipes_router)
+app.include_router(favorites_router)
+app.include_router(authors_router)
+app.include_router(shopping_list_router)
+app.include_router(metrics_router)
+app.include_router(debug_router)
+app.include_router(export_router)
+app.include_router(health_router)
+app.include_router(replication_router)
+
+Startup.recordImport(time.perf_counter() - _importStart)
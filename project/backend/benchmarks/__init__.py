@@ -0,0 +1,3 @@
+"""
+benchmarks – Reproduzierbare Lastmessungen für Suche, Auth und DAO-Hotpaths
+"""
@@ -0,0 +1,120 @@
+"""
+catalogue.py – Erzeugt synthetische Rezeptkataloge aus der Verteilung in recipes_metric.json
+
+Aus dem echten Import werden Zutatenanzahl pro Rezept, Zutatenhäufigkeit, Mengen,
+Einheiten und Beschreibungen übernommen; Zutaten unter ihrem kanonischen Namen
+wie nach der Migration in core.Database. Mit festem Seed entsteht bei gleicher
+Größe immer derselbe Katalog.
+"""
+
+import json
+import random
+import re
+import sqlite3
+from pathlib import Path
+
+from domain.canonical import canonicalName
+from domain.duration import estimateMinutes
+
+SOURCE_PATH = (
+    Path(__file__).parent.parent.parent / "ImportRecipes" / "recipes_metric.json"
+)
+
+_INGREDIENT_RE = re.compile(r"^(\d+(?:[.,]\d+)?)\s+(g|kg|ml|l|Stück)\s+(.+)$")
+
+
+class Distribution:
+    """Empirische Verteilung des echten Rezeptimports."""
+
+    def __init__(self, source: Path = SOURCE_PATH):
+        raw = json.loads(source.read_text(encoding="utf-8"))
+        self.names = [r["Name"] for r in raw]
+        self.descriptions = [r["Description"] for r in raw]
+        self.ingredientCounts = []
+        frequency: dict[str, int] = {}
+        self.units: dict[str, str] = {}
+        self.amounts: dict[str, list[float]] = {}
+        for recipe in raw:
+            parsed = [_parseIngredient(line) for line in recipe["Ingredients"]]
+            parsed = [p for p in parsed if p]
+            self.ingredientCounts.append(len(parsed))
+            for amount, unit, name in parsed:
+                frequency[name] = frequency.get(name, 0) + 1
+                self.units.setdefault(name, unit)
+                self.amounts.setdefault(name, []).append(amount)
+        self.vocabulary = sorted(frequency)
+        self.weights = [frequency[name] for name in self.vocabulary]
+
+
+def _parseIngredient(line: str) -> tuple[float, str, str] | None:
+    match = _INGREDIENT_RE.match(line.strip())
+    if not match:
+        return None
+    amount = float(match.group(1).replace(",", "."))
+    unit = match.group(2)
+    if unit == "kg":
+        amount, unit = amount * 1000, "g"
+    elif unit == "l":
+        amount, unit = amount * 1000, "ml"
+    name = canonicalName(match.group(3).replace(",", "").strip())
+    return amount, unit, name
+
+
+def generateCatalogue(
+    dbPath: Path, size: int, seed: int = 42, distribution: Distribution | None = None
+) -> dict:
+    """
+    Befüllt eine (per initDB angelegte) Datenbank mit `size` synthetischen Rezepten.
+    Gibt Kennzahlen des erzeugten Katalogs zurück.
+    """
+    distribution = distribution or Distribution()
+    rng = random.Random(seed)
+
+    con = sqlite3.connect(str(dbPath))
+    try:
+        cur = con.cursor()
+        cur.executemany(
+            "INSERT OR IGNORE INTO Ingredient (name, amountType) VALUES (?, ?)",
+            [(n, distribution.units[n]) for n in distribution.vocabulary],
+        )
+        ids = dict(cur.execute("SELECT name, id FROM Ingredient").fetchall())
+
+        recipes = []
+        links = []
+        for rid in range(1, size + 1):
+            name = f"{rng.choice(distribution.names)} #{rid}"
+            description = rng.choice(distribution.descriptions)
+            recipes.append((rid, name, description, estimateMinutes(description)))
+            count = max(1, rng.choice(distribution.ingredientCounts))
+            chosen = set()
+            while len(chosen) < count:
+                chosen.update(
+                    rng.choices(distribution.vocabulary, distribution.weights, k=count)
+                )
+            for ingredient in list(chosen)[:count]:
+                amount = rng.choice(distribution.amounts[ingredient])
+                links.append(
+                    (ids[ingredient], rid, amount, distribution.units[ingredient])
+                )
+
+        cur.executemany(
+            "INSERT INTO Recipe (id, name, description, durationMinutes) "
+            "VALUES (?, ?, ?, ?)",
+            recipes,
+        )
+        cur.executemany(
+            "INSERT INTO Exists_from (zid, rid, amount, amountType) "
+            "VALUES (?, ?, ?, ?)",
+            links,
+        )
+        cur.execute("UPDATE CatalogueVersion SET version = version + 1 WHERE id = 1")
+        con.commit()
+    finally:
+        con.close()
+
+    return {
+        "recipes": size,
+        "ingredients": len(distribution.vocabulary),
+        "links": len(links),
+        "seed": seed,
+    }
@@ -0,0 +1,53 @@
+"""
+compare.py – Vergleicht zwei Benchmark-Ergebnisse (z.B. zweier Commits)
+
+Aufruf aus project/backend:
+    python -m benchmarks.compare results/alt.json results/neu.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+
+def compareResults(old: dict, new: dict, metric: str = "p50Ms") -> list[dict]:
+    """Gibt pro (Größe, Benchmark) die Werte beider Läufe und deren Verhältnis zurück."""
+    rows = []
+    for size, newSize in new["sizes"].items():
+        oldBenchmarks = old["sizes"].get(size, {}).get("benchmarks", {})
+        for name, stats in newSize["benchmarks"].items():
+            before = oldBenchmarks.get(name, {}).get(metric)
+            after = stats[metric]
+            rows.append(
+                {
+                    "size": int(size),
+                    "benchmark": name,
+                    "old": before,
+                    "new": after,
+                    "ratio": after / before if before else None,
+                }
+            )
+    return rows
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Vergleicht zwei Benchmark-Läufe")
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--metric", default="p50Ms")
+    args = parser.parse_args(argv)
+
+    old = json.loads(args.old.read_text(encoding="utf-8"))
+    new = json.loads(args.new.read_text(encoding="utf-8"))
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']} ({args.metric})")
+    for row in compareResults(old, new, args.metric):
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] else "neu"
+        before = f"{row['old']:.2f}" if row["old"] is not None else "-"
+        print(
+            f"{row['size']:>7} {row['benchmark']:34s} "
+            f"{before:>10} -> {row['new']:10.2f}  {ratio}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+run.py – Führt die Benchmarks aus und speichert die Ergebnisse als JSON
+
+Aufruf aus project/backend:
+    python -m benchmarks.run --sizes 1000 10000 100000 --concurrency 8
+
+Für jede Katalog-Größe wird eine eigene temporäre Datenbank erzeugt. Gemessen
+werden die Such-Services direkt, die DAO-Aufrufe parallel in Threads sowie
+Login, Refresh und Suche über die ASGI-App im selben Prozess.
+"""
+
+import os
+
+if not os.environ.get("JWT_SECRET_KEY"):
+    os.environ["JWT_SECRET_KEY"] = "benchmark-secret-key"
+# Die Login-Messung würde sonst selbst das Rate-Limit auslösen
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+# core liest die Umgebung beim Import, deshalb stehen die Imports darunter mit
+# noqa: E402
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import random  # noqa: E402
+import subprocess  # noqa: E402
+import tempfile  # noqa: E402
+import time  # noqa: E402
+from concurrent.futures import ThreadPoolExecutor  # noqa: E402
+from datetime import datetime, timezone  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+import httpx  # noqa: E402
+
+import core.Database as Database  # noqa: E402
+from core import Catalogue  # noqa: E402
+from benchmarks.catalogue import Distribution, generateCatalogue  # noqa: E402
+from dao import AccountDAO, IngredientDAO, RecipeDAO  # noqa: E402
+from domain.ingredient import Ingredient  # noqa: E402
+from services import AuthService, UserService  # noqa: E402
+from services.RecipeSUCUK import findRecipes, getMatchingRecipeNames  # noqa: E402
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "Benchmark1!"
+# Zeitfilter der gefilterten Suche, etwa das untere Drittel des echten Katalogs
+BENCH_MAX_DURATION = 30
+
+
+# ── Statistik ──────────────────────────────────────────────────
+
+
+def summarize(samples: list[float], wall: float) -> dict:
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    return {
+        "n": len(ordered),
+        "meanMs": sum(ordered) / len(ordered) * 1000,
+        "p50Ms": pct(0.50) * 1000,
+        "p95Ms": pct(0.95) * 1000,
+        "p99Ms": pct(0.99) * 1000,
+        "minMs": ordered[0] * 1000,
+        "maxMs": ordered[-1] * 1000,
+        "throughputPerSec": len(ordered) / wall if wall > 0 else 0.0,
+    }
+
+
+def measure(fn, iterations: int) -> dict:
+    samples = []
+    wallStart = time.perf_counter()
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, time.perf_counter() - wallStart)
+
+
+def measureThreaded(fn, iterations: int, concurrency: int) -> dict:
+    def timedCall(i):
+        start = time.perf_counter()
+        fn(i)
+        return time.perf_counter() - start
+
+    wallStart = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(timedCall, range(iterations)))
+    return summarize(samples, time.perf_counter() - wallStart)
+
+
+async def measureAsgi(sendRequest, iterations: int, concurrency: int) -> dict:
+    samples = []
+    counter = iter(range(iterations))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            response = await sendRequest(i)
+            response.raise_for_status()
+            samples.append(time.perf_counter() - start)
+
+    wallStart = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, time.perf_counter() - wallStart)
+
+
+# ── Szenarien ──────────────────────────────────────────────────
+
+
+def _searchQueries(distribution: Distribution, count: int, seed: int) -> list[list]:
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        names = rng.choices(distribution.vocabulary, distribution.weights, k=4)
+        queries.append([(name, distribution.units[name]) for name in names])
+    return queries
+
+
+def runServiceBenchmarks(distribution, iterations: int, seed: int) -> dict:
+    queries = _searchQueries(distribution, iterations, seed)
+    terms = [name.split()[0].lower() for name in distribution.names[:iterations]]
+    return {
+        "findRecipes": measure(
+            lambda i: findRecipes(
+                [Ingredient(name, 1.0) for name, _ in queries[i % len(queries)]], 0
+            ),
+            iterations,
+        ),
+        "findRecipes.maxDuration": measure(
+            lambda i: findRecipes(
+                [Ingredient(name, 1.0) for name, _ in queries[i % len(queries)]],
+                0,
+                maxDuration=BENCH_MAX_DURATION,
+            ),
+            iterations,
+        ),
+        "getMatchingRecipeNames": measure(
+            lambda i: getMatchingRecipeNames(terms[i % len(terms)]), iterations
+        ),
+    }
+
+
+def runDaoBenchmarks(distribution, accountId: int, iterations: int, concurrency: int):
+    names = distribution.vocabulary
+    return {
+        "dao.getAccountByEmail": measureThreaded(
+            lambda i: AccountDAO.getAccountByEmail(BENCH_EMAIL), iterations, concurrency
+        ),
+        "dao.incrementIngredientUsage": measureThreaded(
+            lambda i: IngredientDAO.incrementIngredientUsage(
+                accountId, names[i % len(names)], "g"
+            ),
+            iterations,
+            concurrency,
+        ),
+        "dao.getTopIngredients": measureThreaded(
+            lambda i: IngredientDAO.getTopIngredients(accountId),
+            iterations,
+            concurrency,
+        ),
+        "dao.getAllRecipesWithIngredients": measureThreaded(
+            lambda i: RecipeDAO.getAllRecipesWithIngredients(),
+            max(1, iterations // 4),
+            concurrency,
+        ),
+    }
+
+
+async def runAsgiBenchmarks(
+    distribution, accountId: int, iterations: int, concurrency: int, seed: int
+) -> dict:
+    from LazyCookAdministration import app
+
+    loginIterations = max(1, iterations // 4)  # bcrypt dominiert, daher weniger Runden
+    refreshTokens = [
+        AuthService.createRefreshToken(accountId) for _ in range(iterations)
+    ]
+    queries = _searchQueries(distribution, iterations, seed + 1)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        login = await client.post(
+            "/auth/login", data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD}
+        )
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        return {
+            "asgi.login": await measureAsgi(
+                lambda i: client.post(
+                    "/auth/login",
+                    data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD},
+                ),
+                loginIterations,
+                concurrency,
+            ),
+            "asgi.refresh": await measureAsgi(
+                lambda i: client.post(
+                    "/auth/refresh", json={"refresh_token": refreshTokens[i]}
+                ),
+                iterations,
+                concurrency,
+            ),
+            "asgi.search": await measureAsgi(
+                lambda i: client.post(
+                    "/recipes/search",
+                    headers=headers,
+                    json={
+                        "zutaten": [
+                            {"name": name, "amount": 1, "unit": unit}
+                            for name, unit in queries[i % len(queries)]
+                        ],
+                        "servings": 1,
+                        "index": 0,
+                    },
+                ),
+                iterations,
+                concurrency,
+            ),
+        }
+
+
+def runSize(size: int, args, distribution: Distribution) -> dict:
+    with tempfile.TemporaryDirectory(prefix="lazycook-bench-") as tmp:
+        Database.DB_PATH = Path(tmp) / "bench.sqlite3"
+        Database.initDB()
+        start = time.perf_counter()
+        catalogue = generateCatalogue(
+            Database.DB_PATH, size, seed=args.seed, distribution=distribution
+        )
+        catalogue["generationSec"] = time.perf_counter() - start
+        # In-Memory-Strukturen der vorherigen Katalog-Größe verwerfen
+        Catalogue.reset()
+
+        account = UserService.register(BENCH_EMAIL, "Benchmark", BENCH_PASSWORD)
+
+        benchmarks = {}
+        benchmarks.update(
+            runServiceBenchmarks(distribution, args.iterations, args.seed)
+        )
+        benchmarks.update(
+            runDaoBenchmarks(
+                distribution, account["id"], args.iterations, args.concurrency
+            )
+        )
+        benchmarks.update(
+            asyncio.run(
+                runAsgiBenchmarks(
+                    distribution,
+                    account["id"],
+                    args.iterations,
+                    args.concurrency,
+                    args.seed,
+                )
+            )
+        )
+        return {"catalogue": catalogue, "benchmarks": benchmarks}
+
+
+def _gitCommit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> Path:
+    parser = argparse.ArgumentParser(description="LazyCook Benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    distribution = Distribution()
+    commit = _gitCommit()
+    result = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "sizes": {},
+    }
+    for size in args.sizes:
+        print(f"Katalog mit {size} Rezepten …", flush=True)
+        result["sizes"][str(size)] = runSize(size, args, distribution)
+        for name, stats in result["sizes"][str(size)]["benchmarks"].items():
+            print(
+                f"  {name:34s} p50 {stats['p50Ms']:9.2f} ms  p95 {stats['p95Ms']:9.2f} ms"
+            )
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = RESULTS_DIR / f"{stamp}-{commit or 'nocommit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"Ergebnisse gespeichert: {output}")
+    return output
+
+
+if __name__ == "__main__":
+    main()
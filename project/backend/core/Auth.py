@@ -4,10 +4,11 @@ Auth.py – Kryptographie, Validierung, JWT-Encoding und FastAPI-Dependency
 
 import re
 import os
+import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 import bcrypt
@@ -19,6 +20,8 @@ from dao import AccountDAO
 SECRET_KEY = os.environ.get("JWT_SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 10
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+REPLICATION_TOKEN = os.environ.get("REPLICATION_TOKEN")
 
 if not SECRET_KEY:
     raise RuntimeError("JWT_SECRET_KEY ist nicht gesetzt!")
@@ -95,3 +98,46 @@ async def getCurrentUser(token: Annotated[str, Depends(oauth2_scheme)]) -> User:
         raise credentials_exception
 
     return User(email=konto["email"], name=konto["name"])
+
+
+def getAccountId(currentUser: User) -> int:
+    """ID des Accounts hinter currentUser, 404 falls er inzwischen gelöscht wurde."""
+    account = AccountDAO.getAccountByEmail(currentUser.email)
+    if account is None:
+        raise HTTPException(status_code=404, detail="Account nicht gefunden")
+    return account["id"]
+
+
+async def requireAdmin(
+    adminToken: Annotated[str | None, Header(alias="X-Admin-Token")] = None,
+    authorization: Annotated[str | None, Header()] = None,
+) -> None:
+    """
+    Schützt Betriebs-Endpunkte. Ohne gesetztes ADMIN_TOKEN sind sie gesperrt.
+    Statt X-Admin-Token geht auch "Authorization: Bearer <ADMIN_TOKEN>", so wie
+    Prometheus es beim Scrapen mitschickt.
+    """
+    if adminToken is None and authorization and authorization.startswith("Bearer "):
+        adminToken = authorization.removeprefix("Bearer ")
+    if (
+        not ADMIN_TOKEN
+        or adminToken is None
+        or not secrets.compare_digest(adminToken, ADMIN_TOKEN)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff"
+        )
+
+
+async def requireReplicationToken(
+    replicationToken: Annotated[str | None, Header(alias="X-Replication-Token")] = None,
+) -> None:
+    """Schützt die Endpunkte zwischen Primary und Replikaten (REPLICATION_TOKEN)."""
+    if (
+        not REPLICATION_TOKEN
+        or replicationToken is None
+        or not secrets.compare_digest(replicationToken, REPLICATION_TOKEN)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff"
+        )
@@ -0,0 +1,188 @@
+"""
+Catalogue.py – Versionierte In-Memory-Strukturen über dem Rezeptkatalog
+
+Schreibende DAO-Funktionen für Rezepte und Zutaten erhöhen in derselben
+Transaktion die Zeile in CatalogueVersion. Jeder Worker fragt diese Zeile alle
+CATALOGUE_POLL_SECONDS in einem Hintergrund-Thread ab (eine Primärschlüssel-
+Abfrage). Hat sie sich geändert, werden alle registrierten Strukturen im selben
+Thread neu gebaut und erst danach per Referenz ausgetauscht: laufende Requests
+sehen weiter den alten Stand, kein Request wartet auf einen Neubau.
+
+Verwendung:
+    _rows = Catalogue.register("recipes", RecipeDAO.getAllRecipesWithIngredients)
+    rows = _rows.get()
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable
+
+from core import Database
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE_POLL_SECONDS = float(os.environ.get("CATALOGUE_POLL_SECONDS", "2"))
+
+
+class CatalogueHolder:
+    """Hält den zuletzt gebauten Wert einer Struktur; get() blockiert nur beim ersten Mal."""
+
+    def __init__(self, name: str, builder: Callable, maxAgeSeconds: float | None):
+        self.name = name
+        self.__builder = builder
+        self.__maxAge = maxAgeSeconds
+        self.__value = None
+        self.__builtAt = 0.0
+        self.__lock = threading.Lock()
+
+    def get(self):
+        value = self.__value
+        if value is None:
+            with self.__lock:
+                if self.__value is None:
+                    self.__swap(self.__builder())
+                value = self.__value
+        return value
+
+    def isBuilt(self) -> bool:
+        return self.__value is not None
+
+    def isExpired(self) -> bool:
+        return (
+            self.__maxAge is not None
+            and self.__value is not None
+            and time.monotonic() - self.__builtAt >= self.__maxAge
+        )
+
+    def rebuild(self) -> None:
+        """Baut außerhalb des Locks neu und tauscht danach atomar aus."""
+        value = self.__builder()
+        with self.__lock:
+            self.__swap(value)
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__value = None
+
+    def __swap(self, value) -> None:
+        self.__value = value
+        self.__builtAt = time.monotonic()
+
+
+_lock = threading.Lock()
+_holders: list[CatalogueHolder] = []
+_listeners: list[Callable[[], None]] = []
+_knownVersion: int | None = None
+_poller: threading.Thread | None = None
+_stop = threading.Event()
+
+
+def register(
+    name: str, builder: Callable, maxAgeSeconds: float | None = None
+) -> CatalogueHolder:
+    """
+    Registriert eine Struktur, die bei jeder Katalogänderung neu gebaut wird.
+    maxAgeSeconds baut sie zusätzlich periodisch neu (z.B. für Popularitätswerte).
+    """
+    holder = CatalogueHolder(name, builder, maxAgeSeconds)
+    with _lock:
+        _holders.append(holder)
+    return holder
+
+
+def onChange(listener: Callable[[], None]) -> None:
+    """Wird bei jeder Katalogänderung aufgerufen, z.B. um einen Cache zu leeren."""
+    with _lock:
+        _listeners.append(listener)
+
+
+def refresh(force: bool = False) -> bool:
+    """
+    Prüft die Katalogversion und baut geänderte bzw. abgelaufene Strukturen neu.
+    Gibt True zurück, wenn sich die Version geändert hat.
+    """
+    global _knownVersion
+    version = Database.getCatalogueVersion()
+    changed = force or (_knownVersion is not None and version != _knownVersion)
+    _knownVersion = version
+
+    with _lock:
+        holders = list(_holders)
+        listeners = list(_listeners)
+    for holder in holders:
+        # Nie benutzte Strukturen werden erst bei Bedarf gebaut
+        if not holder.isBuilt() or not (changed or holder.isExpired()):
+            continue
+        start = time.perf_counter()
+        try:
+            holder.rebuild()
+        except Exception:
+            logger.exception("Neubau von '%s' fehlgeschlagen", holder.name)
+            continue
+        logger.info(
+            "'%s' neu gebaut (Version %d, %.0f ms)",
+            holder.name,
+            version,
+            (time.perf_counter() - start) * 1000,
+        )
+    if changed:
+        for listener in listeners:
+            listener()
+    return changed
+
+
+def warmUp() -> None:
+    """
+    Baut alle registrierten Strukturen sofort (z.B. im gunicorn-Master vor dem
+    Fork). Die dabei gelesene Version gilt als bekannt, damit der Poller eine
+    Änderung bis zum Start der Worker noch bemerkt.
+    """
+    global _knownVersion
+    _knownVersion = Database.getCatalogueVersion()
+    with _lock:
+        holders = list(_holders)
+    for holder in holders:
+        holder.get()
+
+
+def _poll() -> None:
+    while not _stop.wait(CATALOGUE_POLL_SECONDS):
+        try:
+            refresh()
+        except Exception:
+            logger.exception("Katalogversion konnte nicht geprüft werden")
+
+
+def startPolling() -> None:
+    """Startet den Hintergrund-Thread dieses Workers (im lifespan aufrufen)."""
+    global _poller, _knownVersion
+    if _poller is not None and _poller.is_alive():
+        return
+    if _knownVersion is None:
+        _knownVersion = Database.getCatalogueVersion()
+    _stop.clear()
+    _poller = threading.Thread(target=_poll, name="catalogue-poller", daemon=True)
+    _poller.start()
+
+
+def stopPolling() -> None:
+    global _poller
+    _stop.set()
+    if _poller is not None:
+        _poller.join(timeout=CATALOGUE_POLL_SECONDS + 1)
+    _poller = None
+
+
+def reset() -> None:
+    """Verwirft alle gebauten Strukturen und die bekannte Version (für Tests)."""
+    global _knownVersion
+    _knownVersion = None
+    with _lock:
+        holders = list(_holders)
+        listeners = list(_listeners)
+    for holder in holders:
+        holder.reset()
+    for listener in listeners:
+        listener()
@@ -0,0 +1,315 @@
+"""
+CatalogueSnapshot.py – Kompakter, schreibgeschützter Katalog-Snapshot für alle Worker
+
+Der Rezeptkatalog wird in ein Binärformat geschrieben und von jedem gunicorn-Worker
+per mmap eingeblendet. Alle Worker teilen sich damit dieselben Speicherseiten,
+egal wie viele es sind; das Laden kostet nur das Einblenden.
+
+Aufbau (little-endian, Abschnitte auf 8 Byte ausgerichtet):
+    Header:    Magic, Katalogversion, Anzahl Rezepte/Zutaten/Verknüpfungen,
+               danach (Offset, Länge) für jeden Abschnitt
+    Strings:   Rezeptnamen, Beschreibungen, Zutatennamen, Einheiten
+               (jeweils uint32-Offsets + UTF-8-Blob)
+    CSR:       Rezept -> Zutaten (indptr uint32, indices uint32, amounts float64,
+               linkUnits uint32 = Index der Einheit; eine Zutat kann je Rezept
+               in einer anderen Einheit vorkommen)
+    CSR^T:     Zutat -> Rezepte (indptr uint32, indices uint32)
+    Dauer:     Minuten pro Rezept (uint32, UNKNOWN_DURATION ohne Schätzung) und
+               alle Positionen nach Dauer sortiert, für den maxDuration-Filter
+
+Ist CATALOGUE_SNAPSHOT_PATH gesetzt, schreibt der erste Worker, der eine neue
+Katalogversion bemerkt, die Datei (unter Dateisperre, atomar per os.replace); alle
+anderen blenden sie nur ein. Ohne Pfad liegt derselbe Snapshot im Prozessspeicher.
+"""
+
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+_snapshotPath = os.environ.get("CATALOGUE_SNAPSHOT_PATH")
+CATALOGUE_SNAPSHOT_PATH = Path(_snapshotPath) if _snapshotPath else None
+
+MAGIC = b"LCSNAP03"
+# Rezepte ohne erkennbare Zeitangabe sortieren ans Ende und fallen aus jedem Filter
+UNKNOWN_DURATION = 0xFFFFFFFF
+# Gemerkte Suchbegriffe -> passende Zutaten pro Snapshot
+MATCH_CACHE_SIZE = 4096
+_SECTIONS = (
+    "recipeIds",
+    "recipeNameOffsets",
+    "recipeNames",
+    "descriptionOffsets",
+    "descriptions",
+    "ingredientNameOffsets",
+    "ingredientNames",
+    "unitOffsets",
+    "units",
+    "recipeIndptr",
+    "recipeIndices",
+    "amounts",
+    "linkUnits",
+    "ingredientIndptr",
+    "ingredientIndices",
+    "durations",
+    "durationOrder",
+)
+_HEADER = struct.Struct("<8sQIII")
+_SECTION = struct.Struct("<QQ")
+_HEADER_SIZE = _HEADER.size + _SECTION.size * len(_SECTIONS)
+
+if sys.byteorder != "little":  # pragma: no cover
+    raise ImportError("CatalogueSnapshot setzt eine little-endian-Plattform voraus")
+
+
+class _Strings:
+    """Zugriff auf eine String-Tabelle, ohne sie komplett zu dekodieren."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self.__offsets = offsets
+        self.__blob = blob
+
+    def __len__(self) -> int:
+        return len(self.__offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.__blob[self.__offsets[i] : self.__offsets[i + 1]], "utf-8")
+
+
+class CatalogueSnapshot:
+    """Lesesicht auf einen Snapshot; alle Arrays sind Views auf den Puffer."""
+
+    def __init__(self, buffer):
+        self.__buffer = buffer
+        view = memoryview(buffer)
+        magic, version, nRecipes, nIngredients, nLinks = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Kein Katalog-Snapshot")
+        self.version = version
+        self.recipeCount = nRecipes
+        self.ingredientCount = nIngredients
+        self.linkCount = nLinks
+
+        sections = {}
+        for i, name in enumerate(_SECTIONS):
+            offset, length = _SECTION.unpack_from(
+                view, _HEADER.size + i * _SECTION.size
+            )
+            sections[name] = view[offset : offset + length]
+        u32 = lambda name: sections[name].cast("I")  # noqa: E731
+
+        self.recipeIds = u32("recipeIds")
+        self.recipeNames = _Strings(u32("recipeNameOffsets"), sections["recipeNames"])
+        self.descriptions = _Strings(
+            u32("descriptionOffsets"), sections["descriptions"]
+        )
+        self.ingredientNames = _Strings(
+            u32("ingredientNameOffsets"), sections["ingredientNames"]
+        )
+        self.units = _Strings(u32("unitOffsets"), sections["units"])
+        self.recipeIndptr = u32("recipeIndptr")
+        self.recipeIndices = u32("recipeIndices")
+        self.amounts = sections["amounts"].cast("d")
+        self.linkUnits = u32("linkUnits")
+        self.ingredientIndptr = u32("ingredientIndptr")
+        self.ingredientIndices = u32("ingredientIndices")
+        self.durations = u32("durations")
+        self.durationOrder = u32("durationOrder")
+        # Das Vokabular ist klein und wird bei jeder Suche durchsucht
+        self.vocabulary = [
+            self.ingredientNames[i] for i in range(len(self.ingredientNames))
+        ]
+        self.__matches: dict[str, tuple[int, ...]] = {}
+
+    def recipeIngredients(self, position: int) -> list[tuple[str, float, str]]:
+        """(Name, Menge, Einheit) der Zutaten des Rezepts an dieser Position."""
+        result = []
+        for k in range(self.recipeIndptr[position], self.recipeIndptr[position + 1]):
+            j = self.recipeIndices[k]
+            amount = self.amounts[k]
+            # Ganzzahlige Mengen kommen aus SQLite als int, das bleibt so
+            if amount.is_integer():
+                amount = int(amount)
+            result.append((self.vocabulary[j], amount, self.units[self.linkUnits[k]]))
+        return result
+
+    def matchingIngredients(self, term: str) -> tuple[int, ...]:
+        """Indizes aller Zutaten, in deren Namen term vorkommt (gemerkt)."""
+        matches = self.__matches.get(term)
+        if matches is None:
+            matches = tuple(j for j, c in enumerate(self.vocabulary) if term in c)
+            if len(self.__matches) >= MATCH_CACHE_SIZE:
+                self.__matches.clear()
+            self.__matches[term] = matches
+        return matches
+
+    def durationMinutes(self, position: int) -> int | None:
+        duration = self.durations[position]
+        return None if duration == UNKNOWN_DURATION else duration
+
+    def positionsWithin(self, maxDuration: int) -> memoryview:
+        """Positionen aller Rezepte mit Dauer <= maxDuration, kürzeste zuerst."""
+        end = bisect_right(
+            self.durationOrder, maxDuration, key=self.durations.__getitem__
+        )
+        return self.durationOrder[:end]
+
+
+# ── Schreiben ──────────────────────────────────────────────────
+
+
+def _stringTable(values: list[str]) -> tuple[bytes, bytes]:
+    offsets = array("I", [0])
+    blob = bytearray()
+    for value in values:
+        blob += (value or "").encode("utf-8")
+        offsets.append(len(blob))
+    return offsets.tobytes(), bytes(blob)
+
+
+def buildSnapshot(rows: list[dict], version: int) -> bytes:
+    """Baut den Snapshot aus Zeilen im Format von RecipeDAO.getAllRecipesWithIngredients."""
+    vocabulary: dict[str, int] = {}
+    units: dict[str, int] = {}
+    recipeIndptr = array("I", [0])
+    recipeIndices = array("I")
+    amounts = array("d")
+    linkUnits = array("I")
+    for row in rows:
+        for ingredient in row["ingredients"]:
+            index = vocabulary.setdefault(ingredient["name"], len(vocabulary))
+            unit = ingredient["amountType"] or ""
+            recipeIndices.append(index)
+            amounts.append(float(ingredient["amount"] or 0))
+            linkUnits.append(units.setdefault(unit, len(units)))
+        recipeIndptr.append(len(recipeIndices))
+
+    # Transponierte Adjazenz: welche Rezepte enthalten Zutat j?
+    perIngredient: list[list[int]] = [[] for _ in vocabulary]
+    for position in range(len(rows)):
+        for k in range(recipeIndptr[position], recipeIndptr[position + 1]):
+            perIngredient[recipeIndices[k]].append(position)
+    ingredientIndptr = array("I", [0])
+    ingredientIndices = array("I")
+    for positions in perIngredient:
+        ingredientIndices.extend(positions)
+        ingredientIndptr.append(len(ingredientIndices))
+
+    durations = array(
+        "I",
+        (
+            (
+                UNKNOWN_DURATION
+                if r.get("durationMinutes") is None
+                else r["durationMinutes"]
+            )
+            for r in rows
+        ),
+    )
+    durationOrder = array(
+        "I", sorted(range(len(rows)), key=lambda p: (durations[p], p))
+    )
+
+    nameOffsets, names = _stringTable([r["name"] for r in rows])
+    descriptionOffsets, descriptions = _stringTable(
+        [r["description"] or "" for r in rows]
+    )
+    ingredientNameOffsets, ingredientNames = _stringTable(list(vocabulary))
+    unitOffsets, unitBlob = _stringTable(list(units))
+    payloads = {
+        "recipeIds": array("I", (r["id"] for r in rows)).tobytes(),
+        "recipeNameOffsets": nameOffsets,
+        "recipeNames": names,
+        "descriptionOffsets": descriptionOffsets,
+        "descriptions": descriptions,
+        "ingredientNameOffsets": ingredientNameOffsets,
+        "ingredientNames": ingredientNames,
+        "unitOffsets": unitOffsets,
+        "units": unitBlob,
+        "recipeIndptr": recipeIndptr.tobytes(),
+        "recipeIndices": recipeIndices.tobytes(),
+        "amounts": amounts.tobytes(),
+        "linkUnits": linkUnits.tobytes(),
+        "ingredientIndptr": ingredientIndptr.tobytes(),
+        "ingredientIndices": ingredientIndices.tobytes(),
+        "durations": durations.tobytes(),
+        "durationOrder": durationOrder.tobytes(),
+    }
+
+    header = bytearray(
+        _HEADER.pack(MAGIC, version, len(rows), len(vocabulary), len(recipeIndices))
+    )
+    body = bytearray()
+    offset = _HEADER_SIZE
+    for name in _SECTIONS:
+        padding = -offset % 8
+        body += b"\0" * padding
+        offset += padding
+        header += _SECTION.pack(offset, len(payloads[name]))
+        body += payloads[name]
+        offset += len(payloads[name])
+    return bytes(header + body)
+
+
+def readVersion(path: Path) -> int | None:
+    """Version aus dem Header, None wenn die Datei fehlt oder unbrauchbar ist."""
+    try:
+        with open(path, "rb") as f:
+            magic, version, *_ = _HEADER.unpack(f.read(_HEADER.size))
+    except (OSError, struct.error):
+        return None
+    return version if magic == MAGIC else None
+
+
+def writeSnapshot(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def mapSnapshot(path: Path) -> CatalogueSnapshot:
+    """Blendet die Datei schreibgeschützt ein; ältere Mappings bleiben gültig."""
+    with open(path, "rb") as f:
+        return CatalogueSnapshot(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def load(
+    loadRows: Callable[[], list[dict]], loadVersion: Callable[[], int]
+) -> CatalogueSnapshot:
+    """
+    Liefert einen Snapshot des aktuellen Katalogs. Mit CATALOGUE_SNAPSHOT_PATH wird
+    die Datei nur neu geschrieben, wenn ihre Version nicht zur Katalogversion passt –
+    von genau einem Prozess; alle anderen blenden sie nur ein. Ohne Pfad wird die
+    Version nicht gebraucht und der Snapshot im Prozessspeicher gebaut.
+    """
+    path = CATALOGUE_SNAPSHOT_PATH
+    if path is None:
+        return CatalogueSnapshot(buildSnapshot(loadRows(), 0))
+
+    # Version vor den Zeilen lesen: ein paralleler Schreibvorgang löst dann
+    # sicher einen weiteren Neubau aus
+    version = loadVersion()
+    if readVersion(path) != version:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path.with_name(path.name + ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Ein anderer Worker könnte ihn inzwischen geschrieben haben
+                if readVersion(path) != version:
+                    writeSnapshot(path, buildSnapshot(loadRows(), version))
+                    logger.info("Katalog-Snapshot Version %d geschrieben", version)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    return mapSnapshot(path)
@@ -1,43 +1,567 @@
 """
 Database.py – SQLite-Verbindungsmanagement und Tabellen-Initialisierung
+
+Lesende DAOs (@reads) holen sich mit getReadConnection() die Lese-Connection ihres
+Threads: schreibgeschützt geöffnet (mode=ro, query_only), mit großem Page-Cache
+und mmap, und über Requests hinweg wiederverwendet. Sie nehmen nie eine
+Schreibsperre und können per DB_READ_PATH auf ein Replikat zeigen.
+
+Schreibende DAOs (@writes) laufen über getDB(): Pro Prozess gibt es genau eine Schreib-Connection, und
+Schreibvorgänge, die gleichzeitig eintreffen, teilen sich eine Transaktion
+(Group Commit). Jeder Vorgang läuft in einem eigenen SAVEPOINT, sodass ein
+Fehler nur ihn zurückrollt; der erste Vorgang eines Batches committet, sobald
+keine weiteren Schreiber mehr warten (höchstens nach DB_GROUP_COMMIT_MS).
+Gegenüber anderen Prozessen gilt busy_timeout plus Wiederholung mit Backoff.
 """
 
-import sqlite3
+import inspect
 import logging
+import os
+import sqlite3
+import threading
+import time
 from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
 from pathlib import Path
 
+from core import Metrics, QueryLog
+from domain.canonical import canonicalName
+from domain.duration import estimateMinutes
+
 logger = logging.getLogger(__name__)
 
-DB_PATH = Path(__file__).parent.parent.parent / "data" / "LazyCookDB.sqlite3"
+_dbPath = os.environ.get("DB_PATH")
+DB_PATH = (
+    Path(_dbPath)
+    if _dbPath
+    else Path(__file__).parent.parent.parent / "data" / "LazyCookDB.sqlite3"
+)
 
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+DB_GROUP_COMMIT = os.environ.get("DB_GROUP_COMMIT", "1") != "0"
+DB_GROUP_COMMIT_MS = float(os.environ.get("DB_GROUP_COMMIT_MS", "2"))
+DB_GROUP_COMMIT_MAX_OPS = int(os.environ.get("DB_GROUP_COMMIT_MAX_OPS", "64"))
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_LOCK_RETRIES = 5
+# Optionales Lese-Replikat (z.B. per Backup-API gezogener Snapshot); Lesen ist
+# dann nicht mehr "read your writes"
+_readPath = os.environ.get("DB_READ_PATH")
+DB_READ_PATH = Path(_readPath) if _readPath else None
+DB_READ_CACHE_MB = int(os.environ.get("DB_READ_CACHE_MB", "32"))
+DB_READ_MMAP_MB = int(os.environ.get("DB_READ_MMAP_MB", "256"))
+
+# False auf Lese-Replikaten (core.Replication): dort schreibt nur der Primary
+WRITES_ALLOWED = True
+
+# Gesetzt, solange eine @reads-Funktion läuft
+_readScope: ContextVar[str | None] = ContextVar("readScope", default=None)
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor, der die Laufzeit jedes Statements an core.Metrics (und ggf. QueryLog) meldet."""
+
+    # finally: auch fehlschlagende Statements (z.B. "database is locked") zählen
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._afterStatement(sql, parameters, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        seq_of_parameters = list(seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._afterStatement(
+                sql,
+                seq_of_parameters[0] if seq_of_parameters else (),
+                time.perf_counter() - start,
+            )
+
+    def _afterStatement(self, sql: str, parameters, elapsed: float) -> None:
+        Metrics.recordStatement(sql, elapsed)
+        if QueryLog.isEnabled():
+            QueryLog.record(self.connection, sql, parameters, elapsed)
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection, deren Cursor und execute()-Aufrufe gemessen werden."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
 
 def getConnection() -> sqlite3.Connection:
     """Erstellt eine neue SQLite-Connection mit Row-Factory."""
-    con = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+    con = sqlite3.connect(
+        str(DB_PATH),
+        check_same_thread=False,
+        factory=TimedConnection,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+    )
+    Metrics.recordConnectionOpened()
     con.row_factory = sqlite3.Row
     con.execute("PRAGMA foreign_keys = ON")
     return con
 
 
-@contextmanager
-def getDB():
-    """Context-Manager: öffnet Connection, committed bei Erfolg, rollt bei Fehler zurück."""
-    con = getConnection()
+class ReadConnection(TimedConnection):
+    """
+    Wiederverwendete Lese-Connection eines Threads. close() gibt sie nur zurück
+    (offene Lesetransaktion beenden), damit Page-Cache und mmap erhalten bleiben.
+    """
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def reallyClose(self):
+        super().close()
+
+
+_readers = threading.local()
+
+
+def _readerPath() -> Path:
+    return DB_READ_PATH or DB_PATH
+
+
+def _openReader(path: Path, factory=ReadConnection) -> sqlite3.Connection:
+    con = sqlite3.connect(
+        path.resolve().as_uri() + "?mode=ro",
+        uri=True,
+        check_same_thread=False,
+        factory=factory,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+    )
+    Metrics.recordConnectionOpened()
+    con.row_factory = sqlite3.Row
+    con.execute("PRAGMA query_only = ON")
+    con.execute(f"PRAGMA cache_size = -{DB_READ_CACHE_MB * 1024}")
+    con.execute(f"PRAGMA mmap_size = {DB_READ_MMAP_MB * 1024 * 1024}")
+    return con
+
+
+def getReadConnection() -> sqlite3.Connection:
+    """Lese-Connection dieses Threads; neu geöffnet bei anderem Pfad oder nach fork()."""
+    path, pid = _readerPath(), os.getpid()
+    cached = getattr(_readers, "entry", None)
+    if cached is not None and cached[0] == path and cached[1] == pid:
+        return cached[2]
+    if cached is not None and cached[1] == pid:
+        cached[2].reallyClose()
+    con = _openReader(path)
+    _readers.entry = (path, pid, con)
+    return con
+
+
+def openReadConnection() -> sqlite3.Connection:
+    """
+    Eigene, nicht geteilte Lese-Connection, z.B. für Generatoren, die über
+    mehrere Threads hinweg iteriert werden. Der Aufrufer schließt sie.
+    """
+    return _openReader(_readerPath(), TimedConnection)
+
+
+def closeReader() -> None:
+    """Schließt die Lese-Connection des aufrufenden Threads."""
+    cached = getattr(_readers, "entry", None)
+    _readers.entry = None
+    if cached is not None and cached[1] == os.getpid():
+        cached[2].reallyClose()
+
+
+def reads(fn):
+    """
+    Markiert eine DAO-Funktion als rein lesend; getDB() ist darin verboten.
+
+    Bei Generatoren gilt das für jeden Schritt einzeln: der Aufruf selbst führt
+    noch keinen Code aus, und zwischen zwei Schritten läuft der Code des
+    Aufrufers (der schreiben darf), ggf. in einem anderen Thread.
+    """
+
+    if inspect.isgeneratorfunction(fn):
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            generator = fn(*args, **kwargs)
+            try:
+                while True:
+                    token = _readScope.set(fn.__qualname__)
+                    try:
+                        item = next(generator)
+                    except StopIteration as stop:
+                        return stop.value
+                    finally:
+                        _readScope.reset(token)
+                    yield item
+            finally:
+                generator.close()
+
+    else:
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            token = _readScope.set(fn.__qualname__)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _readScope.reset(token)
+
+    wrapper.dbAccess = "read"
+    return wrapper
+
+
+def writes(fn):
+    """Markiert eine DAO-Funktion als schreibend (läuft über getDB())."""
+    fn.dbAccess = "write"
+    return fn
+
+
+def bumpCatalogueVersion(cur: sqlite3.Cursor) -> None:
+    """Markiert den Rezeptkatalog als geändert (in der Transaktion des Aufrufers)."""
+    cur.execute("UPDATE CatalogueVersion SET version = version + 1 WHERE id = 1")
+
+
+@reads
+def getCatalogueVersion() -> int:
+    con = getReadConnection()
     try:
-        yield con
-        con.commit()
-    except Exception:
-        con.rollback()
-        raise
+        row = con.execute(
+            "SELECT version FROM CatalogueVersion WHERE id = 1"
+        ).fetchone()
+        return row[0] if row else 0
     finally:
         con.close()
 
 
+def _isLocked(error: sqlite3.OperationalError) -> bool:
+    message = str(error)
+    return "locked" in message or "busy" in message
+
+
+def _executeWithRetry(con: sqlite3.Connection, sql: str) -> None:
+    """Für BEGIN/COMMIT: busy_timeout reicht nicht immer, daher zusätzlich Backoff."""
+    for attempt in range(DB_LOCK_RETRIES):
+        try:
+            con.execute(sql)
+            return
+        except sqlite3.OperationalError as e:
+            if not _isLocked(e) or attempt == DB_LOCK_RETRIES - 1:
+                raise
+            logger.warning("%s: Datenbank gesperrt, Versuch %d", sql, attempt + 1)
+            time.sleep(0.05 * 2**attempt)
+
+
+class _Batch:
+    """Eine gemeinsame Transaktion mehrerer Schreibvorgänge."""
+
+    def __init__(self):
+        self.ops = 0
+        self.error: BaseException | None = None
+        self.done = threading.Event()
+
+
+class _Writer:
+    """Die Schreib-Connection dieses Prozesses samt Group-Commit-Protokoll."""
+
+    def __init__(self):
+        self.__cond = threading.Condition()
+        self.__busy = False  # ein Thread arbeitet gerade auf der Connection
+        self.__waiting = 0  # Threads, die auf die Connection warten
+        self.__batch: _Batch | None = None
+        self.__con: sqlite3.Connection | None = None
+        self.__path: str | None = None
+        self.__pid: int | None = None
+        self.__depth = 0
+        self.__local = threading.local()
+
+    @contextmanager
+    def write(self):
+        if getattr(self.__local, "depth", 0):
+            # Verschachtelter Aufruf im selben Thread: nur ein weiterer Savepoint
+            with self.__savepoint() as con:
+                yield con
+            return
+
+        self.__acquire()
+        bodyError = None
+        try:
+            batch = self.__joinBatch()
+            isLeader = batch.ops == 1
+            self.__local.depth = 1
+            try:
+                with self.__savepoint() as con:
+                    yield con
+            except BaseException as e:
+                bodyError = e
+                if not self.__con.in_transaction and batch.error is None:
+                    # SQLite hat die ganze Transaktion verworfen
+                    batch.error = e
+            finally:
+                self.__local.depth = 0
+        finally:
+            self.__release()
+
+        if isLeader:
+            self.__commit(batch)
+        else:
+            batch.done.wait()
+        if bodyError is not None:
+            raise bodyError
+        if batch.error is not None:
+            raise batch.error
+
+    def close(self) -> None:
+        self.__acquire()
+        try:
+            if self.__con is not None:
+                self.__con.close()
+            self.__con = None
+            self.__batch = None
+        finally:
+            self.__release()
+
+    def __acquire(self) -> None:
+        with self.__cond:
+            self.__waiting += 1
+            while self.__busy:
+                self.__cond.wait()
+            self.__waiting -= 1
+            self.__busy = True
+
+    def __release(self) -> None:
+        with self.__cond:
+            self.__busy = False
+            self.__cond.notify_all()
+
+    def __joinBatch(self) -> _Batch:
+        if self.__batch is None:
+            self.__ensureConnection()
+            _executeWithRetry(self.__con, "BEGIN IMMEDIATE")
+            self.__batch = _Batch()
+        self.__batch.ops += 1
+        return self.__batch
+
+    def __ensureConnection(self) -> None:
+        """(Neu) öffnen, wenn DB_PATH sich geändert hat oder wir in einem neuen Prozess sind."""
+        if (
+            self.__con is not None
+            and self.__path == str(DB_PATH)
+            and self.__pid == os.getpid()
+        ):
+            return
+        if self.__con is not None and self.__pid == os.getpid():
+            self.__con.close()
+        con = getConnection()
+        con.isolation_level = None  # Transaktionen steuern wir selbst
+        con.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+        self.__con = con
+        self.__path = str(DB_PATH)
+        self.__pid = os.getpid()
+
+    @contextmanager
+    def __savepoint(self):
+        # Fester Name pro Verschachtelungstiefe, damit Metriken/Query-Log nicht wachsen
+        name = f"op{self.__depth}"
+        self.__depth += 1
+        con = self.__con
+        try:
+            con.execute(f"SAVEPOINT {name}")
+            try:
+                yield con
+            except BaseException:
+                if con.in_transaction:
+                    con.execute(f"ROLLBACK TO {name}")
+                    con.execute(f"RELEASE {name}")
+                raise
+            con.execute(f"RELEASE {name}")
+        finally:
+            self.__depth -= 1
+
+    def __commit(self, batch: _Batch) -> None:
+        """Wartet kurz auf weitere Schreiber im selben Batch und committet dann."""
+        deadline = time.monotonic() + DB_GROUP_COMMIT_MS / 1000
+        with self.__cond:
+            while (
+                (self.__waiting or self.__busy)
+                and batch.ops < DB_GROUP_COMMIT_MAX_OPS
+                and time.monotonic() < deadline
+            ):
+                self.__cond.wait(deadline - time.monotonic())
+            while self.__busy:
+                self.__cond.wait()
+            self.__busy = True
+            self.__batch = None
+        try:
+            if batch.error is None:
+                _executeWithRetry(self.__con, "COMMIT")
+            elif self.__con.in_transaction:
+                self.__con.execute("ROLLBACK")
+        except BaseException as e:
+            batch.error = e
+            if self.__con.in_transaction:
+                self.__con.execute("ROLLBACK")
+        finally:
+            self.__release()
+            Metrics.observe(
+                "lazycook_db_group_commit_ops",
+                {},
+                batch.ops,
+                Metrics.COUNT_BUCKETS,
+            )
+            batch.done.set()
+
+
+_writer = _Writer()
+
+
+@contextmanager
+def getDB():
+    """
+    Context-Manager für Schreibvorgänge: committed bei Erfolg (ggf. gemeinsam mit
+    anderen Vorgängen), rollt bei Fehler nur diesen Vorgang zurück.
+    Blockiert bis zum Commit (bis zu DB_GROUP_COMMIT_MS), async-Routen rufen
+    Schreiber deshalb über run_in_threadpool auf.
+    """
+    scope = _readScope.get()
+    if scope is not None:
+        raise RuntimeError(f"Schreibzugriff in lesender DAO-Funktion {scope}")
+    if not WRITES_ALLOWED:
+        raise RuntimeError("Schreibzugriff auf einem Lese-Replikat")
+    if not DB_GROUP_COMMIT:
+        con = getConnection()
+        try:
+            yield con
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        finally:
+            con.close()
+        return
+    with _writer.write() as con:
+        yield con
+
+
+def closeWriter() -> None:
+    """Schließt die Schreib-Connection dieses Prozesses (z.B. beim Herunterfahren)."""
+    _writer.close()
+
+
+_EXISTS_FROM_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        zid INTEGER NOT NULL,
+        rid INTEGER NOT NULL,
+        amount DECIMAL(10,2) NOT NULL,
+        amountType VARCHAR(30) NOT NULL,
+        FOREIGN KEY (zid) REFERENCES Ingredient (id) ON DELETE CASCADE,
+        FOREIGN KEY (rid) REFERENCES Recipe (id) ON DELETE CASCADE,
+        UNIQUE (zid, rid, amountType)
+    )
+"""
+
+
+_FAVORITES_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        AccountID INTEGER NOT NULL,
+        rid INTEGER NOT NULL,
+        createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (AccountID) REFERENCES Account (id) ON DELETE CASCADE,
+        FOREIGN KEY (rid) REFERENCES Recipe (id) ON DELETE CASCADE,
+        UNIQUE (AccountID, rid)
+    )
+"""
+
+
+def _canonicalizeIngredients(cur: sqlite3.Cursor) -> None:
+    """
+    Führt alle Zutaten mit demselben kanonischen Namen (domain.canonical) zu einer
+    zusammen und baut Exists_from mit der Einheit pro Verknüpfung neu auf.
+
+    Überlebende Zutat einer Gruppe ist die, die schon kanonisch heißt, sonst die
+    mit der kleinsten ID; ihre Einheit ist die häufigste der Gruppe. Jede
+    Verknüpfung behält die Einheit ihrer Rohzutat, mehrere Rohzutaten desselben
+    Rezepts mit derselben Einheit werden addiert. Die Rohnamen bleiben als
+    IngredientAlias erhalten.
+    """
+    cur.execute("SELECT id, name, amountType FROM Ingredient ORDER BY id")
+    ingredients = cur.fetchall()
+    groups: dict[str, list[sqlite3.Row]] = {}
+    for row in ingredients:
+        groups.setdefault(canonicalName(row["name"]).lower(), []).append(row)
+
+    survivorOf: dict[int, int] = {}
+    survivors: list[tuple[int, str, str]] = []
+    for rows in groups.values():
+        name = canonicalName(rows[0]["name"])
+        keep = next((r for r in rows if r["name"] == name), rows[0])
+        units = [r["amountType"] for r in rows]
+        unit = max(units, key=units.count)
+        survivors.append((keep["id"], name, unit))
+        for row in rows:
+            survivorOf[row["id"]] = keep["id"]
+    unitOf = {row["id"]: row["amountType"] for row in ingredients}
+
+    links: dict[tuple[int, int, str], float] = {}
+    cur.execute("SELECT zid, rid, amount FROM Exists_from ORDER BY rowid")
+    for row in cur.fetchall():
+        key = (
+            survivorOf.get(row["zid"], row["zid"]),
+            row["rid"],
+            unitOf.get(row["zid"], ""),
+        )
+        links[key] = links.get(key, 0) + row["amount"]
+    cur.execute("DROP TABLE Exists_from")
+    cur.execute(_EXISTS_FROM_TABLE.format(name="Exists_from"))
+    cur.executemany(
+        "INSERT INTO Exists_from (zid, rid, amountType, amount) VALUES (?, ?, ?, ?)",
+        [(*key, amount) for key, amount in links.items()],
+    )
+
+    cur.executemany(
+        "INSERT OR IGNORE INTO IngredientAlias (name, zid) VALUES (?, ?)",
+        [(row["name"], survivorOf[row["id"]]) for row in ingredients],
+    )
+    kept = {zid for zid, _, _ in survivors}
+    cur.executemany(
+        "DELETE FROM Ingredient WHERE id = ?",
+        [(row["id"],) for row in ingredients if row["id"] not in kept],
+    )
+    # Zwei Schritte, damit kein Zwischenstand gegen UNIQUE (name) verstößt
+    cur.executemany(
+        "UPDATE Ingredient SET name = '#' || id WHERE id = ?",
+        [(zid,) for zid, _, _ in survivors],
+    )
+    cur.executemany(
+        "UPDATE Ingredient SET name = ?, amountType = ? WHERE id = ?",
+        [(name, unit, zid) for zid, name, unit in survivors],
+    )
+    bumpCatalogueVersion(cur)
+    logger.info(
+        "Zutaten kanonisiert: %d Rohnamen -> %d Zutaten",
+        len(ingredients),
+        len(survivors),
+    )
+
+
 def initDB():
     """Erstellt alle Tabellen, falls sie noch nicht existieren."""
+    # WAL: Leser blockieren den Schreiber nicht (geht nur außerhalb einer Transaktion)
+    con = getConnection()
+    try:
+        con.execute("PRAGMA journal_mode = WAL")
+    finally:
+        con.close()
+
     with getDB() as con:
         cur = con.cursor()
 
@@ -83,30 +607,47 @@ def initDB():
                 name TEXT UNIQUE NOT NULL,
                 description nvarchar(20000),
                 vid INTEGER,
+                durationMinutes INTEGER,
                 FOREIGN KEY (vid) REFERENCES Author (id) ON DELETE CASCADE
             )
         """)
 
+        # Die Keyset-Pagination über (name, id) nutzt den Index des UNIQUE-Constraints
+        # auf name (enthält die rowid = id), ein eigener Index wäre ein Duplikat.
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_recipe_author ON Recipe (vid, name)"
+        )
+
+        # Kanonische Zutaten (domain.canonical) können in verschiedenen Einheiten
+        # vorkommen, deshalb steht die Einheit an der Verknüpfung
+        cur.execute(_EXISTS_FROM_TABLE.format(name="Exists_from"))
+
+        # Rohname aus dem Import -> kanonische Zutat, gepflegt von addIngredient
         cur.execute("""
-            CREATE TABLE IF NOT EXISTS Exists_from (
+            CREATE TABLE IF NOT EXISTS IngredientAlias (
+                name TEXT PRIMARY KEY,
                 zid INTEGER NOT NULL,
-                rid INTEGER NOT NULL,
-                amount DECIMAL(10,2) NOT NULL,
-                FOREIGN KEY (zid) REFERENCES Ingredient (id) ON DELETE CASCADE,
-                FOREIGN KEY (rid) REFERENCES Recipe (id) ON DELETE CASCADE,
-                UNIQUE (zid, rid)
+                FOREIGN KEY (zid) REFERENCES Ingredient (id) ON DELETE CASCADE
             )
         """)
 
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS Favorites (
-                AccountID INTEGER NOT NULL,
-                rid INTEGER NOT NULL,
-                FOREIGN KEY (AccountID) REFERENCES Account (id) ON DELETE CASCADE,
-                FOREIGN KEY (rid) REFERENCES Recipe (id) ON DELETE CASCADE,
-                UNIQUE (AccountID, rid)
-            )
-        """)
+        # Explizite id: die Pagination der Favoriten sortiert danach, eine implizite
+        # rowid könnte VACUUM neu vergeben. Ältere Datenbanken werden umgebaut,
+        # die id übernimmt die bisherige rowid (alte Cursor bleiben gültig).
+        cur.execute(_FAVORITES_TABLE.format(name="Favorites"))
+        cur.execute("PRAGMA table_info(Favorites)")
+        if "id" not in {row["name"] for row in cur.fetchall()}:
+            cur.execute(_FAVORITES_TABLE.format(name="FavoritesNew"))
+            cur.execute("""
+                INSERT INTO FavoritesNew (id, AccountID, rid)
+                SELECT rowid, AccountID, rid FROM Favorites
+            """)
+            cur.execute("DROP TABLE Favorites")
+            cur.execute("ALTER TABLE FavoritesNew RENAME TO Favorites")
+
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_favorites_account ON Favorites (AccountID)"
+        )
 
         cur.execute("""
             CREATE TABLE IF NOT EXISTS IngredientUsage (
@@ -121,6 +662,94 @@ def initDB():
             )
         """)
 
+        # Zutaten, die ein Account nie in Suchergebnissen sehen will (Allergien,
+        # Abneigungen); name ist normalisiert (klein, ohne Leerraum außen)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS IngredientExclusion (
+                AccountID INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                displayName TEXT NOT NULL,
+                createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (AccountID, name),
+                FOREIGN KEY (AccountID) REFERENCES Account (id) ON DELETE CASCADE
+            )
+        """)
+
+        # Vorberechnete Nachbarn pro Rezept, geschrieben von services.RecipeSimilarity
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS RecipeSimilarity (
+                rid INTEGER NOT NULL,
+                neighborId INTEGER NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (rid, neighborId),
+                FOREIGN KEY (rid) REFERENCES Recipe (id) ON DELETE CASCADE,
+                FOREIGN KEY (neighborId) REFERENCES Recipe (id) ON DELETE CASCADE
+            )
+        """)
+
+        # Wird von schreibenden Rezept-/Zutaten-DAOs erhöht, siehe core.Catalogue
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS CatalogueVersion (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+        """)
+        cur.execute(
+            "INSERT OR IGNORE INTO CatalogueVersion (id, version) VALUES (1, 0)"
+        )
+
+        # Geschätzte Zubereitungszeit (domain.duration), gesetzt von addRecipe.
+        # Ältere Datenbanken bekommen die Spalte und werden einmalig befüllt.
+        cur.execute("PRAGMA table_info(Recipe)")
+        if "durationMinutes" not in {row["name"] for row in cur.fetchall()}:
+            cur.execute("ALTER TABLE Recipe ADD COLUMN durationMinutes INTEGER")
+            cur.execute("SELECT id, description FROM Recipe")
+            cur.executemany(
+                "UPDATE Recipe SET durationMinutes = ? WHERE id = ?",
+                [
+                    (estimateMinutes(row["description"]), row["id"])
+                    for row in cur.fetchall()
+                ],
+            )
+            bumpCatalogueVersion(cur)
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_recipe_duration ON Recipe (durationMinutes)"
+        )
+
+        # Ältere Datenbanken haben Rohnamen als Zutaten und die Einheit nur an der
+        # Zutat: einmalig kanonisieren (siehe _canonicalizeIngredients)
+        cur.execute("PRAGMA table_info(Exists_from)")
+        if "amountType" not in {row["name"] for row in cur.fetchall()}:
+            _canonicalizeIngredients(cur)
+        # UNIQUE (zid, rid, ...) hilft nur bei Suche nach Zutat; Zutaten eines Rezepts brauchen rid
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_exists_from_recipe ON Exists_from (rid)"
+        )
+
+        # Globale Nutzung pro normalisierter Zutat, gepflegt von incrementIngredientUsage
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS IngredientPopularity (
+                name TEXT PRIMARY KEY,
+                displayName TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                lastUnit TEXT,
+                lastUsedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ingredientpopularity_count "
+            "ON IngredientPopularity (count DESC)"
+        )
+        # Einmaliges Befüllen aus bestehenden Zählern (Datenbanken von vor der Tabelle)
+        cur.execute("SELECT 1 FROM IngredientPopularity LIMIT 1")
+        if cur.fetchone() is None:
+            cur.execute("""
+                INSERT INTO IngredientPopularity (name, displayName, count, lastUnit, lastUsedAt)
+                SELECT name, MAX(displayName), SUM(count), MAX(lastUnit), MAX(lastUsedAt)
+                FROM IngredientUsage
+                GROUP BY name
+            """)
+
         cur.execute("""
             CREATE TABLE IF NOT EXISTS PasswordResetToken (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -0,0 +1,294 @@
+"""
+Metrics.py – Latenz-Histogramme, SQL-Timing und Prometheus-Text-Export
+
+Jeder Worker sammelt seine Messwerte im Prozessspeicher. Ist METRICS_DIR gesetzt
+(gunicorn mit mehreren Workern), schreibt jeder Worker seinen Stand regelmäßig als
+metrics-<pid>.json in dieses Verzeichnis; /metrics führt alle Dateien zusammen.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+METRICS_DIR = os.environ.get("METRICS_DIR")
+METRICS_FLUSH_SECONDS = float(os.environ.get("METRICS_FLUSH_SECONDS", "2"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+_HELP = {
+    "lazycook_http_request_duration_seconds": "Latenz pro Route",
+    "lazycook_stage_duration_seconds": "Dauer einzelner Verarbeitungsschritte",
+    "lazycook_db_statement_duration_seconds": "Dauer einzelner SQL-Statements",
+    "lazycook_db_connections_per_request": "Geöffnete DB-Verbindungen pro Request",
+    "lazycook_db_statements_per_request": "Ausgeführte SQL-Statements pro Request",
+    "lazycook_db_group_commit_ops": "Schreibvorgänge pro gemeinsamem Commit",
+    "lazycook_startup_duration_seconds": "Dauer der Startphasen pro Prozess",
+}
+
+_lock = threading.Lock()
+# (metric, labels) -> {"buckets": tuple, "counts": list, "sum": float, "count": int}
+_histograms: dict[tuple[str, tuple], dict] = {}
+_lastFlush = 0.0
+
+# Pro-Request-Zähler für DB-Zugriffe, gesetzt von der Middleware
+_requestStats: ContextVar[dict | None] = ContextVar("requestStats", default=None)
+
+
+# ── Erfassung ──────────────────────────────────────────────────
+
+
+def observe(metric: str, labels: dict, value: float, buckets=LATENCY_BUCKETS) -> None:
+    """Trägt einen Messwert in das Histogramm (metric, labels) ein."""
+    key = (metric, tuple(sorted(labels.items())))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = {
+                "buckets": buckets,
+                "counts": [0] * len(buckets),
+                "sum": 0.0,
+                "count": 0,
+            }
+            _histograms[key] = hist
+        for i, bound in enumerate(hist["buckets"]):
+            if value <= bound:
+                hist["counts"][i] += 1
+        hist["sum"] += value
+        hist["count"] += 1
+    _maybeFlush()
+
+
+@contextmanager
+def timed(stage: str):
+    """Misst die Dauer eines Verarbeitungsschritts, z.B. timed("search.scoring")."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(
+            "lazycook_stage_duration_seconds",
+            {"stage": stage},
+            time.perf_counter() - start,
+        )
+
+
+def recordConnectionOpened() -> None:
+    stats = _requestStats.get()
+    if stats is not None:
+        stats["connections"] += 1
+
+
+def recordStatement(sql: str, elapsed: float) -> None:
+    stats = _requestStats.get()
+    if stats is not None:
+        stats["statements"] += 1
+    observe(
+        "lazycook_db_statement_duration_seconds",
+        {"operation": _operation(sql)},
+        elapsed,
+        STATEMENT_BUCKETS,
+    )
+
+
+def _operation(sql: str) -> str:
+    keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "PRAGMA"):
+        return keyword
+    return "OTHER"
+
+
+# ── ASGI-Middleware ────────────────────────────────────────────
+
+
+class MetricsMiddleware:
+    """Misst die Latenz jeder HTTP-Anfrage pro Route sowie die DB-Zugriffe pro Request."""
+
+    def __init__(self, app):
+        self.app = app
+        self.__routeTemplates: dict[int, str] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def sendWrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        stats = {"connections": 0, "statements": 0}
+        token = _requestStats.set(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, sendWrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _requestStats.reset(token)
+            route = self._routeTemplate(scope)
+            observe(
+                "lazycook_http_request_duration_seconds",
+                {
+                    "method": scope["method"],
+                    "route": route,
+                    "status": str(status["code"]),
+                },
+                elapsed,
+            )
+            observe(
+                "lazycook_db_connections_per_request",
+                {"route": route},
+                stats["connections"],
+                COUNT_BUCKETS,
+            )
+            observe(
+                "lazycook_db_statements_per_request",
+                {"route": route},
+                stats["statements"],
+                COUNT_BUCKETS,
+            )
+
+    def _routeTemplate(self, scope) -> str:
+        """Liefert das Pfad-Template (z.B. /recipes/{id}) statt des konkreten Pfads."""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        template = self.__routeTemplates.get(id(endpoint))
+        if template is None:
+            template = "unmatched"
+            router = scope.get("router")
+            for route in getattr(router, "routes", []):
+                if getattr(route, "endpoint", None) is endpoint:
+                    template = route.path
+                    break
+            self.__routeTemplates[id(endpoint)] = template
+        return template
+
+
+# ── Export ─────────────────────────────────────────────────────
+
+
+def _snapshot() -> list[dict]:
+    with _lock:
+        return [
+            {
+                "metric": metric,
+                "labels": list(labels),
+                "buckets": list(hist["buckets"]),
+                "counts": list(hist["counts"]),
+                "sum": hist["sum"],
+                "count": hist["count"],
+            }
+            for (metric, labels), hist in _histograms.items()
+        ]
+
+
+def _maybeFlush() -> None:
+    global _lastFlush
+    if not METRICS_DIR:
+        return
+    now = time.monotonic()
+    if now - _lastFlush < METRICS_FLUSH_SECONDS:
+        return
+    _lastFlush = now
+    flush()
+
+
+def flush() -> None:
+    """Schreibt den Stand dieses Workers atomar nach METRICS_DIR."""
+    if not METRICS_DIR:
+        return
+    directory = Path(METRICS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f"metrics-{os.getpid()}.json"
+    tmp = target.with_suffix(".tmp")
+    try:
+        tmp.write_text(json.dumps(_snapshot()), encoding="utf-8")
+        os.replace(tmp, target)
+    except OSError as e:
+        logger.warning("Metriken konnten nicht geschrieben werden: %s", e)
+
+
+def resetMultiprocessDir() -> None:
+    """Entfernt Metrik-Dateien früherer Läufe (vor dem Start der Worker aufrufen)."""
+    if not METRICS_DIR:
+        return
+    for file in Path(METRICS_DIR).glob("metrics-*.json"):
+        file.unlink(missing_ok=True)
+
+
+def _collect() -> list[dict]:
+    if not METRICS_DIR:
+        return _snapshot()
+    flush()
+    entries = []
+    for file in Path(METRICS_DIR).glob("metrics-*.json"):
+        try:
+            entries.extend(json.loads(file.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return entries
+
+
+def _escapeLabel(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formatLabels(labels) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escapeLabel(v)}"' for k, v in labels)
+    return "{" + inner + "}"
+
+
+def renderPrometheus() -> str:
+    """Fasst alle Worker zusammen und gibt das Prometheus-Textformat zurück."""
+    merged: dict[tuple[str, tuple], dict] = {}
+    for entry in _collect():
+        key = (entry["metric"], tuple(tuple(label) for label in entry["labels"]))
+        hist = merged.get(key)
+        if hist is None:
+            merged[key] = {
+                "buckets": entry["buckets"],
+                "counts": list(entry["counts"]),
+                "sum": entry["sum"],
+                "count": entry["count"],
+            }
+            continue
+        hist["counts"] = [a + b for a, b in zip(hist["counts"], entry["counts"])]
+        hist["sum"] += entry["sum"]
+        hist["count"] += entry["count"]
+
+    lines = []
+    seen = set()
+    for (metric, labels), hist in sorted(merged.items(), key=lambda kv: kv[0]):
+        if metric not in seen:
+            seen.add(metric)
+            lines.append(f"# HELP {metric} {_HELP.get(metric, metric)}")
+            lines.append(f"# TYPE {metric} histogram")
+        for bound, count in zip(hist["buckets"], hist["counts"]):
+            bucketLabels = _formatLabels(labels + (("le", bound),))
+            lines.append(f"{metric}_bucket{bucketLabels} {count}")
+        lines.append(
+            f"{metric}_bucket{_formatLabels(labels + (('le', '+Inf'),))} {hist['count']}"
+        )
+        lines.append(f"{metric}_sum{_formatLabels(labels)} {hist['sum']}")
+        lines.append(f"{metric}_count{_formatLabels(labels)} {hist['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """Leert alle Messwerte dieses Prozesses (für Tests)."""
+    with _lock:
+        _histograms.clear()
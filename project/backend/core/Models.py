@@ -52,3 +52,27 @@ class RecipeSearchRequest(BaseModel):
     zutaten: list[IngredientSearch]
     servings: int = 1
     index: int = 0
+    personalized: bool = False
+    pageSize: int | None = None
+    # Höchstens so viele Minuten geschätzte Zubereitungszeit (domain.duration)
+    maxDuration: int | None = None
+
+
+class ExclusionList(BaseModel):
+    ingredients: list[str]
+
+
+class ShoppingListRequest(BaseModel):
+    recipeIds: list[int]
+    servings: int = 1
+    onHand: list[IngredientSearch] = []
+
+
+class UsageItem(BaseModel):
+    accountId: int
+    name: str
+    unit: str | None = None
+
+
+class ReplicationUsageRequest(BaseModel):
+    items: list[UsageItem]
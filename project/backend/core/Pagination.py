@@ -0,0 +1,70 @@
+"""
+Pagination.py – Opake Cursor-Tokens für Keyset-Pagination
+"""
+
+import base64
+import json
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 12
+MAX_PAGE_SIZE = 100
+# Wertebereich von SQLite INTEGER; größere Ids würden erst in der Abfrage scheitern
+SQLITE_INT_MIN = -(2**63)
+SQLITE_INT_MAX = 2**63 - 1
+
+
+def encodeCursor(values: list) -> str:
+    """Kodiert den Sortierschlüssel des letzten Eintrags als URL-sicheres Token."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decodeCursor(token: str | None) -> list | None:
+    """Gibt die Werte des Tokens zurück, None ohne Token. Wirft ValueError bei Unsinn."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Ungültiger Cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Ungültiger Cursor")
+    return values
+
+
+def _matches(value, expected: type) -> bool:
+    if expected is int:
+        return (
+            isinstance(value, int)
+            and not isinstance(value, bool)
+            and SQLITE_INT_MIN <= value <= SQLITE_INT_MAX
+        )
+    return isinstance(value, expected)
+
+
+def parseCursor(token: str | None, *types: type) -> tuple | None:
+    """
+    Dekodiert das Token und prüft, dass es genau Werte der Typen types enthält
+    (ints im SQLite-Bereich). None ohne Token, sonst HTTPException 400.
+    """
+    try:
+        values = decodeCursor(token)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if values is None:
+        return None
+    if len(values) != len(types) or not all(map(_matches, values, types)):
+        raise HTTPException(status_code=400, detail="Ungültiger Cursor")
+    return tuple(values)
+
+
+def clampPageSize(
+    limit: int | None,
+    default: int = DEFAULT_PAGE_SIZE,
+    maximum: int = MAX_PAGE_SIZE,
+) -> int:
+    if limit is None:
+        return default
+    return max(1, min(limit, maximum))
@@ -0,0 +1,218 @@
+"""
+Profiler.py – Opt-in Sampling-Profiler für einzelne Requests
+
+Ein Request wird profiliert, wenn er den Header "X-Profile: <ADMIN_TOKEN>" trägt
+oder per Zufall mit PROFILE_SAMPLE_RATE ausgewählt wird. Ein Hintergrund-Thread
+liest dann alle PROFILE_INTERVAL_MS den Stack des Event-Loop-Threads. Den teilen
+sich alle Requests des Workers, deshalb zählen nur Samples, während genau ein
+Request läuft; bei Parallelbetrieb wird das Profil entsprechend dünner. Code in
+Threadpool-Threads (synchrone Endpunkte, run_in_threadpool) erfasst es nicht.
+Frames heißen modul.funktion, Zeilen innerhalb einer Funktion werden
+zusammengefasst. Das Ergebnis wird als Collapsed-Stack (.folded, z.B. für
+flamegraph.pl) und als speedscope-JSON in PROFILE_DIR abgelegt; es bleiben
+höchstens PROFILE_KEEP Profile erhalten. Stoppen und Schreiben laufen im
+Threadpool, damit der Event-Loop nicht auf Join und Dateisystem wartet. Ohne
+Token und mit Rate 0 reicht die Middleware Requests unverändert durch.
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastapi.concurrency import run_in_threadpool
+
+from core import Auth
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = Path(
+    os.environ.get(
+        "PROFILE_DIR", Path(__file__).parent.parent.parent / "data" / "profiles"
+    )
+)
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "50"))
+
+_PROFILE_HEADER = b"x-profile"
+
+
+class StackSampler:
+    """Sammelt in festen Abständen den Stack eines Threads, solange isolated() gilt."""
+
+    def __init__(
+        self,
+        threadId: int,
+        intervalMs: float = PROFILE_INTERVAL_MS,
+        isolated=lambda: True,
+    ):
+        self.__threadId = threadId
+        self.__interval = intervalMs / 1000
+        self.__isolated = isolated
+        self.__stacks: Counter[tuple[tuple[str, str, int], ...]] = Counter()
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def stop(self) -> Counter:
+        self.__stop.set()
+        self.__thread.join()
+        return self.__stacks
+
+    def getInterval(self) -> float:
+        return self.__interval
+
+    def __run(self) -> None:
+        while not self.__stop.wait(self.__interval):
+            if not self.__isolated():
+                continue
+            frame = sys._current_frames().get(self.__threadId)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                module = frame.f_globals.get("__name__", "?")
+                stack.append(
+                    (
+                        f"{module}.{code.co_qualname}",
+                        code.co_filename,
+                        code.co_firstlineno,
+                    )
+                )
+                frame = frame.f_back
+            self.__stacks[tuple(reversed(stack))] += 1
+
+
+# ── Ausgabeformate ─────────────────────────────────────────────
+
+
+def toCollapsed(stacks: Counter) -> str:
+    """Brendan-Gregg-Format: "root;child;leaf anzahl" pro Zeile."""
+    lines = []
+    for stack, count in stacks.most_common():
+        names = ";".join(name for name, _, _ in stack)
+        lines.append(f"{names} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def toSpeedscope(stacks: Counter, name: str, intervalMs: float) -> dict:
+    frames: list[dict] = []
+    frameIndex: dict[tuple[str, str, int], int] = {}
+    samples = []
+    weights = []
+    for stack, count in stacks.most_common():
+        indices = []
+        for frame in stack:
+            if frame not in frameIndex:
+                frameIndex[frame] = len(frames)
+                frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            indices.append(frameIndex[frame])
+        samples.append(indices)
+        weights.append(count * intervalMs)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "lazycook",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+    }
+
+
+def writeProfile(stacks: Counter, method: str, path: str, intervalMs: float) -> str:
+    """Schreibt beide Formate und wendet die Aufbewahrungsgrenze an. Gibt die ID zurück."""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+    profileId = f"{stamp}-{method}-{slug}-{os.getpid()}"
+    title = f"{method} {path}"
+    (PROFILE_DIR / f"{profileId}.folded").write_text(
+        toCollapsed(stacks), encoding="utf-8"
+    )
+    (PROFILE_DIR / f"{profileId}.speedscope.json").write_text(
+        json.dumps(toSpeedscope(stacks, title, intervalMs)), encoding="utf-8"
+    )
+    _applyRetention()
+    return profileId
+
+
+def _applyRetention() -> None:
+    profiles = sorted(PROFILE_DIR.glob("*.folded"), key=lambda p: p.stat().st_mtime)
+    for folded in profiles[: max(0, len(profiles) - PROFILE_KEEP)]:
+        folded.unlink(missing_ok=True)
+        folded.with_name(folded.stem + ".speedscope.json").unlink(missing_ok=True)
+
+
+# ── ASGI-Middleware ────────────────────────────────────────────
+
+
+def _finishProfile(sampler: StackSampler, method: str, path: str) -> None:
+    stacks = sampler.stop()
+    try:
+        profileId = writeProfile(stacks, method, path, sampler.getInterval() * 1000)
+        logger.info("Profil geschrieben: %s", profileId)
+    except OSError as e:
+        logger.warning("Profil konnte nicht geschrieben werden: %s", e)
+
+
+class ProfilingMiddleware:
+    """Profiliert ausgewählte Requests; alle anderen werden direkt durchgereicht."""
+
+    def __init__(self, app):
+        self.app = app
+        # Laufende HTTP-Requests dieses Workers (nur im Event-Loop verändert)
+        self.__inFlight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.__inFlight += 1
+        try:
+            if self._shouldProfile(scope):
+                await self.__profile(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            self.__inFlight -= 1
+
+    async def __profile(self, scope, receive, send):
+        sampler = StackSampler(
+            threading.get_ident(), isolated=lambda: self.__inFlight == 1
+        )
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await run_in_threadpool(
+                _finishProfile, sampler, scope["method"], scope["path"]
+            )
+
+    def _shouldProfile(self, scope) -> bool:
+        if Auth.ADMIN_TOKEN:
+            for name, value in scope["headers"]:
+                if name == _PROFILE_HEADER:
+                    return secrets.compare_digest(
+                        value.decode("latin-1"), Auth.ADMIN_TOKEN
+                    )
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
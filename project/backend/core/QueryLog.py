@@ -0,0 +1,332 @@
+"""
+QueryLog.py – Slow-Query-Log und EXPLAIN-QUERY-PLAN-Erfassung für DAO-Statements
+
+Debug-Modus, aktiviert über SLOW_QUERY_MS (Schwellwert in Millisekunden). Dann wird
+für jedes unterschiedliche Statement einmalig der Query-Plan erfasst und jede
+Ausführung oberhalb des Schwellwerts mit der Form ihrer Parameter protokolliert.
+Die Daten liegen in einer eigenen SQLite-Datei, damit alle gunicorn-Worker
+hineinschreiben und CLI bzw. /debug/slow-queries sie auswerten können. Die
+Einträge landen zuerst in einer Queue; ein Hintergrund-Thread schreibt sie
+gesammelt in einer Transaktion, sodass ein langsames Statement nicht auch noch
+auf Öffnen und Commit der Log-Datei warten muss.
+
+CLI (aus project/backend):
+    python -m core.QueryLog --limit 20 [--scans-only] [--plans] [--reset]
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_slowQueryMs = os.environ.get("SLOW_QUERY_MS")
+SLOW_QUERY_MS = float(_slowQueryMs) if _slowQueryMs else None
+QUERY_LOG_PATH = Path(
+    os.environ.get(
+        "QUERY_LOG_PATH",
+        Path(__file__).parent.parent.parent / "data" / "querylog.sqlite3",
+    )
+)
+
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+_FULL_SCAN_RE = re.compile(r"^SCAN (\w+)$")
+
+LOG_BATCH_SIZE = 500
+LOG_IDLE_SECONDS = 1.0
+
+_lock = threading.Lock()
+_explained: set[str] = set()
+# ("slow", Parameter) bzw. ("plan", Parameter) für die Statements unten
+_pending: queue.Queue = queue.Queue()
+_writer: threading.Thread | None = None
+_writerLock = threading.Lock()
+
+_INSERT_SLOW = """
+    INSERT INTO SlowQuery (fingerprint, paramShape, sql, count, totalMs, maxMs)
+    VALUES (?, ?, ?, 1, ?, ?)
+    ON CONFLICT(fingerprint, paramShape) DO UPDATE SET
+        count = count + 1,
+        totalMs = totalMs + excluded.totalMs,
+        maxMs = MAX(maxMs, excluded.maxMs),
+        lastSeenAt = CURRENT_TIMESTAMP
+"""
+_INSERT_PLAN = (
+    "INSERT OR IGNORE INTO QueryPlan (fingerprint, sql, plan, fullScans) "
+    "VALUES (?, ?, ?, ?)"
+)
+
+
+def isEnabled() -> bool:
+    return SLOW_QUERY_MS is not None
+
+
+def normalizeSql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def fingerprint(sql: str) -> str:
+    return hashlib.sha1(normalizeSql(sql).encode()).hexdigest()[:16]
+
+
+def parameterShape(parameters) -> str:
+    """Beschreibt die Parameter ohne ihre Werte, z.B. "(int, str, NoneType)"."""
+    if isinstance(parameters, dict):
+        return (
+            "{"
+            + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items())
+            + "}"
+        )
+    return "(" + ", ".join(type(p).__name__ for p in parameters) + ")"
+
+
+def fullScans(plan: list[str]) -> list[str]:
+    """Tabellen, die laut Plan ohne Index vollständig gescannt werden."""
+    return [m.group(1) for m in map(_FULL_SCAN_RE.match, plan) if m]
+
+
+# ── Erfassung ──────────────────────────────────────────────────
+
+
+def _connectLog() -> sqlite3.Connection:
+    QUERY_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(str(QUERY_LOG_PATH), timeout=5)
+    con.row_factory = sqlite3.Row
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS QueryPlan (
+            fingerprint TEXT PRIMARY KEY,
+            sql TEXT NOT NULL,
+            plan TEXT NOT NULL,
+            fullScans TEXT NOT NULL,
+            capturedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS SlowQuery (
+            fingerprint TEXT NOT NULL,
+            paramShape TEXT NOT NULL,
+            sql TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            totalMs REAL NOT NULL DEFAULT 0,
+            maxMs REAL NOT NULL DEFAULT 0,
+            lastSeenAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (fingerprint, paramShape)
+        )
+    """)
+    return con
+
+
+def record(con: sqlite3.Connection, sql: str, parameters, elapsed: float) -> None:
+    """Wird von core.Database nach jedem Statement aufgerufen (nur im Debug-Modus)."""
+    key = fingerprint(sql)
+    if key not in _explained:
+        _capturePlan(con, key, sql, parameters)
+
+    elapsedMs = elapsed * 1000
+    if elapsedMs < SLOW_QUERY_MS:
+        return
+    shape = parameterShape(parameters)
+    logger.warning(
+        "Langsame Query (%.1f ms, Parameter %s): %s",
+        elapsedMs,
+        shape,
+        normalizeSql(sql),
+    )
+    _enqueue("slow", (key, shape, normalizeSql(sql), elapsedMs, elapsedMs))
+
+
+def _capturePlan(con: sqlite3.Connection, key: str, sql: str, parameters) -> None:
+    _explained.add(key)
+    keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    if keyword not in _EXPLAINABLE:
+        return
+    try:
+        # Eigener, ungemessener Cursor: darf das laufende Ergebnis nicht überschreiben
+        cur = con.cursor(sqlite3.Cursor)
+        rows = cur.execute("EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+    except sqlite3.Error as e:
+        logger.debug("EXPLAIN fehlgeschlagen für %s: %s", normalizeSql(sql), e)
+        return
+    plan = [row[3] for row in rows]
+    scans = fullScans(plan)
+    if scans:
+        logger.warning(
+            "Full-Table-Scan auf %s: %s", ", ".join(scans), normalizeSql(sql)
+        )
+    _enqueue("plan", (key, normalizeSql(sql), "\n".join(plan), ",".join(scans)))
+
+
+def _enqueue(kind: str, parameters: tuple) -> None:
+    global _writer
+    _pending.put((kind, parameters))
+    with _writerLock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writeLoop, name="query-log", daemon=True)
+            _writer.start()
+
+
+def _writeLoop() -> None:
+    while True:
+        try:
+            first = _pending.get(timeout=LOG_IDLE_SECONDS)
+        except queue.Empty:
+            return
+        batch = [first]
+        while len(batch) < LOG_BATCH_SIZE:
+            try:
+                batch.append(_pending.get_nowait())
+            except queue.Empty:
+                break
+        _writeBatch(batch)
+
+
+def _writeBatch(batch: list[tuple[str, tuple]]) -> None:
+    try:
+        with _lock:
+            log = _connectLog()
+            try:
+                log.executemany(_INSERT_PLAN, [p for k, p in batch if k == "plan"])
+                log.executemany(_INSERT_SLOW, [p for k, p in batch if k == "slow"])
+                log.commit()
+            finally:
+                log.close()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(
+            "Slow-Query-Log (%d Einträge) konnte nicht geschrieben werden: %s",
+            len(batch),
+            e,
+        )
+    finally:
+        for _ in batch:
+            _pending.task_done()
+
+
+def flush() -> None:
+    """Schreibt alle noch wartenden Einträge sofort (vor dem Auswerten)."""
+    batch = []
+    while True:
+        try:
+            batch.append(_pending.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        _writeBatch(batch)
+    # Wartet auch auf einen Batch, den der Hintergrund-Thread gerade schreibt
+    _pending.join()
+
+
+# ── Auswertung ─────────────────────────────────────────────────
+
+
+def getTopOffenders(limit: int = 20, scansOnly: bool = False) -> list[dict]:
+    """Statements sortiert nach Gesamtzeit oberhalb des Schwellwerts, inkl. Query-Plan."""
+    flush()
+    if not QUERY_LOG_PATH.exists():
+        return []
+    log = _connectLog()
+    try:
+        rows = log.execute(
+            f"""
+            SELECT s.fingerprint, s.sql, s.paramShape, s.count, s.totalMs, s.maxMs,
+                   s.lastSeenAt, p.plan, COALESCE(p.fullScans, '') AS fullScans
+            FROM SlowQuery s
+            LEFT JOIN QueryPlan p ON p.fingerprint = s.fingerprint
+            {"WHERE p.fullScans != ''" if scansOnly else ""}
+            ORDER BY s.totalMs DESC
+            LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+    finally:
+        log.close()
+    return [
+        {
+            **dict(row),
+            "plan": row["plan"].split("\n") if row["plan"] else [],
+            "fullScans": row["fullScans"].split(",") if row["fullScans"] else [],
+        }
+        for row in rows
+    ]
+
+
+def getPlansWithScans() -> list[dict]:
+    """Alle erfassten Statements mit Full-Table-Scan, auch wenn sie (noch) schnell sind."""
+    flush()
+    if not QUERY_LOG_PATH.exists():
+        return []
+    log = _connectLog()
+    try:
+        rows = log.execute(
+            "SELECT fingerprint, sql, plan, fullScans FROM QueryPlan "
+            "WHERE fullScans != '' ORDER BY capturedAt"
+        ).fetchall()
+    finally:
+        log.close()
+    return [
+        {
+            **dict(row),
+            "plan": row["plan"].split("\n"),
+            "fullScans": row["fullScans"].split(","),
+        }
+        for row in rows
+    ]
+
+
+def reset() -> None:
+    """Löscht das Log und vergisst bereits erfasste Pläne."""
+    while True:
+        try:
+            _pending.get_nowait()
+        except queue.Empty:
+            break
+        _pending.task_done()
+    _pending.join()
+    with _lock:
+        _explained.clear()
+        QUERY_LOG_PATH.unlink(missing_ok=True)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Slow-Query-Log auswerten")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--scans-only", action="store_true")
+    parser.add_argument(
+        "--plans", action="store_true", help="alle Statements mit Full-Table-Scan"
+    )
+    parser.add_argument("--reset", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.reset:
+        reset()
+        print("Query-Log geleert.")
+        return
+
+    if args.plans:
+        for entry in getPlansWithScans():
+            print(f"SCAN {', '.join(entry['fullScans'])}: {entry['sql']}")
+            for line in entry["plan"]:
+                print(f"      {line}")
+        return
+
+    offenders = getTopOffenders(args.limit, args.scans_only)
+    for entry in offenders:
+        scans = f"  SCAN: {', '.join(entry['fullScans'])}" if entry["fullScans"] else ""
+        print(
+            f"{entry['totalMs']:10.1f} ms gesamt  {entry['count']:6d}x  "
+            f"max {entry['maxMs']:8.1f} ms  {entry['paramShape']}{scans}"
+        )
+        print(f"    {entry['sql']}")
+        for line in entry["plan"]:
+            print(f"      {line}")
+    if not offenders:
+        print("Keine langsamen Queries protokolliert.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""
+RateLimit.py – Token-Bucket-Rate-Limiting und Login-Throttling
+
+Teure Endpunkte (bcrypt, SMTP) werden pro IP über Token-Buckets begrenzt,
+fehlgeschlagene Logins zusätzlich pro Account über ein Sliding Window.
+Standardmäßig liegt der Zustand im Prozessspeicher (pro gunicorn-Worker).
+Mit RATE_LIMIT_STORE=sqlite teilen sich alle Worker eine eigene SQLite-Datei
+(RATE_LIMIT_DB_PATH), damit die Grenzen workerübergreifend exakt sind.
+
+Hinter Proxys (RATE_LIMIT_TRUST_PROXY=1) gilt als Client-Adresse der Eintrag
+in X-Forwarded-For, den der äußerste der RATE_LIMIT_TRUSTED_HOPS Proxys
+angehängt hat. Alles weiter links kann der Client selbst geschrieben haben.
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+
+from fastapi import HTTPException, Request, status
+
+logger = logging.getLogger(__name__)
+
+# ── Konfiguration ──────────────────────────────────────────────
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "1") != "0"
+RATE_LIMIT_STORE = os.environ.get("RATE_LIMIT_STORE", "memory")
+RATE_LIMIT_DB_PATH = Path(
+    os.environ.get(
+        "RATE_LIMIT_DB_PATH",
+        Path(__file__).parent.parent.parent / "data" / "ratelimit.sqlite3",
+    )
+)
+TRUST_PROXY_HEADERS = os.environ.get("RATE_LIMIT_TRUST_PROXY", "0") == "1"
+# Anzahl Proxys vor dem Backend, die X-Forwarded-For jeweils rechts ergänzen
+TRUSTED_PROXY_HOPS = max(1, int(os.environ.get("RATE_LIMIT_TRUSTED_HOPS", "1")))
+
+_MAX_MEMORY_KEYS = 10_000
+# SQLiteStore: alle paar Minuten Zeilen löschen, die länger ungenutzt sind als
+# jedes Fenster (LoginThrottle: 15 min) und jede vollständige Nachfüllzeit
+_SWEEP_INTERVAL_SECONDS = 300
+_STALE_AFTER_SECONDS = 3600
+
+
+# ── Stores ─────────────────────────────────────────────────────
+
+
+class MemoryStore:
+    """Token-Buckets und Sliding Windows im Prozessspeicher."""
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        # key -> [tokens, updatedAt, capacity, refillPerSecond]
+        self.__buckets: dict[str, list] = {}
+        # key -> deque[timestamp], zuletzt benutzte Schlüssel am Ende
+        self.__windows: OrderedDict[str, deque] = OrderedDict()
+
+    def consume(self, key: str, capacity: float, refillPerSecond: float) -> float:
+        """Entnimmt ein Token. Gibt 0 zurück oder die Sekunden bis zum nächsten Token."""
+        now = time.monotonic()
+        with self.__lock:
+            bucket = self.__buckets.get(key)
+            if bucket is None:
+                if len(self.__buckets) >= _MAX_MEMORY_KEYS:
+                    self.__sweep(now)
+                bucket = [capacity, now, capacity, refillPerSecond]
+                self.__buckets[key] = bucket
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * refillPerSecond)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return 0.0
+            bucket[0] = tokens
+            return (1 - tokens) / refillPerSecond
+
+    def countInWindow(self, key: str, windowSeconds: float) -> int:
+        now = time.monotonic()
+        with self.__lock:
+            events = self.__windows.get(key)
+            if not events:
+                return 0
+            while events and events[0] <= now - windowSeconds:
+                events.popleft()
+            if not events:
+                del self.__windows[key]
+                return 0
+            return len(events)
+
+    def windowRetryAfter(self, key: str, windowSeconds: float, limit: int) -> float:
+        """0, solange weniger als `limit` Einträge im Fenster liegen, sonst die
+        Sekunden, bis genug davon abgelaufen sind."""
+        now = time.monotonic()
+        with self.__lock:
+            events = self.__windows.get(key)
+            if not events:
+                return 0.0
+            while events and events[0] <= now - windowSeconds:
+                events.popleft()
+            if len(events) < limit:
+                return 0.0
+            return events[len(events) - limit] + windowSeconds - now
+
+    def addToWindow(self, key: str) -> None:
+        with self.__lock:
+            if key not in self.__windows:
+                # Älteste Fenster zuerst verwerfen, nie alle auf einmal
+                while len(self.__windows) >= _MAX_MEMORY_KEYS:
+                    self.__windows.popitem(last=False)
+            self.__windows.setdefault(key, deque()).append(time.monotonic())
+            self.__windows.move_to_end(key)
+
+    def clearWindow(self, key: str) -> None:
+        with self.__lock:
+            self.__windows.pop(key, None)
+
+    def __sweep(self, now: float) -> None:
+        """Entfernt Buckets, die ohnehin wieder voll wären."""
+        full = [
+            key
+            for key, (tokens, updatedAt, capacity, rate) in self.__buckets.items()
+            if tokens + (now - updatedAt) * rate >= capacity
+        ]
+        for key in full:
+            del self.__buckets[key]
+
+
+class SQLiteStore:
+    """Wie MemoryStore, aber in einer eigenen SQLite-Datei, geteilt von allen Workern."""
+
+    def __init__(self, path: Path = RATE_LIMIT_DB_PATH):
+        self.__path = path
+        self.__lastSweep = 0.0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        con = self.__connect()
+        try:
+            con.execute("PRAGMA journal_mode = WAL")
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS RateBucket (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updatedAt REAL NOT NULL
+                )
+            """)
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS RateEvent (
+                    key TEXT NOT NULL,
+                    at REAL NOT NULL
+                )
+            """)
+            con.execute(
+                "CREATE INDEX IF NOT EXISTS idx_rateevent_key ON RateEvent (key, at)"
+            )
+        finally:
+            con.close()
+
+    def __connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.__path), timeout=5, isolation_level=None)
+
+    def __maybeSweep(self, con: sqlite3.Connection, now: float) -> None:
+        """Entfernt Buckets, die ohnehin wieder voll wären, und abgelaufene Einträge."""
+        if now - self.__lastSweep < _SWEEP_INTERVAL_SECONDS:
+            return
+        self.__lastSweep = now
+        con.execute(
+            "DELETE FROM RateBucket WHERE updatedAt < ?", (now - _STALE_AFTER_SECONDS,)
+        )
+        con.execute("DELETE FROM RateEvent WHERE at < ?", (now - _STALE_AFTER_SECONDS,))
+
+    def consume(self, key: str, capacity: float, refillPerSecond: float) -> float:
+        now = time.time()
+        con = self.__connect()
+        try:
+            self.__maybeSweep(con, now)
+            con.execute("BEGIN IMMEDIATE")
+            row = con.execute(
+                "SELECT tokens, updatedAt FROM RateBucket WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = (
+                capacity if row is None else row[0] + (now - row[1]) * refillPerSecond
+            )
+            tokens = min(capacity, tokens)
+            retryAfter = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retryAfter = (1 - tokens) / refillPerSecond
+            con.execute(
+                "INSERT INTO RateBucket (key, tokens, updatedAt) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, "
+                "updatedAt = excluded.updatedAt",
+                (key, tokens, now),
+            )
+            con.execute("COMMIT")
+            return retryAfter
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        finally:
+            con.close()
+
+    def countInWindow(self, key: str, windowSeconds: float) -> int:
+        con = self.__connect()
+        try:
+            con.execute(
+                "DELETE FROM RateEvent WHERE key = ? AND at <= ?",
+                (key, time.time() - windowSeconds),
+            )
+            return con.execute(
+                "SELECT COUNT(*) FROM RateEvent WHERE key = ?", (key,)
+            ).fetchone()[0]
+        finally:
+            con.close()
+
+    def windowRetryAfter(self, key: str, windowSeconds: float, limit: int) -> float:
+        now = time.time()
+        con = self.__connect()
+        try:
+            con.execute(
+                "DELETE FROM RateEvent WHERE key = ? AND at <= ?",
+                (key, now - windowSeconds),
+            )
+            # Der limit-jüngste Eintrag muss ablaufen, damit wieder Platz ist
+            row = con.execute(
+                "SELECT at FROM RateEvent WHERE key = ? ORDER BY at DESC "
+                "LIMIT 1 OFFSET ?",
+                (key, limit - 1),
+            ).fetchone()
+            return 0.0 if row is None else row[0] + windowSeconds - now
+        finally:
+            con.close()
+
+    def addToWindow(self, key: str) -> None:
+        now = time.time()
+        con = self.__connect()
+        try:
+            self.__maybeSweep(con, now)
+            con.execute("INSERT INTO RateEvent (key, at) VALUES (?, ?)", (key, now))
+        finally:
+            con.close()
+
+    def clearWindow(self, key: str) -> None:
+        con = self.__connect()
+        try:
+            con.execute("DELETE FROM RateEvent WHERE key = ?", (key,))
+        finally:
+            con.close()
+
+
+_store = None
+_storeLock = threading.Lock()
+
+
+def getStore():
+    global _store
+    if _store is None:
+        with _storeLock:
+            if _store is None:
+                _store = (
+                    SQLiteStore() if RATE_LIMIT_STORE == "sqlite" else MemoryStore()
+                )
+    return _store
+
+
+def setStore(store) -> None:
+    """Ersetzt den Store (z.B. in Tests)."""
+    global _store
+    _store = store
+
+
+# ── Limiter ────────────────────────────────────────────────────
+
+
+def _tooManyRequests(retryAfter: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Zu viele Anfragen. Bitte später erneut versuchen.",
+        headers={"Retry-After": str(max(1, math.ceil(retryAfter)))},
+    )
+
+
+class RateLimiter:
+    """Token-Bucket: `capacity` Anfragen am Stück, danach `perMinute` pro Minute."""
+
+    def __init__(self, name: str, capacity: int, perMinute: float):
+        self.__name = name
+        self.__capacity = capacity
+        self.__refill = perMinute / 60
+
+    def check(self, key: str) -> None:
+        """Wirft HTTP 429, wenn für den Schlüssel kein Token mehr übrig ist."""
+        if not RATE_LIMIT_ENABLED or not key:
+            return
+        retryAfter = getStore().consume(
+            f"{self.__name}:{key.lower()}", self.__capacity, self.__refill
+        )
+        if retryAfter > 0:
+            logger.warning("Rate-Limit '%s' erreicht für %s", self.__name, key)
+            raise _tooManyRequests(retryAfter)
+
+    def perIp(self):
+        """FastAPI-Dependency, die das Limit pro Client-IP anwendet."""
+
+        async def dependency(request: Request) -> None:
+            self.check(clientIp(request))
+
+        return dependency
+
+
+class LoginThrottle:
+    """
+    Sliding Window über fehlgeschlagene Logins pro Account und Client-IP.
+    Fehlversuche von anderswo sperren den Inhaber also nicht aus; gegen
+    verteiltes Raten über viele IPs hilft das Limit pro IP (loginLimiter).
+    """
+
+    def __init__(self, maxFailures: int, windowSeconds: float):
+        self.__maxFailures = maxFailures
+        self.__window = windowSeconds
+
+    def check(self, account: str, ip: str) -> None:
+        if not RATE_LIMIT_ENABLED:
+            return
+        retryAfter = getStore().windowRetryAfter(
+            self._key(account, ip), self.__window, self.__maxFailures
+        )
+        if retryAfter > 0:
+            logger.warning("Login für %s von %s vorübergehend gesperrt", account, ip)
+            raise _tooManyRequests(retryAfter)
+
+    def recordFailure(self, account: str, ip: str) -> None:
+        if RATE_LIMIT_ENABLED:
+            getStore().addToWindow(self._key(account, ip))
+
+    def reset(self, account: str, ip: str) -> None:
+        if RATE_LIMIT_ENABLED:
+            getStore().clearWindow(self._key(account, ip))
+
+    def _key(self, account: str, ip: str) -> str:
+        return f"loginFailure:{account.strip().lower()}:{ip}"
+
+
+def forwardedClient(forwarded: str, peer: str) -> str:
+    """
+    Client-Adresse aus X-Forwarded-For (alle Header mit "," verbunden) und der
+    Gegenstelle der Verbindung. Jeder Proxy hängt rechts an, also zählt der
+    TRUSTED_PROXY_HOPS-te Eintrag von rechts; ist die Kette kürzer, kam der
+    Request nicht über alle Proxys und es gilt die Gegenstelle.
+    """
+    if not TRUST_PROXY_HEADERS:
+        return peer
+    entries = [e.strip() for e in forwarded.split(",") if e.strip()]
+    if len(entries) < TRUSTED_PROXY_HOPS:
+        return peer
+    return entries[-TRUSTED_PROXY_HOPS]
+
+
+def clientIp(request: Request) -> str:
+    return forwardedClient(
+        ",".join(request.headers.getlist("x-forwarded-for")),
+        request.client.host if request.client else "",
+    )
+
+
+# ── Limits der teuren Endpunkte ────────────────────────────────
+loginLimiter = RateLimiter("login", capacity=10, perMinute=10)
+registerLimiter = RateLimiter("register", capacity=5, perMinute=2)
+forgotPasswordLimiter = RateLimiter("forgotPassword", capacity=5, perMinute=2)
+forgotPasswordAccountLimiter = RateLimiter(
+    "forgotPasswordAccount", capacity=3, perMinute=0.2
+)
+loginThrottle = LoginThrottle(maxFailures=5, windowSeconds=15 * 60)
@@ -0,0 +1,544 @@
+"""
+Replication.py – Lese-Replikate über ausgelieferte SQLite-Snapshots
+
+Rollen (REPLICATION_ROLE):
+    primary   Erzeugt mit der Online-Backup-API konsistente Snapshots der DB und
+              liefert sie unter /replication/snapshot aus (ETag = SHA-256).
+              Zugangsdaten (Passwort-Hashes, Refresh- und Reset-Tokens) werden
+              vorher aus der Kopie entfernt, Replikate brauchen sie nie. Ein
+              neuer Snapshot entsteht nur, wenn seit dem letzten committet
+              wurde (PRAGMA data_version); alle Worker teilen sich die Datei.
+    replica   Holt alle REPLICATION_INTERVAL_SECONDS den aktuellen Snapshot (pro
+              Knoten nur ein Worker, per Dateisperre), prüft ihn und schaltet die
+              Lese-Connections per DB_READ_PATH auf die neue Datei um. Lesende
+              Requests bedient der Knoten selbst; schreibende leitet die
+              ReplicaForwardMiddleware an REPLICATION_PRIMARY_URL weiter, die
+              Zutaten-Nutzung der Suche geht gesammelt an /replication/usage.
+
+Replikate sind höchstens ein Intervall plus Übertragungszeit hinter dem Primary.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+from core import Database, Metrics, RateLimit
+
+logger = logging.getLogger(__name__)
+
+REPLICATION_ROLE = os.environ.get("REPLICATION_ROLE", "")
+REPLICATION_PRIMARY_URL = os.environ.get("REPLICATION_PRIMARY_URL", "").rstrip("/")
+REPLICATION_TOKEN = os.environ.get("REPLICATION_TOKEN")
+REPLICATION_INTERVAL_SECONDS = float(
+    os.environ.get("REPLICATION_INTERVAL_SECONDS", "5")
+)
+REPLICATION_STARTUP_TIMEOUT_SECONDS = float(
+    os.environ.get("REPLICATION_STARTUP_TIMEOUT_SECONDS", "60")
+)
+_replicationDir = os.environ.get("REPLICATION_DIR")
+REPLICATION_DIR = Path(_replicationDir) if _replicationDir else None
+
+# POST-Endpunkte, die nur lesen und daher auch auf Replikaten laufen
+REPLICA_LOCAL_POSTS = ("/recipes/search", "/shopping-list")
+USAGE_BATCH_SIZE = 100
+
+TOKEN_HEADER = "X-Replication-Token"
+
+# Läuft auf der Snapshot-Kopie: Anmeldung und Token-Refresh sind POSTs und gehen
+# immer an den Primary, Replikate lesen nur Katalog und Account-Daten
+_SCRUB_CREDENTIALS = (
+    "DELETE FROM RefreshToken",
+    "DELETE FROM PasswordResetToken",
+    "UPDATE Account SET hashedPassword = ''",
+)
+
+
+def isPrimary() -> bool:
+    return REPLICATION_ROLE == "primary"
+
+
+def isReplica() -> bool:
+    return REPLICATION_ROLE == "replica"
+
+
+def _directory() -> Path:
+    directory = REPLICATION_DIR or Database.DB_PATH.parent / "replication"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ── Primary ────────────────────────────────────────────────────
+
+
+_PRIMARY_POINTER = "PRIMARY"
+
+
+def _primaryPath(directory: Path, etag: str) -> Path:
+    return directory / f"primary-{etag[:16]}.db"
+
+
+def _readPrimaryPointer(directory: Path) -> tuple[str, int] | None:
+    """(ETag, Backup-Beginn in ns) des gemeinsamen Snapshots aller Primary-Worker."""
+    try:
+        pointer = json.loads((directory / _PRIMARY_POINTER).read_text(encoding="utf-8"))
+        return pointer["etag"], pointer["startedAt"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _lastWrite() -> int:
+    """
+    Obergrenze für den letzten Commit vor dem Start dieses Workers: mtime von
+    DB und WAL plus eine Sekunde, weil das Dateisystem mtime grob rundet.
+    """
+    mtimes = [0]
+    for path in (Database.DB_PATH, Path(f"{Database.DB_PATH}-wal")):
+        try:
+            mtimes.append(path.stat().st_mtime_ns)
+        except OSError:
+            pass
+    return max(mtimes) + 1_000_000_000
+
+
+class _SnapshotSource:
+    """
+    Snapshot des Primary, geteilt von allen Workern des Knotens.
+
+    Jeder Worker merkt sich, wann er zuletzt einen Commit gesehen hat (PRAGMA
+    data_version einer eigenen Connection, beim Start die mtime der DB-Dateien).
+    Hat das Backup des gemeinsamen
+    Snapshots danach begonnen, enthält er diesen Commit und wird übernommen;
+    sonst erzeugt ihn dieser Worker neu, unter einer Dateisperre, damit nicht
+    mehrere Worker dieselbe Kopie ziehen.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__watch: sqlite3.Connection | None = None
+        self.__watchKey: tuple[str, int] | None = None
+        self.__dataVersion: int | None = None
+        self.__changedAt = 0
+
+    def get(self) -> tuple[Path, str]:
+        with self.__lock:
+            self.__observe()
+            directory = _directory()
+            snapshot = self.__shared(directory)
+            if snapshot is not None:
+                return snapshot
+            with open(directory / "primary.lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    # Ein anderer Worker kann ihn inzwischen erzeugt haben
+                    snapshot = self.__shared(directory) or self.__create(directory)
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+            return snapshot
+
+    def __observe(self) -> None:
+        key = (str(Database.DB_PATH), os.getpid())
+        if self.__watch is None or self.__watchKey != key:
+            # Eigene Connection: data_version ändert sich nur durch Commits anderer
+            self.__watch = sqlite3.connect(
+                str(Database.DB_PATH), check_same_thread=False
+            )
+            self.__watchKey = key
+            self.__dataVersion = self.__watch.execute("PRAGMA data_version").fetchone()[
+                0
+            ]
+            self.__changedAt = _lastWrite()
+        dataVersion = self.__watch.execute("PRAGMA data_version").fetchone()[0]
+        if dataVersion != self.__dataVersion:
+            self.__dataVersion = dataVersion
+            self.__changedAt = time.time_ns()
+
+    def __shared(self, directory: Path) -> tuple[Path, str] | None:
+        pointer = _readPrimaryPointer(directory)
+        if pointer is None or pointer[1] <= self.__changedAt:
+            return None
+        path = _primaryPath(directory, pointer[0])
+        return (path, pointer[0]) if path.exists() else None
+
+    def __create(self, directory: Path) -> tuple[Path, str]:
+        start = time.perf_counter()
+        startedAt = time.time_ns()
+        tmp = directory / "primary.tmp"
+        tmp.unlink(missing_ok=True)
+        source = sqlite3.connect(str(Database.DB_PATH))
+        target = sqlite3.connect(str(tmp))
+        try:
+            source.backup(target)
+            # Replikate öffnen die Datei nur lesend, ohne WAL-Dateien daneben
+            target.execute("PRAGMA journal_mode = DELETE")
+            with target:
+                for statement in _SCRUB_CREDENTIALS:
+                    target.execute(statement)
+            # Gelöschte Zeilen blieben sonst in freien Seiten der Datei lesbar
+            target.execute("VACUUM")
+        finally:
+            target.close()
+            source.close()
+        etag = _sha256(tmp)
+        path = _primaryPath(directory, etag)
+        os.replace(tmp, path)
+
+        previous = _readPrimaryPointer(directory)
+        pointerTmp = directory / f"{_PRIMARY_POINTER}.tmp"
+        pointerTmp.write_text(
+            json.dumps({"etag": etag, "startedAt": startedAt}), encoding="utf-8"
+        )
+        os.replace(pointerTmp, directory / _PRIMARY_POINTER)
+        # Der vorige Snapshot wird evtl. noch ausgeliefert, alle älteren nicht mehr
+        keep = {path.name}
+        if previous is not None:
+            keep.add(_primaryPath(directory, previous[0]).name)
+        for file in directory.glob("primary-*.db"):
+            if file.name not in keep:
+                file.unlink(missing_ok=True)
+
+        Metrics.observe(
+            "lazycook_stage_duration_seconds",
+            {"stage": "replication.snapshot"},
+            time.perf_counter() - start,
+        )
+        return path, etag
+
+
+_source = _SnapshotSource()
+
+
+def getSnapshot() -> tuple[Path, str]:
+    """(Datei, ETag) des aktuellen Snapshots dieses Primary-Knotens."""
+    return _source.get()
+
+
+# ── Replikat ───────────────────────────────────────────────────
+
+_POINTER = "CURRENT"
+
+
+def _readPointer(directory: Path) -> str | None:
+    try:
+        return (directory / _POINTER).read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+def _writePointer(directory: Path, etag: str) -> None:
+    tmp = directory / f"{_POINTER}.{os.getpid()}.tmp"
+    tmp.write_text(etag, encoding="utf-8")
+    os.replace(tmp, directory / _POINTER)
+
+
+def _snapshotPath(directory: Path, etag: str) -> Path:
+    return directory / f"replica-{etag[:16]}.db"
+
+
+def _download(client: httpx.Client, directory: Path, current: str | None) -> str:
+    """Lädt den Snapshot, falls er sich geändert hat; gibt den gültigen ETag zurück."""
+    headers = {TOKEN_HEADER: REPLICATION_TOKEN or ""}
+    if current:
+        headers["If-None-Match"] = current
+    tmp = directory / f"download-{os.getpid()}.tmp"
+    with client.stream(
+        "GET", f"{REPLICATION_PRIMARY_URL}/replication/snapshot", headers=headers
+    ) as response:
+        if response.status_code == 304 and current:
+            return current
+        response.raise_for_status()
+        etag = response.headers["ETag"].strip('"')
+        with open(tmp, "wb") as f:
+            for chunk in response.iter_bytes():
+                f.write(chunk)
+
+    if _sha256(tmp) != etag:
+        tmp.unlink(missing_ok=True)
+        raise ValueError("Snapshot unvollständig übertragen")
+    con = sqlite3.connect(str(tmp))
+    try:
+        if con.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+            raise ValueError("Snapshot ist beschädigt")
+    finally:
+        con.close()
+    os.replace(tmp, _snapshotPath(directory, etag))
+    return etag
+
+
+def _cleanup(directory: Path, keep: set[str]) -> None:
+    keepNames = {_snapshotPath(directory, etag).name for etag in keep}
+    for file in directory.glob("replica-*.db"):
+        if file.name not in keepNames:
+            file.unlink(missing_ok=True)
+
+
+def pullOnce(client: httpx.Client | None = None, force: bool = False) -> bool:
+    """
+    Holt bei Bedarf einen neuen Snapshot und schaltet die Lese-Connections um.
+    Pro Knoten fragt nur ein Worker pro Intervall beim Primary nach.
+    Gibt True zurück, wenn dieser Prozess auf eine neue Datei umgeschaltet hat.
+    """
+    directory = _directory()
+    with open(directory / "pull.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            current = _readPointer(directory)
+            pointer = directory / _POINTER
+            due = (
+                force
+                or current is None
+                or time.time() - pointer.stat().st_mtime >= REPLICATION_INTERVAL_SECONDS
+            )
+            if due:
+                ownClient = client is None
+                client = client or httpx.Client(timeout=30)
+                try:
+                    etag = _download(client, directory, current)
+                finally:
+                    if ownClient:
+                        client.close()
+                _writePointer(directory, etag)
+                if etag != current:
+                    logger.info("Neuer Snapshot vom Primary: %s", etag[:16])
+                    # Der vorige bleibt, bis alle Worker umgeschaltet haben
+                    _cleanup(directory, {etag} | ({current} if current else set()))
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    return activate()
+
+
+def activate() -> bool:
+    """Setzt DB_READ_PATH auf den Snapshot, auf den CURRENT zeigt."""
+    directory = _directory()
+    etag = _readPointer(directory)
+    if etag is None:
+        return False
+    path = _snapshotPath(directory, etag)
+    if Database.DB_READ_PATH == path:
+        return False
+    Database.DB_READ_PATH = path
+    return True
+
+
+def prepare() -> None:
+    """Vor dem Aufwärmen eines Replikats: ersten Snapshot holen, lokales Schreiben sperren."""
+    Database.WRITES_ALLOWED = False
+    deadline = time.monotonic() + REPLICATION_STARTUP_TIMEOUT_SECONDS
+    while True:
+        try:
+            pullOnce()
+            return
+        except (httpx.HTTPError, OSError, ValueError) as e:
+            if time.monotonic() >= deadline:
+                raise RuntimeError("Primary nicht erreichbar") from e
+            logger.warning("Warte auf Primary: %s", e)
+            time.sleep(1)
+
+
+_stop = threading.Event()
+_poller: threading.Thread | None = None
+
+
+def _poll() -> None:
+    while not _stop.wait(REPLICATION_INTERVAL_SECONDS):
+        try:
+            pullOnce()
+        except Exception:
+            logger.exception("Snapshot konnte nicht geholt werden")
+
+
+def startPolling() -> None:
+    """Startet den Hintergrund-Thread dieses Replikat-Workers (im lifespan)."""
+    global _poller
+    if not isReplica() or (_poller is not None and _poller.is_alive()):
+        return
+    _stop.clear()
+    _poller = threading.Thread(target=_poll, name="replication-poller", daemon=True)
+    _poller.start()
+
+
+def stopPolling() -> None:
+    global _poller
+    _stop.set()
+    if _poller is not None:
+        _poller.join(timeout=REPLICATION_INTERVAL_SECONDS + 1)
+    _poller = None
+    _flushUsage()
+
+
+# ── Zutaten-Nutzung an den Primary ─────────────────────────────
+
+_usage: queue.Queue = queue.Queue()
+_sender: threading.Thread | None = None
+_senderLock = threading.Lock()
+
+
+def forwardUsage(AccountID: int, items: list[tuple[str, str | None]]) -> None:
+    """Merkt die Nutzung vor; ein Hintergrund-Thread schickt sie gesammelt los."""
+    global _sender
+    for name, unit in items:
+        _usage.put({"accountId": AccountID, "name": name, "unit": unit})
+    with _senderLock:
+        if _sender is None or not _sender.is_alive():
+            _sender = threading.Thread(
+                target=_sendUsage, name="replication-usage", daemon=True
+            )
+            _sender.start()
+
+
+def _sendUsage() -> None:
+    while True:
+        try:
+            first = _usage.get(timeout=REPLICATION_INTERVAL_SECONDS)
+        except queue.Empty:
+            return
+        batch = [first]
+        while len(batch) < USAGE_BATCH_SIZE:
+            try:
+                batch.append(_usage.get_nowait())
+            except queue.Empty:
+                break
+        _postUsage(batch)
+
+
+def _flushUsage() -> None:
+    batch = []
+    while True:
+        try:
+            batch.append(_usage.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        _postUsage(batch)
+
+
+def _postUsage(batch: list[dict]) -> None:
+    try:
+        httpx.post(
+            f"{REPLICATION_PRIMARY_URL}/replication/usage",
+            json={"items": batch},
+            headers={TOKEN_HEADER: REPLICATION_TOKEN or ""},
+            timeout=10,
+        ).raise_for_status()
+    except httpx.HTTPError as e:
+        # Nutzungsstatistik ist nicht kritisch, ein verlorener Batch ist verschmerzbar
+        logger.warning("Nutzung (%d Einträge) nicht übertragen: %s", len(batch), e)
+
+
+# ── Weiterleitung schreibender Requests ────────────────────────
+
+_HOP_BY_HOP = {
+    "connection",
+    "content-encoding",
+    "content-length",
+    "host",
+    "keep-alive",
+    "transfer-encoding",
+}
+
+
+def _forwardedFor(scope, headers: list[tuple[str, str]]) -> str:
+    """
+    X-Forwarded-For für den Primary: nur die Client-Adresse, wie sie die
+    Rate-Limits dieses Knotens bestimmen (core.RateLimit.forwardedClient). Eine
+    mitgeschickte Kette wird nie durchgereicht, sonst könnte der Client den
+    Schlüssel auf dem Primary frei wählen.
+    """
+    peer = scope["client"][0] if scope.get("client") else ""
+    forwarded = ",".join(v for k, v in headers if k.lower() == "x-forwarded-for")
+    return RateLimit.forwardedClient(forwarded, peer)
+
+
+class ReplicaForwardMiddleware:
+    """Leitet auf Replikaten alle schreibenden Requests an den Primary weiter."""
+
+    def __init__(self, app):
+        self.app = app
+        self.__client: httpx.AsyncClient | None = None
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not isReplica()
+            or scope["method"] in ("GET", "HEAD", "OPTIONS")
+            or scope["path"] in REPLICA_LOCAL_POSTS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        if self.__client is None:
+            self.__client = httpx.AsyncClient(
+                base_url=REPLICATION_PRIMARY_URL, timeout=30
+            )
+        headers = [
+            (k.decode("latin-1"), v.decode("latin-1"))
+            for k, v in scope["headers"]
+            if k.decode("latin-1").lower() not in _HOP_BY_HOP
+        ]
+        forwardedFor = _forwardedFor(scope, headers)
+        headers = [(k, v) for k, v in headers if k.lower() != "x-forwarded-for"]
+        headers.append(("x-forwarded-for", forwardedFor))
+        path = scope["path"]
+        if scope.get("query_string"):
+            path += "?" + scope["query_string"].decode("latin-1")
+
+        try:
+            with Metrics.timed("replication.forward"):
+                response = await self.__client.request(
+                    scope["method"], path, headers=headers, content=body
+                )
+        except httpx.HTTPError as e:
+            logger.warning("Weiterleitung an den Primary fehlgeschlagen: %s", e)
+            await _sendError(send, 502, "Primary nicht erreichbar")
+            return
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (k.encode("latin-1"), v.encode("latin-1"))
+                    for k, v in response.headers.multi_items()
+                    if k.lower() not in _HOP_BY_HOP
+                ]
+                + [(b"content-length", str(len(response.content)).encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": response.content})
+
+
+async def _sendError(send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,120 @@
+"""
+Startup.py – Aufwärmen vor dem ersten Request und Bereitschaftsstatus
+
+Mit gunicorn.conf.py (preload_app) importiert der Master die App, legt die DB an,
+baut alle Katalog-Strukturen und friert den Heap per gc.freeze() ein, bevor er die
+Worker forkt. Die Worker erben alles per Copy-on-Write und müssen weder importieren
+noch aufwärmen; der Garbage Collector fasst die eingefrorenen Objekte nicht an und
+kopiert deren Seiten daher auch nicht.
+
+Ohne Preload (z.B. uvicorn im Dev-Betrieb) wärmt jeder Prozess im lifespan selbst
+auf. In beiden Fällen meldet /health/ready erst nach dem Aufwärmen Bereitschaft.
+"""
+
+import gc
+import logging
+import os
+import time
+
+from core import Catalogue, Database, Metrics, Replication
+
+logger = logging.getLogger(__name__)
+
+STARTUP_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Phase -> Sekunden ("import", "warmUp", im Worker nach Preload zusätzlich "worker")
+_timings: dict[str, float] = {}
+_warmedInPid: int | None = None
+_forkedAt: float | None = None
+_ready = False
+
+
+def recordImport(seconds: float) -> None:
+    """Importdauer der App, gemessen in LazyCookAdministration."""
+    _timings["import"] = seconds
+
+
+def warmUp() -> None:
+    """Legt die DB an (Replikat: holt den ersten Snapshot) und baut alle Katalog-Strukturen."""
+    global _warmedInPid
+    start = time.perf_counter()
+    if Replication.isReplica():
+        Replication.prepare()
+    else:
+        Database.initDB()
+    Catalogue.warmUp()
+    _timings["warmUp"] = time.perf_counter() - start
+    _warmedInPid = os.getpid()
+
+
+def preloadMaster() -> None:
+    """Im gunicorn-Master vor dem Fork: aufwärmen, Verbindungen schließen, Heap einfrieren."""
+    warmUp()
+    Database.closeWriter()
+    Database.closeReader()
+    # Messwerte des Masters würde sonst jeder Worker erben und mitzählen
+    Metrics.reset()
+    Metrics.resetMultiprocessDir()
+    gc.freeze()
+    gc.enable()
+    logger.info(
+        "App vorgeladen (Import %.0f ms, Aufwärmen %.0f ms, %d Objekte eingefroren)",
+        _timings.get("import", 0.0) * 1000,
+        _timings["warmUp"] * 1000,
+        gc.get_freeze_count(),
+    )
+
+
+def afterFork() -> None:
+    """Im Worker direkt nach dem Fork."""
+    global _forkedAt, _ready
+    _forkedAt = time.perf_counter()
+    _ready = False
+    Metrics.reset()
+
+
+def isPreloaded() -> bool:
+    return _warmedInPid is not None and _warmedInPid != os.getpid()
+
+
+def startWorker() -> None:
+    """Im lifespan: wärmt auf, falls der Master das nicht schon getan hat."""
+    if not isPreloaded():
+        warmUp()
+
+
+def markReady() -> None:
+    """Ende des lifespan-Starts: ab jetzt nimmt der Worker Requests an."""
+    global _ready
+    _ready = True
+    if isPreloaded():
+        # Import und Aufwärmen hat der Master einmal für alle erledigt
+        _timings["worker"] = time.perf_counter() - (_forkedAt or time.perf_counter())
+        phases = ("worker",)
+    else:
+        phases = tuple(_timings)
+    for phase in phases:
+        Metrics.observe(
+            "lazycook_startup_duration_seconds",
+            {"phase": phase},
+            _timings[phase],
+            STARTUP_BUCKETS,
+        )
+
+
+def markNotReady() -> None:
+    global _ready
+    _ready = False
+
+
+def isReady() -> bool:
+    return _ready
+
+
+def status() -> dict:
+    return {
+        "status": "ready" if _ready else "starting",
+        "pid": os.getpid(),
+        "preloaded": isPreloaded(),
+        "timingsMs": {phase: round(s * 1000, 1) for phase, s in _timings.items()},
+    }
@@ -2,11 +2,12 @@
 account_dao.py – Data Access Object für Account, RefreshToken und PasswordResetToken
 """
 
-from core.Database import getDB, getConnection
+from core.Database import getDB, getReadConnection, reads, writes
 
 # ── Account ──────────────────────────────────────────────────────
 
 
+@writes
 def createAccount(email: str, name: str, hashedPassword: str) -> dict | None:
     """Legt ein neues Account an. Gibt die Account-Daten zurück oder None bei Duplikat."""
     with getDB() as con:
@@ -21,9 +22,10 @@ def createAccount(email: str, name: str, hashedPassword: str) -> dict | None:
         return {"id": cur.lastrowid, "email": email, "name": name}
 
 
+@reads
 def getAccountByEmail(email: str) -> dict | None:
     """Gibt Account-Daten inkl. hashedPassword zurück, oder None."""
-    con = getConnection()
+    con = getReadConnection()
     try:
         cur = con.cursor()
         cur.execute(
@@ -36,9 +38,10 @@ def getAccountByEmail(email: str) -> dict | None:
         con.close()
 
 
+@reads
 def getAccountById(konto_id: int) -> dict | None:
     """Gibt Account-Daten anhand der ID zurück, oder None."""
-    con = getConnection()
+    con = getReadConnection()
     try:
         cur = con.cursor()
         cur.execute(
@@ -51,6 +54,7 @@ def getAccountById(konto_id: int) -> dict | None:
         con.close()
 
 
+@writes
 def updateAccount(konto_id: int, email: str = None, password_hash: str = None) -> None:
     """Aktualisiert E-Mail und/oder Passwort eines Accounts."""
     with getDB() as con:
@@ -64,6 +68,7 @@ def updateAccount(konto_id: int, email: str = None, password_hash: str = None) -
             )
 
 
+@writes
 def updateKontoPassword(konto_id: int, hashed_password: str) -> None:
     with getDB() as con:
         cur = con.cursor()
@@ -73,6 +78,7 @@ def updateKontoPassword(konto_id: int, hashed_password: str) -> None:
         )
 
 
+@writes
 def deleteAccount(email: str) -> bool:
     """Löscht ein Account anhand der E-Mail. Refresh Tokens werden via CASCADE mitgelöscht."""
     with getDB() as con:
@@ -84,6 +90,7 @@ def deleteAccount(email: str) -> bool:
 # ── Refresh Token ──────────────────────────────────────────────
 
 
+@writes
 def saveRefreshToken(AccountID: int, token: str, expiresAt: str) -> None:
     """Speichert einen neuen Refresh Token in der Datenbank."""
     with getDB() as con:
@@ -94,9 +101,10 @@ def saveRefreshToken(AccountID: int, token: str, expiresAt: str) -> None:
         )
 
 
+@reads
 def getRefreshToken(token: str) -> dict | None:
     """Gibt den Refresh-Token-Eintrag zurück, oder None."""
-    con = getConnection()
+    con = getReadConnection()
     try:
         cur = con.cursor()
         cur.execute(
@@ -111,6 +119,7 @@ def getRefreshToken(token: str) -> dict | None:
         con.close()
 
 
+@writes
 def deleteRefreshToken(token: str) -> None:
     """Löscht einen einzelnen Refresh Token (Logout)."""
     with getDB() as con:
@@ -118,6 +127,7 @@ def deleteRefreshToken(token: str) -> None:
         cur.execute("DELETE FROM RefreshToken WHERE token = ?", (token,))
 
 
+@writes
 def deleteAllRefreshTokens(AccountID: int) -> None:
     """Löscht alle Refresh Tokens eines Accounts."""
     with getDB() as con:
@@ -125,6 +135,7 @@ def deleteAllRefreshTokens(AccountID: int) -> None:
         cur.execute("DELETE FROM RefreshToken WHERE AccountID = ?", (AccountID,))
 
 
+@writes
 def cleanupExpiredTokens() -> None:
     """Löscht alle abgelaufenen Refresh Tokens."""
     with getDB() as con:
@@ -135,6 +146,7 @@ def cleanupExpiredTokens() -> None:
 # ── Password Reset Token ───────────────────────────────────────
 
 
+@writes
 def savePasswordResetToken(kontoID: int, tokenHash: str, expiresAt: str) -> None:
     """Invalidiert alte Tokens des Kontos und speichert einen neuen."""
     with getDB() as con:
@@ -150,8 +162,9 @@ def savePasswordResetToken(kontoID: int, tokenHash: str, expiresAt: str) -> None
         )
 
 
+@reads
 def getPasswordResetToken(tokenHash: str) -> dict | None:
-    con = getConnection()
+    con = getReadConnection()
     try:
         cur = con.cursor()
         cur.execute(
@@ -165,6 +178,7 @@ def getPasswordResetToken(tokenHash: str) -> dict | None:
         con.close()
 
 
+@writes
 def markResetTokenUsed(tokenID: int) -> None:
     with getDB() as con:
         cur = con.cursor()
@@ -0,0 +1,87 @@
+"""
+author_dao.py – Data Access Object für Author
+"""
+
+import sqlite3
+
+from core.Database import getDB, getReadConnection, reads, writes
+
+
+@writes
+def addAuthor(name: str) -> int | None:
+    """Legt einen Autor an. None, wenn der Name bereits vergeben ist."""
+    try:
+        with getDB() as con:
+            cur = con.cursor()
+            cur.execute("INSERT INTO Author (name) VALUES (?)", (name,))
+            return cur.lastrowid
+    except sqlite3.IntegrityError:
+        return None
+
+
+@writes
+def getOrCreateAuthor(name: str) -> int:
+    with getDB() as con:
+        cur = con.cursor()
+        cur.execute("INSERT OR IGNORE INTO Author (name) VALUES (?)", (name,))
+        cur.execute("SELECT id FROM Author WHERE name = ?", (name,))
+        return cur.fetchone()["id"]
+
+
+@reads
+def getAuthor(authorID: int) -> dict | None:
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        cur.execute("SELECT id, name FROM Author WHERE id = ?", (authorID,))
+        row = cur.fetchone()
+        return dict(row) if row else None
+    finally:
+        con.close()
+
+
+@reads
+def countRecipesByAuthor(authorID: int) -> int:
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        cur.execute("SELECT COUNT(*) AS n FROM Recipe WHERE vid = ?", (authorID,))
+        return cur.fetchone()["n"]
+    finally:
+        con.close()
+
+
+@reads
+def getRecipesByAuthor(
+    authorID: int, after: tuple[str, int] | None, limit: int
+) -> list[dict]:
+    """
+    Rezepte eines Autors nach (name, id) sortiert, per Keyset-Pagination.
+    Nutzt den Index idx_recipe_author (vid, name) statt eines Recipe-Scans.
+    """
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        if after is None:
+            cur.execute(
+                """
+                SELECT id, name, description FROM Recipe
+                WHERE vid = ?
+                ORDER BY name, id
+                LIMIT ?
+                """,
+                (authorID, limit),
+            )
+        else:
+            cur.execute(
+                """
+                SELECT id, name, description FROM Recipe
+                WHERE vid = ? AND (name, id) > (?, ?)
+                ORDER BY name, id
+                LIMIT ?
+                """,
+                (authorID, after[0], after[1], limit),
+            )
+        return [dict(row) for row in cur.fetchall()]
+    finally:
+        con.close()
@@ -0,0 +1,68 @@
+"""
+exclusion_dao.py – Data Access Object für IngredientExclusion
+"""
+
+from core.Database import getDB, getReadConnection, reads, writes
+
+
+def _normalize(name: str) -> str:
+    return name.strip().lower()
+
+
+@reads
+def getExclusions(AccountID: int) -> list[dict]:
+    """Ausgeschlossene Zutaten (name, displayName), alphabetisch."""
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        cur.execute(
+            """
+            SELECT name, displayName FROM IngredientExclusion
+            WHERE AccountID = ?
+            ORDER BY name
+            """,
+            (AccountID,),
+        )
+        return [dict(row) for row in cur.fetchall()]
+    finally:
+        con.close()
+
+
+@writes
+def addExclusion(AccountID: int, displayName: str) -> None:
+    displayName = displayName.strip()
+    with getDB() as con:
+        cur = con.cursor()
+        cur.execute(
+            """
+            INSERT OR IGNORE INTO IngredientExclusion (AccountID, name, displayName)
+            VALUES (?, ?, ?)
+            """,
+            (AccountID, _normalize(displayName), displayName),
+        )
+
+
+@writes
+def removeExclusion(AccountID: int, name: str) -> bool:
+    with getDB() as con:
+        cur = con.cursor()
+        cur.execute(
+            "DELETE FROM IngredientExclusion WHERE AccountID = ? AND name = ?",
+            (AccountID, _normalize(name)),
+        )
+        return cur.rowcount > 0
+
+
+@writes
+def replaceExclusions(AccountID: int, displayNames: list[str]) -> None:
+    """Ersetzt die komplette Liste in einer Transaktion."""
+    with getDB() as con:
+        cur = con.cursor()
+        cur.execute("DELETE FROM IngredientExclusion WHERE AccountID = ?", (AccountID,))
+        cur.executemany(
+            """
+            INSERT OR IGNORE INTO IngredientExclusion (AccountID, name, displayName)
+            VALUES (?, ?, ?)
+            """,
+            [(AccountID, _normalize(name), name.strip()) for name in displayNames],
+        )
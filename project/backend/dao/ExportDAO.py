@@ -0,0 +1,112 @@
+"""
+ExportDAO.py – Zeilenweises Lesen für Exporte (Katalog, Account-Daten)
+
+Die Funktionen sind Generatoren über einer eigenen Lese-Connection und holen
+die Zeilen in Blöcken per fetchmany(); es liegt nie mehr als ein Block im
+Speicher. Die Connection wird geschlossen, sobald der Generator erschöpft oder
+verworfen ist.
+"""
+
+from typing import Iterator
+
+from core.Database import openReadConnection, reads
+
+EXPORT_BATCH_SIZE = 500
+
+
+def _iterRows(sql: str, parameters=(), batchSize: int = EXPORT_BATCH_SIZE):
+    con = openReadConnection()
+    try:
+        cur = con.execute(sql, parameters)
+        while True:
+            rows = cur.fetchmany(batchSize)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        con.close()
+
+
+@reads
+def iterCatalogue(batchSize: int = EXPORT_BATCH_SIZE) -> Iterator[dict]:
+    """Ein Dict pro Rezept inkl. Autor und Zutaten, nach ID sortiert."""
+    rows = _iterRows(
+        """
+        SELECT r.id, r.name, r.description, r.durationMinutes, a.name AS author,
+               i.name AS ingredient, ef.amount, ef.amountType
+        FROM Recipe r
+                 LEFT JOIN Author a ON a.id = r.vid
+                 LEFT JOIN Exists_from ef ON ef.rid = r.id
+                 LEFT JOIN Ingredient i ON i.id = ef.zid
+        ORDER BY r.id
+        """,
+        batchSize=batchSize,
+    )
+    recipe = None
+    for row in rows:
+        if recipe is None or recipe["id"] != row["id"]:
+            if recipe is not None:
+                yield recipe
+            recipe = {
+                "id": row["id"],
+                "name": row["name"],
+                "description": row["description"] or "",
+                "author": row["author"],
+                "durationMinutes": row["durationMinutes"],
+                "ingredients": [],
+            }
+        if row["ingredient"] is not None:
+            recipe["ingredients"].append(
+                {
+                    "name": row["ingredient"],
+                    "amount": row["amount"],
+                    "unit": row["amountType"],
+                }
+            )
+    if recipe is not None:
+        yield recipe
+
+
+@reads
+def iterAccountData(
+    AccountID: int, batchSize: int = EXPORT_BATCH_SIZE
+) -> Iterator[dict]:
+    """Alle gespeicherten Daten eines Accounts (ohne Passwort-Hash und Tokens)."""
+    for row in _iterRows(
+        "SELECT id, email, name, createdAt FROM Account WHERE id = ?", (AccountID,)
+    ):
+        yield {"section": "account", **dict(row)}
+    for row in _iterRows(
+        """
+        SELECT f.rid AS recipeId, r.name AS recipeName, f.createdAt
+        FROM Favorites f
+                 JOIN Recipe r ON r.id = f.rid
+        WHERE f.AccountID = ?
+        ORDER BY f.id
+        """,
+        (AccountID,),
+        batchSize,
+    ):
+        yield {"section": "favorite", **dict(row)}
+    for row in _iterRows(
+        """
+        SELECT displayName AS ingredient, count, lastUnit, lastUsedAt
+        FROM IngredientUsage
+        WHERE AccountID = ?
+        ORDER BY name
+        """,
+        (AccountID,),
+        batchSize,
+    ):
+        yield {"section": "ingredientUsage", **dict(row)}
+    for row in _iterRows(
+        """
+        SELECT displayName AS ingredient, createdAt
+        FROM IngredientExclusion
+        WHERE AccountID = ?
+        ORDER BY name
+        """,
+        (AccountID,),
+        batchSize,
+    ):
+        yield {"section": "exclusion", **dict(row)}
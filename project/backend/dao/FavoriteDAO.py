@@ -0,0 +1,75 @@
+"""
+favorite_dao.py – Data Access Object für Favorites
+"""
+
+import sqlite3
+
+from core.Database import getDB, getReadConnection, reads, writes
+
+
+@writes
+def addFavorite(AccountID: int, rid: int) -> bool:
+    """Merkt ein Rezept vor. False, wenn das Rezept nicht existiert."""
+    try:
+        with getDB() as con:
+            cur = con.cursor()
+            cur.execute(
+                "INSERT OR IGNORE INTO Favorites (AccountID, rid) VALUES (?, ?)",
+                (AccountID, rid),
+            )
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+
+@writes
+def removeFavorite(AccountID: int, rid: int) -> bool:
+    with getDB() as con:
+        cur = con.cursor()
+        cur.execute(
+            "DELETE FROM Favorites WHERE AccountID = ? AND rid = ?", (AccountID, rid)
+        )
+        return cur.rowcount > 0
+
+
+@reads
+def getFavoriteIds(AccountID: int, rids: list[int]) -> set[int]:
+    """Welche der übergebenen Rezepte sind Favoriten? Eine Query für die ganze Seite."""
+    if not rids:
+        return set()
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        placeholders = ",".join("?" * len(rids))
+        cur.execute(
+            f"SELECT rid FROM Favorites WHERE AccountID = ? AND rid IN ({placeholders})",
+            (AccountID, *rids),
+        )
+        return {row["rid"] for row in cur.fetchall()}
+    finally:
+        con.close()
+
+
+@reads
+def getFavoritesPage(AccountID: int, beforeId: int | None, limit: int) -> list[dict]:
+    """
+    Favoriten, neueste zuerst, per Keyset-Pagination über die id der Favorites-Zeile.
+    beforeId ist die favoriteId des letzten Eintrags der vorherigen Seite.
+    """
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        cur.execute(
+            """
+            SELECT f.id AS favoriteId, r.id, r.name, r.description
+            FROM Favorites f
+            JOIN Recipe r ON r.id = f.rid
+            WHERE f.AccountID = ? AND f.id < ?
+            ORDER BY f.id DESC
+            LIMIT ?
+            """,
+            (AccountID, beforeId if beforeId is not None else 2**63 - 1, limit),
+        )
+        return [dict(row) for row in cur.fetchall()]
+    finally:
+        con.close()
@@ -1,45 +1,115 @@
 """
-ingredient_dao.py – Data Access Object für Ingredient und IngredientUsage
+ingredient_dao.py – Data Access Object für Ingredient, IngredientAlias und IngredientUsage
 """
 
-from core.Database import getDB, getConnection
+from core.Database import bumpCatalogueVersion, getDB, getReadConnection, reads, writes
+from domain.canonical import canonicalName
 from domain.ingredient import Ingredient
 
 
+@writes
 def addIngredient(name: str, amountType: str) -> int:
+    """
+    Legt die kanonische Zutat zu einem (Roh-)Namen an, falls es sie noch nicht
+    gibt, und merkt sich den Rohnamen als Alias. Gibt die ID der kanonischen Zutat zurück.
+    """
+    canonical = canonicalName(name)
     with getDB() as con:
         cur = con.cursor()
+        cur.execute("SELECT id FROM Ingredient WHERE name = ?", (canonical,))
+        row = cur.fetchone()
+        if row is None:
+            cur.execute(
+                "INSERT INTO Ingredient (name, amountType) VALUES (?, ?)",
+                (canonical, amountType),
+            )
+            zid = cur.lastrowid
+            bumpCatalogueVersion(cur)
+        else:
+            zid = row["id"]
         cur.execute(
-            "INSERT INTO Ingredient (name, amountType) VALUES (?, ?)",
-            (name, amountType),
+            "INSERT OR IGNORE INTO IngredientAlias (name, zid) VALUES (?, ?)",
+            (name.strip(), zid),
         )
-        return cur.lastrowid
+        return zid
 
 
+@reads
 def getIngredientByName(name: str) -> dict | None:
-    with getDB() as con:
+    """Zutat per Name, Rohname (Alias) oder kanonischem Namen."""
+    con = getReadConnection()
+    try:
         cur = con.cursor()
-        cur.execute(
-            "SELECT id, amountType FROM Ingredient WHERE name = ?",
-            (name,),
+        # Nacheinander statt UNION ALL ... LIMIT 1: SQLite garantiert keine
+        # Reihenfolge der Zweige, der exakte Name muss aber gewinnen
+        lookups = (
+            ("SELECT id, amountType FROM Ingredient WHERE name = ?", name),
+            (
+                """
+                SELECT i.id, i.amountType
+                FROM IngredientAlias a
+                JOIN Ingredient i ON i.id = a.zid
+                WHERE a.name = ?
+                """,
+                name.strip(),
+            ),
+            (
+                "SELECT id, amountType FROM Ingredient WHERE name = ?",
+                canonicalName(name),
+            ),
         )
-        row = cur.fetchone()
-        return dict(row) if row else None
+        for query, value in lookups:
+            cur.execute(query, (value,))
+            row = cur.fetchone()
+            if row:
+                return dict(row)
+        return None
+    finally:
+        con.close()
 
 
+@reads
 def getAllIngredients() -> list[dict]:
-    with getDB() as con:
+    con = getReadConnection()
+    try:
         cur = con.cursor()
         cur.execute("SELECT id, name, amountType FROM Ingredient")
         return [dict(row) for row in cur.fetchall()]
+    finally:
+        con.close()
 
 
+@reads
+def getIngredientsWithPopularity() -> list[dict]:
+    """Alle Zutaten mit ihrer Nutzung über alle Accounts (Grundlage der Autovervollständigung)."""
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        cur.execute("SELECT name, count FROM IngredientPopularity")
+        popularity = {row["name"]: row["count"] for row in cur.fetchall()}
+        cur.execute("SELECT name, amountType FROM Ingredient")
+        # Zusammenführen in Python: SQLite-LOWER() kennt nur ASCII, die Zähler
+        # sind mit str.lower() normalisiert ("Öl" -> "öl")
+        return [
+            {
+                "name": row["name"],
+                "amountType": row["amountType"],
+                "popularity": popularity.get(row["name"].lower(), 0),
+            }
+            for row in cur.fetchall()
+        ]
+    finally:
+        con.close()
+
+
+@reads
 def getIngredientsForRecipe(rid: int) -> list[Ingredient]:
-    with getDB() as con:
+    con = getReadConnection()
+    try:
         cur = con.cursor()
         cur.execute(
             """
-                    SELECT Ingredient.name, Exists_from.amount, Ingredient.amountType
+                    SELECT Ingredient.name, Exists_from.amount, Exists_from.amountType
                     FROM Ingredient
                              JOIN Exists_from ON Ingredient.id = Exists_from.zid
                     WHERE Exists_from.rid = ?
@@ -52,8 +122,11 @@ def getIngredientsForRecipe(rid: int) -> list[Ingredient]:
             ing.setAmountType(row["amountType"])
             ingredients.append(ing)
         return ingredients
+    finally:
+        con.close()
 
 
+@writes
 def incrementIngredientUsage(AccountID: int, name: str, unit: str | None) -> None:
     """Erhöht den Usage-Counter für eine Zutat um 1."""
     displayName = (name or "").strip()
@@ -74,16 +147,30 @@ def incrementIngredientUsage(AccountID: int, name: str, unit: str | None) -> Non
             """,
             (AccountID, normalizedName, displayName, unit),
         )
+        # Globales Aggregat in derselben Transaktion, damit beide Zähler konsistent bleiben
+        cur.execute(
+            """
+            INSERT INTO IngredientPopularity (name, displayName, count, lastUnit, lastUsedAt)
+            VALUES (?, ?, 1, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(name) DO UPDATE SET
+                count = count + 1,
+                displayName = excluded.displayName,
+                lastUnit = excluded.lastUnit,
+                lastUsedAt = CURRENT_TIMESTAMP
+            """,
+            (normalizedName, displayName, unit),
+        )
 
 
+@reads
 def getTopIngredients(AccountID: int, limit: int = 5) -> list[dict]:
     """Liefert die meistgenutzten Zutaten des Users."""
-    con = getConnection()
+    con = getReadConnection()
     try:
         cur = con.cursor()
         cur.execute(
             """
-            SELECT displayName, lastUnit, count, lastUsedAt
+            SELECT name, displayName, lastUnit, count, lastUsedAt
             FROM IngredientUsage
             WHERE AccountID = ?
             ORDER BY count DESC, lastUsedAt DESC
@@ -94,3 +181,63 @@ def getTopIngredients(AccountID: int, limit: int = 5) -> list[dict]:
         return [dict(row) for row in cur.fetchall()]
     finally:
         con.close()
+
+
+@reads
+def getIngredientUsage(AccountID: int) -> list[dict]:
+    """Alle Usage-Zähler eines Users (Grundlage der Personalisierung)."""
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        cur.execute(
+            "SELECT name, count, lastUsedAt FROM IngredientUsage WHERE AccountID = ?",
+            (AccountID,),
+        )
+        return [dict(row) for row in cur.fetchall()]
+    finally:
+        con.close()
+
+
+@reads
+def getGlobalTopIngredients(limit: int = 5) -> list[dict]:
+    """
+    Liefert die über alle Accounts meistgenutzten Zutaten. displayName ist der
+    kanonische Name, nie der Freitext eines anderen Accounts; Schreibweisen mit
+    demselben kanonischen Namen ("Tomate", "tomaten") erscheinen nur einmal.
+    """
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        cur.execute("""
+            SELECT name, lastUnit, count, lastUsedAt
+            FROM IngredientPopularity
+            ORDER BY count DESC
+            """)
+        rows = []
+        seen = set()
+        for row in cur:
+            if len(rows) >= limit:
+                break
+            displayName = canonicalName(row["name"])
+            if displayName.lower() not in seen:
+                seen.add(displayName.lower())
+                rows.append({**dict(row), "displayName": displayName})
+        return rows
+    finally:
+        con.close()
+
+
+@reads
+def getTopIngredientsWithFallback(AccountID: int, limit: int = 5) -> list[dict]:
+    """Top-Zutaten des Users, bei zu wenig eigener Historie mit globalen aufgefüllt."""
+    rows = getTopIngredients(AccountID, limit)
+    if len(rows) >= limit:
+        return rows
+    seen = {canonicalName(r["name"]).lower() for r in rows}
+    for row in getGlobalTopIngredients(limit + len(rows)):
+        if len(rows) >= limit:
+            break
+        if row["displayName"].lower() not in seen:
+            seen.add(row["displayName"].lower())
+            rows.append(row)
+    return rows
@@ -2,21 +2,30 @@
 recipe_dao.py – Data Access Object für Recipe und Exists_from
 """
 
-from core.Database import getDB
+from core.Database import bumpCatalogueVersion, getDB, getReadConnection, reads, writes
+from domain.duration import estimateMinutes
+from domain.units import UNIT_CONVERSIONS
 
 
-def addRecipe(name: str, description: str) -> int:
+@writes
+def addRecipe(name: str, description: str, authorID: int | None = None) -> int:
     with getDB() as con:
         cur = con.cursor()
         cur.execute(
-            "INSERT INTO Recipe (name, description) VALUES (?, ?)",
-            (name, description),
+            """
+            INSERT INTO Recipe (name, description, vid, durationMinutes)
+            VALUES (?, ?, ?, ?)
+            """,
+            (name, description, authorID, estimateMinutes(description)),
         )
+        bumpCatalogueVersion(cur)
         return cur.lastrowid
 
 
+@reads
 def getRecipe(recipeID: int) -> dict | None:
-    with getDB() as con:
+    con = getReadConnection()
+    try:
         cur = con.cursor()
         cur.execute(
             "SELECT name, description FROM Recipe WHERE id = ?",
@@ -24,22 +33,30 @@ def getRecipe(recipeID: int) -> dict | None:
         )
         row = cur.fetchone()
         return dict(row) if row else None
+    finally:
+        con.close()
 
 
+@reads
 def getAllRecipes() -> list[dict]:
-    with getDB() as con:
+    con = getReadConnection()
+    try:
         cur = con.cursor()
         cur.execute("SELECT id, name, description FROM Recipe")
         rows = cur.fetchall()
         return [dict(row) for row in rows]
+    finally:
+        con.close()
 
 
+@reads
 def getAllIngredientsForRecipe(rid: int) -> list[dict]:
-    with getDB() as con:
+    con = getReadConnection()
+    try:
         cur = con.cursor()
         cur.execute(
             """
-            SELECT Ingredient.name, Exists_from.amount, Ingredient.amountType
+            SELECT Ingredient.name, Exists_from.amount, Exists_from.amountType
             FROM Ingredient
             JOIN Exists_from ON Ingredient.id = Exists_from.zid
             WHERE Exists_from.rid = ?
@@ -47,25 +64,48 @@ def getAllIngredientsForRecipe(rid: int) -> list[dict]:
             (rid,),
         )
         return [dict(row) for row in cur.fetchall()]
+    finally:
+        con.close()
 
 
-def addIngredientToRecipe(rid: int, zid: int, amount: float) -> bool:
+@writes
+def addIngredientToRecipe(
+    rid: int, zid: int, amount: float, amountType: str | None = None
+) -> bool:
+    """Ohne amountType gilt die Einheit der Zutat."""
     if not zid or not rid:
         return False
     try:
         with getDB() as con:
             cur = con.cursor()
             cur.execute(
-                "INSERT INTO Exists_from (zid, rid, amount) VALUES (?, ?, ?)",
-                (zid, rid, amount),
+                """
+                INSERT INTO Exists_from (zid, rid, amount, amountType)
+                SELECT ?, ?, ?, COALESCE(?, amountType) FROM Ingredient WHERE id = ?
+                """,
+                (zid, rid, amount, amountType, zid),
             )
+            if cur.rowcount == 0:
+                return False
+            bumpCatalogueVersion(cur)
         return True
     except Exception:
         return False
 
 
-def getAllocatedRecipes(name: str) -> list[dict]:
+@writes
+def updateDurations(durations: list[tuple[int | None, int]]) -> None:
+    """Setzt durationMinutes für (Minuten, Rezept-ID)-Paare in einer Transaktion."""
     with getDB() as con:
+        cur = con.cursor()
+        cur.executemany("UPDATE Recipe SET durationMinutes = ? WHERE id = ?", durations)
+        bumpCatalogueVersion(cur)
+
+
+@reads
+def getAllocatedRecipes(name: str) -> list[dict]:
+    con = getReadConnection()
+    try:
         cur = con.cursor()
         cur.execute(
             """
@@ -76,27 +116,83 @@ def getAllocatedRecipes(name: str) -> list[dict]:
             (name,),
         )
         return [dict(row) for row in cur.fetchall()]
+    finally:
+        con.close()
 
 
-def getAllRecipesPaginated(offset: int) -> list[dict]:
-    with getDB() as con:
+@reads
+def getAllRecipesPaginated(after: tuple[str, int] | None, limit: int) -> list[dict]:
+    """
+    Keyset-Pagination über (name, id): after ist (name, id) des letzten Rezepts
+    der vorherigen Seite. Jede Seite kostet damit gleich viel, egal wie tief.
+    """
+    con = getReadConnection()
+    try:
         cur = con.cursor()
+        if after is None:
+            cur.execute(
+                """
+                SELECT r.id, r.name, r.description
+                FROM Recipe r
+                ORDER BY r.name, r.id
+                LIMIT ?
+                """,
+                (limit,),
+            )
+        else:
+            cur.execute(
+                """
+                SELECT r.id, r.name, r.description
+                FROM Recipe r
+                WHERE (r.name, r.id) > (?, ?)
+                ORDER BY r.name, r.id
+                LIMIT ?
+                """,
+                (after[0], after[1], limit),
+            )
+        return [dict(row) for row in cur.fetchall()]
+    finally:
+        con.close()
+
+
+@reads
+def getIngredientsForRecipes(rids: list[int]) -> dict[int, list[dict]]:
+    """Zutaten mehrerer Rezepte in einer Query, gruppiert nach Rezept-ID."""
+    result = {rid: [] for rid in rids}
+    if not rids:
+        return result
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        placeholders = ",".join("?" * len(rids))
         cur.execute(
-            """
-                    SELECT r.id, r.name, r.description
-                    FROM Recipe r
-                    ORDER BY r.name
-                        LIMIT 12 OFFSET ?
-                    """,
-            (offset,),
+            f"""
+            SELECT ef.rid, i.name, ef.amount, ef.amountType
+            FROM Exists_from ef
+            JOIN Ingredient i ON i.id = ef.zid
+            WHERE ef.rid IN ({placeholders})
+            """,
+            rids,
         )
-        return [dict(row) for row in cur.fetchall()]
+        for row in cur.fetchall():
+            result[row["rid"]].append(
+                {
+                    "name": row["name"],
+                    "amount": row["amount"],
+                    "amountType": row["amountType"],
+                }
+            )
+    finally:
+        con.close()
+    return result
 
 
+@reads
 def searchRecipesByIngredients(
     likeConditions: str, likeParams: list, offset: int
 ) -> list[dict]:
-    with getDB() as con:
+    con = getReadConnection()
+    try:
         cur = con.cursor()
         cur.execute(
             f"""
@@ -114,20 +210,26 @@ def searchRecipesByIngredients(
             (*likeParams, offset),
         )
         return [dict(row) for row in cur.fetchall()]
+    finally:
+        con.close()
 
 
+@reads
 def getAllRecipesWithIngredients() -> list[dict]:
-    with getDB() as con:
+    con = getReadConnection()
+    try:
         cur = con.cursor()
         cur.execute("""
-                    SELECT r.id, r.name, r.description,
-                           i.name as ing_name, ef.amount, i.amountType
+                    SELECT r.id, r.name, r.description, r.durationMinutes,
+                           i.name as ing_name, ef.amount, ef.amountType
                     FROM Recipe r
                              LEFT JOIN Exists_from ef ON ef.rid = r.id
                              LEFT JOIN Ingredient i ON i.id = ef.zid
                     ORDER BY r.id
                     """)
         rows = cur.fetchall()
+    finally:
+        con.close()
 
     recipes = {}
     for row in rows:
@@ -137,6 +239,7 @@ def getAllRecipesWithIngredients() -> list[dict]:
                 "id": rid,
                 "name": row["name"],
                 "description": row["description"],
+                "durationMinutes": row["durationMinutes"],
                 "ingredients": [],
             }
         if row["ing_name"]:
@@ -148,3 +251,64 @@ def getAllRecipesWithIngredients() -> list[dict]:
                 }
             )
     return list(recipes.values())
+
+
+@reads
+def aggregateIngredients(rids: list[int]) -> list[dict]:
+    """
+    Summiert die Zutatenmengen mehrerer Rezepte pro Zutat und Basiseinheit
+    (kg -> g, l -> ml, ...) in einer GROUP-BY-Query.
+    """
+    if not rids:
+        return []
+    unitCase = " ".join("WHEN ? THEN ?" for _ in UNIT_CONVERSIONS)
+    factorCase = " ".join("WHEN ? THEN ?" for _ in UNIT_CONVERSIONS)
+    unitParams = [
+        v for unit, (base, _) in UNIT_CONVERSIONS.items() for v in (unit, base)
+    ]
+    factorParams = [
+        v for unit, (_, factor) in UNIT_CONVERSIONS.items() for v in (unit, factor)
+    ]
+    placeholders = ",".join("?" * len(rids))
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        cur.execute(
+            f"""
+            SELECT i.name,
+                   CASE ef.amountType {unitCase} ELSE COALESCE(ef.amountType, '') END AS unit,
+                   SUM(ef.amount * CASE ef.amountType {factorCase} ELSE 1 END) AS amount,
+                   GROUP_CONCAT(ef.rid) AS rids
+            FROM Exists_from ef
+            JOIN Ingredient i ON i.id = ef.zid
+            WHERE ef.rid IN ({placeholders})
+            GROUP BY i.name, unit
+            ORDER BY i.name
+            """,
+            [*unitParams, *factorParams, *rids],
+        )
+        return [
+            {
+                "name": row["name"],
+                "unit": row["unit"],
+                "amount": row["amount"],
+                "recipeIds": sorted(int(rid) for rid in row["rids"].split(",")),
+            }
+            for row in cur.fetchall()
+        ]
+    finally:
+        con.close()
+
+
+@reads
+def getExistingRecipeIds(rids: list[int]) -> set[int]:
+    if not rids:
+        return set()
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        placeholders = ",".join("?" * len(rids))
+        cur.execute(f"SELECT id FROM Recipe WHERE id IN ({placeholders})", rids)
+        return {row["id"] for row in cur.fetchall()}
+    finally:
+        con.close()
@@ -0,0 +1,59 @@
+"""
+similarity_dao.py – Data Access Object für RecipeSimilarity
+"""
+
+from core.Database import getDB, getReadConnection, reads, writes
+
+
+@reads
+def getIngredientIdsByRecipe() -> dict[int, set[int]]:
+    """Zutaten-IDs jedes Rezepts aus Exists_from (Eingabe für die MinHash-Signaturen)."""
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        cur.execute("SELECT rid, zid FROM Exists_from")
+        result: dict[int, set[int]] = {}
+        for rid, zid in cur.fetchall():
+            result.setdefault(rid, set()).add(zid)
+        return result
+    finally:
+        con.close()
+
+
+@writes
+def replaceNeighbors(neighbors: dict[int, list[tuple[int, float]]]) -> int:
+    """Ersetzt alle gespeicherten Nachbarn in einer Transaktion. Gibt die Anzahl Zeilen zurück."""
+    rows = [
+        (rid, neighborId, score)
+        for rid, entries in neighbors.items()
+        for neighborId, score in entries
+    ]
+    with getDB() as con:
+        cur = con.cursor()
+        cur.execute("DELETE FROM RecipeSimilarity")
+        cur.executemany(
+            "INSERT INTO RecipeSimilarity (rid, neighborId, score) VALUES (?, ?, ?)",
+            rows,
+        )
+    return len(rows)
+
+
+@reads
+def getSimilarRecipes(rid: int, limit: int = 10) -> list[dict]:
+    con = getReadConnection()
+    try:
+        cur = con.cursor()
+        cur.execute(
+            """
+            SELECT r.id, r.name, r.description, s.score
+            FROM RecipeSimilarity s
+            JOIN Recipe r ON r.id = s.neighborId
+            WHERE s.rid = ?
+            ORDER BY s.score DESC, r.id
+            LIMIT ?
+            """,
+            (rid, limit),
+        )
+        return [dict(row) for row in cur.fetchall()]
+    finally:
+        con.close()
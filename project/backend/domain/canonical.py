@@ -0,0 +1,200 @@
+"""
+canonical.py – Kanonische Zutatennamen aus den Rohnamen des Rezeptimports
+
+Der Import liefert Zutaten als Freitext ("Blatt gefrorener Blätterteig aufgetaut
+aber noch kalt", "Eiweiß leicht geschlagen"). canonicalName macht daraus in drei
+Schritten einen kurzen Namen:
+
+1. Zubereitungshinweise abschneiden: alles nach " – ", "," oder "(" sowie
+   Alternativen und Zusätze (" oder ", " nach ", " in ", ...), führende
+   Gebinde ("Packung", "Dose", "Prise", ...) und Zahlen.
+2. Den Kern behalten: die erste Folge großgeschriebener Wörter (deutsche
+   Nomen) im ersten Abschnitt, der eine hat; Adjektive und Partizipien davor
+   und danach fallen weg.
+3. Das letzte Wort in den Singular setzen und Synonyme zusammenführen.
+   Gewürze, die wie ein Gemüse heißen ("Prise Paprika" gegen "rote Paprika"),
+   bekommen anhand der Hinweise im Rohnamen einen eigenen Namen.
+
+Das Ergebnis ist deterministisch und hängt nur vom Rohnamen ab; Migration, Import
+und Suche kommen so immer auf denselben Namen. Die Suche fragt dieselben Namen
+immer wieder an, deshalb ist canonicalName memoisiert.
+"""
+
+import re
+from functools import lru_cache
+
+# Nach diesen Trennern folgt nur noch Zubereitung oder eine Alternative
+_CUT = re.compile(
+    r"\s+[–-]\s+|[,;(]|\s+(?:oder|nach|in|zum|zur|für|ohne|mit|vom|von|aus|"
+    r"bei|je|plus|sowie|etwa|ca\.)\s+"
+)
+_TOKEN = re.compile(r"[^\s]+")
+_NUMBER = re.compile(r"[\d.,/%½¼¾]+")
+
+# Gebinde und Portionsangaben vor dem eigentlichen Namen
+CONTAINERS = frozenset(
+    {
+        "becher",
+        "beutel",
+        "blatt",
+        "blätter",
+        "bund",
+        "dose",
+        "dosen",
+        "flasche",
+        "flaschen",
+        "glas",
+        "gläser",
+        "handvoll",
+        "kopf",
+        "köpfe",
+        "packung",
+        "packungen",
+        "päckchen",
+        "prise",
+        "prisen",
+        "scheibe",
+        "scheiben",
+        "schuss",
+        "spritzer",
+        "stange",
+        "stangen",
+        "stück",
+        "stücke",
+        "tasse",
+        "tassen",
+        "tropfen",
+        "tube",
+        "würfel",
+        "zweig",
+        "zweige",
+    }
+)
+
+# Wortenden im Plural -> Singular (längste Endung zuerst geprüft)
+IRREGULAR_PLURALS: dict[str, str] = {
+    "äpfel": "apfel",
+    "blätter": "blatt",
+    "eier": "ei",
+    "kräuter": "kraut",
+    "körner": "korn",
+    "nüsse": "nuss",
+    "kerne": "kern",
+    "pilze": "pilz",
+    "stücke": "stück",
+    "kirschen": "kirsche",
+    "kiwis": "kiwi",
+}
+# Werden praktisch nur im Plural gekauft und gesucht
+PLURALIA_TANTUM = frozenset(
+    {"nudeln", "haferflocken", "cornflakes", "spaghetti", "pommes", "spätzle"}
+)
+_IRREGULAR_ENDINGS = sorted(IRREGULAR_PLURALS, key=len, reverse=True)
+_SINGULARS = tuple(IRREGULAR_PLURALS.values())
+# Singular, obwohl sie auf -en/-n enden
+_SINGULAR_ENDINGS = (
+    "chen",
+    "lein",
+    "kuchen",
+    "schinken",
+    "braten",
+    "samen",
+    "rücken",
+    "boden",
+    "nacken",
+    "rogen",
+)
+
+# Kanonischer Name (klein) -> bevorzugter Name
+SYNONYMS: dict[str, str] = {
+    "eiklar": "Eiweiß",
+    "allzweckmehl": "Mehl",
+    "weizenmehl": "Mehl",
+    "puderzucker": "Puderzucker",
+    "kristallzucker": "Zucker",
+    "knoblauchzehe": "Knoblauch",
+    "paprikaschote": "Paprika",
+    "lauchzwiebel": "Frühlingszwiebel",
+    "schlagsahne": "Sahne",
+    "schlagobers": "Sahne",
+    "rahm": "Sahne",
+    "jalapenopfeffer": "Jalapeño",
+    "jalapeno": "Jalapeño",
+    "hühnchenbrühe": "Hühnerbrühe",
+    "hähnchenbrühe": "Hühnerbrühe",
+    "limone": "Limette",
+}
+
+# Gemüse (klein) -> Name des gleichnamigen Gewürzes
+SPICES: dict[str, str] = {
+    "paprika": "Paprikapulver",
+}
+# Wortanfänge im Rohnamen, an denen das Gewürz zu erkennen ist
+_SPICE_HINTS = (
+    "prise",
+    "messerspitze",
+    "gemahlen",
+    "geräuchert",
+    "edelsüß",
+    "rosenscharf",
+)
+
+
+def _singular(word: str) -> str:
+    lower = word.lower()
+    if lower in PLURALIA_TANTUM or lower.endswith(_SINGULARS):
+        return word
+    for ending in _IRREGULAR_ENDINGS:
+        if lower.endswith(ending):
+            stem = word[: len(word) - len(ending)]
+            singular = IRREGULAR_PLURALS[ending]
+            if not stem or stem.endswith("-"):
+                singular = singular.capitalize()
+            return stem + singular
+    if lower.endswith(_SINGULAR_ENDINGS) or len(lower) < 5:
+        return word
+    # Zwiebeln -> Zwiebel, Tomaten -> Tomate, Erdbeeren -> Erdbeere, Mangos -> Mango
+    if lower.endswith(("eln", "ern", "en", "os")):
+        return word[:-1]
+    return word
+
+
+def _core(text: str) -> list[str]:
+    """Die erste Folge großgeschriebener Wörter ohne Gebinde und Zahlen."""
+    tokens = [t for t in _TOKEN.findall(text) if not _NUMBER.fullmatch(t)]
+    words: list[str] = []
+    for token in tokens:
+        if token[:1].isupper() and (words or token.lower() not in CONTAINERS):
+            words.append(token)
+        elif words:
+            break
+    return words
+
+
+@lru_cache(maxsize=4096)
+def canonicalName(raw: str) -> str:
+    """Kanonischer Anzeigename, z.B. "gehackte rote Zwiebeln" -> "Zwiebel"."""
+    raw = raw.strip()
+    parts = [p.strip() for p in _CUT.split(raw) if p and p.strip()]
+    words = next((w for w in map(_core, parts) if w), None)
+    if words is None:
+        # Ganz kleingeschrieben ("salz", "tomaten"): erster Abschnitt ohne Zahlen
+        words = [
+            t
+            for t in _TOKEN.findall(parts[0] if parts else raw)
+            if not _NUMBER.fullmatch(t)
+        ]
+        while len(words) > 1 and words[0].lower() in CONTAINERS:
+            words = words[1:]
+    if not words:
+        return raw
+    words[-1] = _singular(words[-1])
+    name = " ".join(words)
+    name = SYNONYMS.get(name.lower(), name)
+    if name.lower() in SPICES and any(
+        t.lower().startswith(_SPICE_HINTS) for t in _TOKEN.findall(raw)
+    ):
+        name = SPICES[name.lower()]
+    # Einzelne Nomen groß wie im Katalog; mehrere kleingeschriebene Wörter
+    # bleiben, wie sie sind, sonst sähe ein zweiter Durchlauf einen anderen Kern
+    return name[:1].upper() + name[1:] if " " not in name else name
@@ -0,0 +1,81 @@
+"""
+duration.py – Schätzung der Zubereitungszeit aus der Rezeptbeschreibung
+
+Die Beschreibungen nennen Zeiten nur im Fließtext ("etwa 5 Minuten", "25 bis 30
+Minuten backen", "eine halbe Stunde ruhen lassen"). Alle Angaben in Minuten und
+Stunden werden addiert, bei Spannen zählt die Obergrenze. Tage ("bis zu 5 Tage
+gekühlt") sind Haltbarkeit und zählen nicht.
+"""
+
+import math
+import re
+
+NUMBER_WORDS: dict[str, float] = {
+    "ein": 1,
+    "eine": 1,
+    "einer": 1,
+    "einen": 1,
+    "einem": 1,
+    "zwei": 2,
+    "drei": 3,
+    "vier": 4,
+    "fünf": 5,
+    "sechs": 6,
+    "sieben": 7,
+    "acht": 8,
+    "neun": 9,
+    "zehn": 10,
+    "zwölf": 12,
+    "fünfzehn": 15,
+    "zwanzig": 20,
+    "dreißig": 30,
+    "halbe": 0.5,
+    "halben": 0.5,
+    "halber": 0.5,
+    "anderthalb": 1.5,
+    "eineinhalb": 1.5,
+}
+
+# Einheit (Präfix, kleingeschrieben) -> Minuten
+UNIT_MINUTES: dict[str, float] = {"min": 1, "std": 60, "stunde": 60, "sek": 1 / 60}
+
+_NUMBER = r"\d+(?:[.,]\d+)?|" + "|".join(sorted(NUMBER_WORDS, key=len, reverse=True))
+_DURATION = re.compile(
+    rf"(?<![\w.,])(?P<low>{_NUMBER})"
+    rf"(?:\s*(?:bis|-|–|oder)\s*(?P<high>{_NUMBER}))?"
+    r"\s*(?P<unit>Minuten|Minute|Min\b\.?|Stunden|Stunde|Std\b\.?"
+    r"|Sekunden|Sekunde|Sek\b\.?)",
+    re.IGNORECASE,
+)
+
+
+def _number(text: str) -> float:
+    text = text.lower()
+    if text in NUMBER_WORDS:
+        return NUMBER_WORDS[text]
+    return float(text.replace(",", "."))
+
+
+def estimateMinutes(description: str | None) -> int | None:
+    """Geschätzte Gesamtzeit in ganzen Minuten, None ohne erkennbare Zeitangabe."""
+    total = 0.0
+    found = False
+    for match in _DURATION.finditer(description or ""):
+        amount = _number(match["high"] or match["low"])
+        unit = match["unit"].lower()
+        factor = next(
+            m for prefix, m in UNIT_MINUTES.items() if unit.startswith(prefix)
+        )
+        total += amount * factor
+        found = True
+    return math.ceil(total) if found else None
+
+
+def formatDuration(minutes: int | None) -> str:
+    """Anzeige fürs Frontend, z.B. "ca. 1 Std. 15 Min."; leer ohne Schätzung."""
+    if minutes is None:
+        return ""
+    hours, rest = divmod(minutes, 60)
+    if not hours:
+        return f"ca. {rest} Min."
+    return f"ca. {hours} Std." + (f" {rest} Min." if rest else "")
@@ -1,3 +1,4 @@
+from domain.duration import formatDuration
 from domain.ingredient import Ingredient
 from dao.RecipeDAO import addRecipe, addIngredientToRecipe
 from dao.IngredientDAO import getIngredientByName
@@ -5,25 +6,42 @@ from dao.IngredientDAO import getIngredientByName
 
 class Recipe:
     def __init__(self, name: str, ingredients: list[Ingredient], description: str):
+        self.__id = None
+        self.__authorId = None
         self.__name = name
         self.__ingredients = ingredients
         self.__description = description
         self.__original = ""
         self.__duration = ""
+        self.__durationMinutes = None
         self.__rating = 0.0
         self.__countPersons = 1
         self.__matching = 0
 
     def saveInDB(self) -> bool:
-        rid = addRecipe(self.__name, self.__description, None)
+        rid = addRecipe(self.__name, self.__description, self.__authorId)
         for ingredient in self.__ingredients:
             result = getIngredientByName(ingredient.getName())
             if not result:
                 return False
             zid = result["id"]
-            addIngredientToRecipe(zid, rid, ingredient.getAmount())
+            addIngredientToRecipe(
+                rid, zid, ingredient.getAmount(), ingredient.getAmountType()
+            )
         return True
 
+    def getId(self) -> int | None:
+        return self.__id
+
+    def setId(self, recipeID: int):
+        self.__id = recipeID
+
+    def getAuthorId(self) -> int | None:
+        return self.__authorId
+
+    def setAuthorId(self, authorId: int | None):
+        self.__authorId = authorId
+
     def getName(self) -> str:
         return self.__name
 
@@ -54,12 +72,22 @@ class Recipe:
     def incrementMatching(self):
         self.__matching += 1
 
+    def setMatching(self, matching: int):
+        self.__matching = matching
+
     def getDuration(self) -> str:
         return self.__duration
 
     def setDuration(self, duration: str):
         self.__duration = duration
 
+    def getDurationMinutes(self) -> int | None:
+        return self.__durationMinutes
+
+    def setDurationMinutes(self, minutes: int | None):
+        self.__durationMinutes = minutes
+        self.__duration = formatDuration(minutes)
+
     def getIngredients(self) -> list[Ingredient]:
         return self.__ingredients
 
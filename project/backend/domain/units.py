@@ -0,0 +1,18 @@
+"""
+units.py – Umrechnung von Mengeneinheiten in die Basiseinheiten g, ml und Stück
+"""
+
+# Einheit -> (Basiseinheit, Faktor)
+UNIT_CONVERSIONS: dict[str, tuple[str, float]] = {
+    "kg": ("g", 1000.0),
+    "l": ("ml", 1000.0),
+    "EL": ("ml", 15.0),
+    "TL": ("ml", 5.0),
+}
+
+
+def normalizeUnit(amount: float, unit: str | None) -> tuple[float, str]:
+    """Rechnet eine Menge in ihre Basiseinheit um, unbekannte Einheiten bleiben."""
+    unit = (unit or "").strip()
+    baseUnit, factor = UNIT_CONVERSIONS.get(unit, (unit, 1.0))
+    return amount * factor, baseUnit
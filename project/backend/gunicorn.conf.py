@@ -0,0 +1,43 @@
+"""
+gunicorn.conf.py – Produktionsstart mit vorgeladener, aufgewärmter App
+
+Der Master importiert die App einmal, legt die DB an, baut die Katalog-Strukturen
+und friert den Heap ein; erst danach werden die Worker geforkt (siehe core/Startup.py).
+Mit PRELOAD_APP=0 importiert und wärmt jeder Worker wieder selbst auf.
+
+Start (aus project/backend):
+    gunicorn -c gunicorn.conf.py LazyCookAdministration:app
+"""
+
+import gc
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:3000")
+workers = int(os.environ.get("WORKERS", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.environ.get("PRELOAD_APP", "1") != "0"
+
+if preload_app:
+    # Keine GC-Läufe während Import und Aufwärmen: sie würden Objekte umsortieren,
+    # die danach eingefroren und von allen Workern geteilt werden
+    gc.disable()
+
+
+def on_starting(server):
+    from core.Metrics import resetMultiprocessDir
+
+    resetMultiprocessDir()
+
+
+def when_ready(server):
+    # Läuft im Master nach dem Laden der App und vor dem ersten Fork
+    if server.cfg.preload_app:
+        from core import Startup
+
+        Startup.preloadMaster()
+
+
+def post_fork(server, worker):
+    from core import Startup
+
+    Startup.afterFork()
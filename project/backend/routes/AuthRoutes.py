@@ -6,10 +6,19 @@ import logging
 import os
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 
 from core.Auth import validateEmail, validatePassword, verifyPassword, hashPassword
+from core.RateLimit import (
+    loginLimiter,
+    registerLimiter,
+    forgotPasswordLimiter,
+    forgotPasswordAccountLimiter,
+    loginThrottle,
+    clientIp,
+)
 from dao import AccountDAO
 from services import AuthService
 from services.EmailService import sendPasswordChangedEmail, sendPasswordResetEmail
@@ -31,7 +40,11 @@ FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:8000")
 router = APIRouter()
 
 
-@router.post("/auth/register", response_model=User)
+@router.post(
+    "/auth/register",
+    response_model=User,
+    dependencies=[Depends(registerLimiter.perIp())],
+)
 async def register(user: UserCreate):
     if not user.name.strip():
         raise HTTPException(status_code=400, detail="Name darf nicht leer sein.")
@@ -42,22 +55,34 @@ async def register(user: UserCreate):
     if pwError:
         raise HTTPException(status_code=400, detail=pwError)
 
-    account = UserService.register(user.email, user.name, user.password)
+    account = await run_in_threadpool(
+        UserService.register, user.email, user.name, user.password
+    )
     if account is None:
         raise HTTPException(status_code=400, detail="E-Mail bereits registriert")
 
     return User(email=account["email"], name=account["name"])
 
 
-@router.post("/auth/login", response_model=Token)
-async def login(formData: Annotated[OAuth2PasswordRequestForm, Depends()]):
+@router.post(
+    "/auth/login",
+    response_model=Token,
+    dependencies=[Depends(loginLimiter.perIp())],
+)
+async def login(
+    request: Request, formData: Annotated[OAuth2PasswordRequestForm, Depends()]
+):
+    ip = clientIp(request)
+    loginThrottle.check(formData.username, ip)
     account = AccountDAO.getAccountByEmail(formData.username)
     if not account or not verifyPassword(formData.password, account["hashedPassword"]):
+        loginThrottle.recordFailure(formData.username, ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="E-Mail oder Passwort falsch",
         )
-    return AuthService.createTokenPair(account)
+    loginThrottle.reset(formData.username, ip)
+    return await run_in_threadpool(AuthService.createTokenPair, account)
 
 
 @router.post("/auth/refresh", response_model=Token)
@@ -69,24 +94,30 @@ async def refresh(body: RefreshRequest):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh Token ungültig oder abgelaufen",
         )
-    AccountDAO.deleteRefreshToken(body.refresh_token)
+    await run_in_threadpool(AccountDAO.deleteRefreshToken, body.refresh_token)
     account = {"id": entry["AccountID"], "email": entry["email"]}
-    return AuthService.createTokenPair(account)
+    return await run_in_threadpool(AuthService.createTokenPair, account)
 
 
 @router.post("/auth/logout")
 async def logout(body: LogoutRequest):
     """Löscht den Refresh Token serverseitig."""
-    AccountDAO.deleteRefreshToken(body.refresh_token)
+    await run_in_threadpool(AccountDAO.deleteRefreshToken, body.refresh_token)
     return {"detail": "Erfolgreich abgemeldet"}
 
 
-@router.post("/auth/forgot-password")
+@router.post(
+    "/auth/forgot-password",
+    dependencies=[Depends(forgotPasswordLimiter.perIp())],
+)
 async def forgotPassword(body: ForgotPasswordRequest):
     """Schritt 1: User gibt E-Mail ein, bekommt Reset-Link per Mail."""
+    forgotPasswordAccountLimiter.check(body.email)
     konto = AccountDAO.getAccountByEmail(body.email)
     if konto is not None:
-        token = AuthService.createPasswordResetToken(konto["id"])
+        token = await run_in_threadpool(
+            AuthService.createPasswordResetToken, konto["id"]
+        )
         resetLink = f"{FRONTEND_URL}/reset-password?token={token}"
         try:
             sendPasswordResetEmail(body.email, konto["name"], resetLink)
@@ -95,6 +126,12 @@ async def forgotPassword(body: ForgotPasswordRequest):
     return {"detail": "Falls die E-Mail existiert, wurde ein Link versendet."}
 
 
+def _resetPassword(entry: dict, hashedPassword: str) -> None:
+    AccountDAO.updateKontoPassword(entry["kontoID"], hashedPassword)
+    AccountDAO.markResetTokenUsed(entry["id"])
+    AccountDAO.deleteAllRefreshTokens(entry["kontoID"])
+
+
 @router.post("/auth/reset-password")
 async def resetPassword(body: ResetPasswordRequest):
     """Schritt 2: User setzt mit Token aus Mail das neue Passwort."""
@@ -109,9 +146,7 @@ async def resetPassword(body: ResetPasswordRequest):
             detail="Link ungültig oder abgelaufen. Bitte neuen anfordern.",
         )
 
-    AccountDAO.updateKontoPassword(entry["kontoID"], hashPassword(body.new_password))
-    AccountDAO.markResetTokenUsed(entry["id"])
-    AccountDAO.deleteAllRefreshTokens(entry["kontoID"])
+    await run_in_threadpool(_resetPassword, entry, hashPassword(body.new_password))
 
     konto = AccountDAO.getAccountById(entry["kontoID"])
     if konto is not None:
@@ -0,0 +1,51 @@
+"""
+routes/authors.py – Autoren und ihre Rezepte
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from core.Auth import getCurrentUser
+from core.Models import User
+from core.Pagination import clampPageSize, encodeCursor, parseCursor
+from dao import AuthorDAO
+from services import AuthorService
+
+router = APIRouter()
+
+
+@router.get("/authors/{authorId}")
+async def getAuthor(
+    authorId: int, currentUser: Annotated[User, Depends(getCurrentUser)]
+):
+    author = AuthorService.getAuthorPage(authorId)
+    if author is None:
+        raise HTTPException(status_code=404, detail="Autor nicht gefunden")
+    return author
+
+
+@router.get("/authors/{authorId}/recipes")
+async def getAuthorRecipes(
+    authorId: int,
+    currentUser: Annotated[User, Depends(getCurrentUser)],
+    cursor: str | None = None,
+    limit: int | None = None,
+):
+    """Rezepte eines Autors alphabetisch, nextCursor ist None auf der letzten Seite."""
+    after = parseCursor(cursor, str, int)
+    pageSize = clampPageSize(limit)
+
+    if AuthorDAO.getAuthor(authorId) is None:
+        raise HTTPException(status_code=404, detail="Autor nicht gefunden")
+
+    rows = AuthorDAO.getRecipesByAuthor(authorId, after, pageSize + 1)
+    hasMore = len(rows) > pageSize
+    rows = rows[:pageSize]
+    return {
+        "recipes": rows,
+        "recipeCount": AuthorService.getRecipeCount(authorId),
+        "nextCursor": (
+            encodeCursor([rows[-1]["name"], rows[-1]["id"]]) if hasMore else None
+        ),
+    }
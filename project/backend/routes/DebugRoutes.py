@@ -0,0 +1,21 @@
+"""
+routes/debug.py – Betriebs-Endpunkte für Diagnose (nur mit X-Admin-Token)
+"""
+
+from fastapi import APIRouter, Depends
+
+from core import QueryLog
+from core.Auth import requireAdmin
+
+router = APIRouter(prefix="/debug", dependencies=[Depends(requireAdmin)])
+
+
+@router.get("/slow-queries")
+async def getSlowQueries(limit: int = 20, scansOnly: bool = False):
+    """Langsamste Statements inkl. Query-Plan und erkannter Full-Table-Scans."""
+    return {
+        "enabled": QueryLog.isEnabled(),
+        "thresholdMs": QueryLog.SLOW_QUERY_MS,
+        "offenders": QueryLog.getTopOffenders(limit, scansOnly),
+        "fullScans": QueryLog.getPlansWithScans(),
+    }
@@ -0,0 +1,55 @@
+"""
+routes/export.py – Gestreamte Exporte: Rezeptkatalog (Partner) und eigene Daten (DSGVO)
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from core.Auth import getAccountId, getCurrentUser, requireAdmin
+from core.Models import User
+from services import ExportService
+
+router = APIRouter()
+
+
+def _response(chunks, base: str, fmt: str, gzip: bool) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else ExportService.MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": "attachment; filename="
+            + ExportService.fileName(base, fmt, gzip)
+        },
+    )
+
+
+def _checkFormat(fmt: str) -> None:
+    if fmt not in ExportService.FORMATS:
+        raise HTTPException(status_code=400, detail="Format muss ndjson oder csv sein")
+
+
+@router.get("/export/catalogue", dependencies=[Depends(requireAdmin)])
+async def exportCatalogue(format: str = "ndjson", gzip: bool = False):
+    """Alle Rezepte mit Autor und Zutaten (nur mit X-Admin-Token)."""
+    _checkFormat(format)
+    return _response(
+        ExportService.exportCatalogue(format, gzip), "lazycook-katalog", format, gzip
+    )
+
+
+@router.get("/users/me/export")
+async def exportOwnData(
+    currentUser: Annotated[User, Depends(getCurrentUser)],
+    format: str = "ndjson",
+    gzip: bool = False,
+):
+    """Account, Favoriten und Zutaten-Nutzung des eingeloggten Users."""
+    _checkFormat(format)
+    return _response(
+        ExportService.exportAccount(getAccountId(currentUser), format, gzip),
+        "lazycook-daten",
+        format,
+        gzip,
+    )
@@ -0,0 +1,60 @@
+"""
+routes/favorites.py – Favoriten des eingeloggten Users (hinzufügen, entfernen, auflisten)
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+
+from core.Auth import getAccountId, getCurrentUser
+from core.Models import User
+from core.Pagination import clampPageSize, encodeCursor, parseCursor
+from dao import FavoriteDAO
+
+router = APIRouter()
+
+
+@router.put("/favorites/{recipeId}", status_code=status.HTTP_204_NO_CONTENT)
+async def addFavorite(
+    recipeId: int, currentUser: Annotated[User, Depends(getCurrentUser)]
+):
+    if not await run_in_threadpool(
+        FavoriteDAO.addFavorite, getAccountId(currentUser), recipeId
+    ):
+        raise HTTPException(status_code=404, detail="Rezept nicht gefunden")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.delete("/favorites/{recipeId}", status_code=status.HTTP_204_NO_CONTENT)
+async def removeFavorite(
+    recipeId: int, currentUser: Annotated[User, Depends(getCurrentUser)]
+):
+    await run_in_threadpool(
+        FavoriteDAO.removeFavorite, getAccountId(currentUser), recipeId
+    )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/favorites")
+async def listFavorites(
+    currentUser: Annotated[User, Depends(getCurrentUser)],
+    cursor: str | None = None,
+    limit: int | None = None,
+):
+    """Favoriten, neueste zuerst. nextCursor ist None auf der letzten Seite."""
+    after = parseCursor(cursor, int)
+    pageSize = clampPageSize(limit)
+
+    rows = FavoriteDAO.getFavoritesPage(
+        getAccountId(currentUser), after[0] if after else None, pageSize + 1
+    )
+    hasMore = len(rows) > pageSize
+    rows = rows[:pageSize]
+    return {
+        "favorites": [
+            {"id": r["id"], "name": r["name"], "description": r["description"]}
+            for r in rows
+        ],
+        "nextCursor": encodeCursor([rows[-1]["favoriteId"]]) if hasMore else None,
+    }
@@ -0,0 +1,21 @@
+"""
+routes/health.py – Liveness- und Readiness-Endpunkte für Load Balancer und Deploys
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from core import Startup
+
+router = APIRouter(prefix="/health")
+
+
+@router.get("/live", include_in_schema=False)
+async def live():
+    return {"status": "ok"}
+
+
+@router.get("/ready", include_in_schema=False)
+async def ready():
+    """503, bis der Worker aufgewärmt ist; enthält die gemessenen Startzeiten."""
+    return JSONResponse(Startup.status(), status_code=200 if Startup.isReady() else 503)
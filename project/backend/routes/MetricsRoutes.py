@@ -0,0 +1,24 @@
+"""
+routes/metrics.py – Prometheus-Endpunkt (/metrics), nur mit ADMIN_TOKEN
+"""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from core import Metrics
+from core.Auth import requireAdmin
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[Depends(requireAdmin)],
+)
+async def metrics():
+    return PlainTextResponse(
+        Metrics.renderPrometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
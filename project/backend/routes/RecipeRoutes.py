@@ -2,61 +2,262 @@
 routes/recipes.py – Rezept- und Zutaten-Endpunkte
 """
 
-from typing import Annotated
+import json
+from itertools import chain, islice
+from typing import Annotated, Iterator
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
-from core.Auth import getCurrentUser
-from dao import AccountDAO, IngredientDAO
-from core.Models import User, RecipeSearchRequest
+from core import Metrics, Replication
+from core.Auth import getAccountId, getCurrentUser
+from dao import FavoriteDAO, IngredientDAO, RecipeDAO, SimilarityDAO
+from core.Models import IngredientSearch, User, RecipeSearchRequest
+from core.Pagination import clampPageSize, encodeCursor, parseCursor
 from domain.ingredient import Ingredient
-from services.RecipeSUCUK import findRecipes
+from services import IngredientSuggest
+from services.RecipeSUCUK import (
+    PAGE_SIZE,
+    SEARCH_MAX_PAGE_SIZE,
+    findRecipes,
+    iterRecipes,
+)
 
 router = APIRouter()
 
 
-@router.post("/recipes/search")
-async def searchRecipes(
-    body: RecipeSearchRequest,
+@router.get("/recipes")
+async def browseRecipes(
     currentUser: Annotated[User, Depends(getCurrentUser)],
+    cursor: str | None = None,
+    limit: int | None = None,
 ):
-    account = AccountDAO.getAccountByEmail(currentUser.email)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden")
-
-    for zutat in body.zutaten:
-        IngredientDAO.incrementIngredientUsage(account["id"], zutat.name, zutat.unit)
+    """Rezeptkatalog alphabetisch für Infinite Scroll. nextCursor ist None am Ende."""
+    after = parseCursor(cursor, str, int)
+    pageSize = clampPageSize(limit)
 
-    # Echte Rezept-Suche
-    ingredients = [Ingredient(z.name, z.amount) for z in body.zutaten]
-    index = getattr(body, "index", 0)
-    recipes = findRecipes(ingredients, body.index)
+    accountId = getAccountId(currentUser)
 
-    topRows = IngredientDAO.getTopIngredients(account["id"], limit=5)
-    topIngredients = [
-        {"name": r["displayName"], "unit": r["lastUnit"]} for r in topRows
-    ]
+    rows = RecipeDAO.getAllRecipesPaginated(after, pageSize + 1)
+    hasMore = len(rows) > pageSize
+    rows = rows[:pageSize]
+    rids = [r["id"] for r in rows]
+    ingredients = RecipeDAO.getIngredientsForRecipes(rids)
+    favoriteIds = FavoriteDAO.getFavoriteIds(accountId, rids)
 
     return {
         "rezepte": [
             {
-                "name": r.getName(),
-                "description": r.getDescription(),
-                "rating": r.getRating(),
-                "duration": r.getDuration() if hasattr(r, "getDuration") else "",
-                "matching": r.getMatching(),
+                "id": r["id"],
+                "name": r["name"],
+                "description": r["description"],
+                "isFavorite": r["id"] in favoriteIds,
                 "ingredients": [
                     {
-                        "name": i.getName(),
-                        "amount": i.getAmount(),
-                        "unit": i.getAmountType() or "",
+                        "name": i["name"],
+                        "amount": i["amount"],
+                        "unit": i["amountType"] or "",
                     }
-                    for i in r.getIngredients()
+                    for i in ingredients[r["id"]]
                 ],
             }
-            for r in recipes
+            for r in rows
+        ],
+        "nextCursor": (
+            encodeCursor([rows[-1]["name"], rows[-1]["id"]]) if hasMore else None
+        ),
+    }
+
+
+@router.get("/recipes/{recipeId}/similar")
+async def getSimilarRecipes(
+    recipeId: int,
+    currentUser: Annotated[User, Depends(getCurrentUser)],
+    limit: int = 10,
+):
+    """Vorberechnete Nachbarn nach Zutaten-Ähnlichkeit (services.RecipeSimilarity)."""
+    accountId = getAccountId(currentUser)
+    if RecipeDAO.getRecipe(recipeId) is None:
+        raise HTTPException(status_code=404, detail="Rezept nicht gefunden")
+
+    rows = SimilarityDAO.getSimilarRecipes(recipeId, max(1, min(limit, 50)))
+    favoriteIds = FavoriteDAO.getFavoriteIds(accountId, [r["id"] for r in rows])
+    return {
+        "rezepte": [
+            {
+                "id": r["id"],
+                "name": r["name"],
+                "description": r["description"],
+                "similarity": round(r["score"], 3),
+                "isFavorite": r["id"] in favoriteIds,
+            }
+            for r in rows
+        ]
+    }
+
+
+# Favoriten werden beim Streamen in Blöcken dieser Größe nachgeschlagen
+STREAM_FAVORITE_CHUNK = 50
+STREAM_MEDIA_TYPES = ("application/x-ndjson", "text/event-stream")
+
+
+def _recipeJson(r, favoriteIds: set[int]) -> dict:
+    return {
+        "id": r.getId(),
+        "name": r.getName(),
+        "description": r.getDescription(),
+        "rating": r.getRating(),
+        "duration": r.getDuration(),
+        "durationMinutes": r.getDurationMinutes(),
+        "matching": r.getMatching(),
+        "isFavorite": r.getId() in favoriteIds,
+        "ingredients": [
+            {
+                "name": i.getName(),
+                "amount": i.getAmount(),
+                "unit": i.getAmountType() or "",
+            }
+            for i in r.getIngredients()
         ],
-        "topIngredients": topIngredients,
+    }
+
+
+def _acceptQuality(accept: str) -> dict[str, float]:
+    """Medientyp (klein) -> q-Wert aus einem Accept-Header, ohne q gilt 1."""
+    quality: dict[str, float] = {}
+    for part in accept.split(","):
+        mediaType, *params = (p.strip() for p in part.split(";"))
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if mediaType:
+            mediaType = mediaType.lower()
+            quality[mediaType] = max(q, quality.get(mediaType, 0.0))
+    return quality
+
+
+def _streamFormat(accept: str) -> str | None:
+    """
+    Streaming-Typ, wenn der Client ihn ausdrücklich und mindestens so hoch wie
+    JSON bewertet; Wildcards zählen nur für JSON, q=0 heißt "nicht akzeptabel".
+    """
+    quality = _acceptQuality(accept)
+    best = max(STREAM_MEDIA_TYPES, key=lambda t: quality.get(t, 0.0))
+    q = quality.get(best, 0.0)
+    jsonQ = max(
+        quality.get(t, 0.0) for t in ("application/json", "application/*", "*/*")
+    )
+    return best if q > 0 and q >= jsonQ else None
+
+
+def _streamSearch(
+    recipes: Iterator, AccountID: int, topIngredients: list[dict], mediaType: str
+) -> Iterator[bytes]:
+    """topIngredients zuerst, danach jedes Rezept, sobald es serialisiert ist."""
+
+    def frame(event: str, payload: dict) -> bytes:
+        if mediaType == "text/event-stream":
+            data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+            return f"event: {event}\ndata: {data}\n\n".encode()
+        line = json.dumps(
+            {"type": event, **payload}, ensure_ascii=False, separators=(",", ":")
+        )
+        return (line + "\n").encode()
+
+    yield frame("topIngredients", {"topIngredients": topIngredients})
+    count = 0
+    for chunk in iter(lambda: list(islice(recipes, STREAM_FAVORITE_CHUNK)), []):
+        favoriteIds = FavoriteDAO.getFavoriteIds(
+            AccountID, [r.getId() for r in chunk if r.getId() is not None]
+        )
+        for r in chunk:
+            yield frame("recipe", {"recipe": _recipeJson(r, favoriteIds)})
+        count += len(chunk)
+    yield frame("end", {"count": count})
+
+
+def _topIngredients(AccountID: int) -> list[dict]:
+    with Metrics.timed("search.topIngredients"):
+        topRows = IngredientDAO.getTopIngredientsWithFallback(AccountID, limit=5)
+    return [{"name": r["displayName"], "unit": r["lastUnit"]} for r in topRows]
+
+
+def _recordUsage(AccountID: int, zutaten: list[IngredientSearch]) -> None:
+    """Zählt die Suche erst nach dem Ranking, damit sie sich nicht selbst bevorzugt."""
+    with Metrics.timed("search.usageUpdate"):
+        if Replication.isReplica():
+            Replication.forwardUsage(AccountID, [(z.name, z.unit) for z in zutaten])
+        else:
+            for zutat in zutaten:
+                IngredientDAO.incrementIngredientUsage(
+                    AccountID, zutat.name, zutat.unit
+                )
+
+
+@router.post("/recipes/search")
+async def searchRecipes(
+    body: RecipeSearchRequest,
+    currentUser: Annotated[User, Depends(getCurrentUser)],
+    accept: Annotated[str, Header()] = "",
+):
+    """
+    Mit Accept: application/x-ndjson oder text/event-stream wird gestreamt
+    (Ereignisse topIngredients, recipe, end); pageSize wird auf 1 bis
+    SEARCH_MAX_PAGE_SIZE begrenzt.
+    maxDuration (Minuten) lässt nur Rezepte mit geschätzter Zeit bis dahin zu;
+    Rezepte mit Zutaten aus /users/me/exclusions kommen nie vor.
+    """
+    pageSize = clampPageSize(body.pageSize, PAGE_SIZE, SEARCH_MAX_PAGE_SIZE)
+    if body.maxDuration is not None and body.maxDuration < 1:
+        raise HTTPException(status_code=400, detail="maxDuration muss positiv sein")
+
+    with Metrics.timed("search.accountLookup"):
+        accountId = getAccountId(currentUser)
+
+    # Echte Rezept-Suche
+    ingredients = [Ingredient(z.name, z.amount) for z in body.zutaten]
+    AccountID = accountId if body.personalized else None
+
+    mediaType = _streamFormat(accept)
+    if mediaType is not None:
+        recipes = iterRecipes(
+            ingredients,
+            body.index,
+            AccountID,
+            pageSize,
+            body.maxDuration,
+            accountId,
+        )
+        # Das Ranking läuft beim ersten Rezept, die Nutzung zählt erst danach
+        first = list(islice(recipes, 1))
+        await run_in_threadpool(_recordUsage, accountId, body.zutaten)
+        return StreamingResponse(
+            _streamSearch(
+                chain(first, recipes),
+                accountId,
+                _topIngredients(accountId),
+                mediaType,
+            ),
+            media_type=mediaType,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    recipes = findRecipes(
+        ingredients, body.index, AccountID, pageSize, body.maxDuration, accountId
+    )
+    await run_in_threadpool(_recordUsage, accountId, body.zutaten)
+    favoriteIds = FavoriteDAO.getFavoriteIds(
+        accountId, [r.getId() for r in recipes if r.getId() is not None]
+    )
+    return {
+        "rezepte": [_recipeJson(r, favoriteIds) for r in recipes],
+        "topIngredients": _topIngredients(accountId),
     }
 
 
@@ -66,14 +267,36 @@ async def getTopIngredientsForUser(
     currentUser: Annotated[User, Depends(getCurrentUser)],
     limit: int = 5,
 ):
-    account = AccountDAO.getAccountByEmail(currentUser.email)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden")
+    accountId = getAccountId(currentUser)
 
     response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
     response.headers["Pragma"] = "no-cache"
 
-    rows = IngredientDAO.getTopIngredients(account["id"], limit=limit)
+    rows = IngredientDAO.getTopIngredientsWithFallback(accountId, limit=limit)
+    return {
+        "ingredients": [{"name": r["displayName"], "unit": r["lastUnit"]} for r in rows]
+    }
+
+
+@router.get("/ingredients/suggest")
+async def suggestIngredients(
+    currentUser: Annotated[User, Depends(getCurrentUser)],
+    q: str = "",
+    limit: int = IngredientSuggest.DEFAULT_SUGGESTIONS,
+):
+    """Zutaten, deren Name (oder ein Wort darin) mit q beginnt, beliebteste zuerst."""
+    with Metrics.timed("ingredients.suggest"):
+        rows = IngredientSuggest.suggest(q, limit)
+    return {"ingredients": [{"name": r["name"], "unit": r["unit"]} for r in rows]}
+
+
+@router.get("/ingredients/popular")
+async def getPopularIngredients(
+    currentUser: Annotated[User, Depends(getCurrentUser)],
+    limit: int = 5,
+):
+    """Meistgenutzte Zutaten über alle Accounts."""
+    rows = IngredientDAO.getGlobalTopIngredients(limit=max(1, min(limit, 50)))
     return {
         "ingredients": [{"name": r["displayName"], "unit": r["lastUnit"]} for r in rows]
     }
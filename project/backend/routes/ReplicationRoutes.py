@@ -0,0 +1,46 @@
+"""
+routes/replication.py – Snapshot-Auslieferung und Schreib-Endpunkte für Lese-Replikate
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+
+from core import Replication
+from core.Auth import requireReplicationToken
+from core.Models import ReplicationUsageRequest
+from dao import IngredientDAO
+
+router = APIRouter(
+    prefix="/replication", dependencies=[Depends(requireReplicationToken)]
+)
+
+
+def _requirePrimary() -> None:
+    if not Replication.isPrimary():
+        raise HTTPException(status_code=404, detail="Kein Primary")
+
+
+@router.get("/snapshot", include_in_schema=False)
+async def getSnapshot(request: Request):
+    """Konsistenter DB-Snapshot; 304, wenn das Replikat ihn schon hat."""
+    _requirePrimary()
+    path, etag = await run_in_threadpool(Replication.getSnapshot)
+    if request.headers.get("If-None-Match", "").strip('"') == etag:
+        return Response(status_code=304, headers={"ETag": f'"{etag}"'})
+    return FileResponse(
+        path, media_type="application/vnd.sqlite3", headers={"ETag": f'"{etag}"'}
+    )
+
+
+def _recordItems(items) -> None:
+    for item in items:
+        IngredientDAO.incrementIngredientUsage(item.accountId, item.name, item.unit)
+
+
+@router.post("/usage", include_in_schema=False)
+async def recordUsage(body: ReplicationUsageRequest):
+    """Zutaten-Nutzung, die Replikate bei Suchen gesammelt haben."""
+    _requirePrimary()
+    await run_in_threadpool(_recordItems, body.items)
+    return {"recorded": len(body.items)}
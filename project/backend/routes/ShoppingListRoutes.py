@@ -0,0 +1,36 @@
+"""
+routes/shopping_list.py – Einkaufsliste aus mehreren Rezepten
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from core.Auth import getCurrentUser
+from core.Models import ShoppingListRequest, User
+from services import ShoppingListService
+
+router = APIRouter()
+
+
+@router.post("/shopping-list")
+async def createShoppingList(
+    body: ShoppingListRequest,
+    currentUser: Annotated[User, Depends(getCurrentUser)],
+):
+    """Summiert die Zutaten der Rezepte (× Portionen) abzüglich der Vorräte."""
+    if not body.recipeIds:
+        raise HTTPException(status_code=400, detail="Keine Rezepte angegeben")
+    if len(set(body.recipeIds)) > ShoppingListService.MAX_RECIPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Höchstens {ShoppingListService.MAX_RECIPES} Rezepte pro Liste",
+        )
+    if body.servings < 1:
+        raise HTTPException(status_code=400, detail="Ungültige Portionenzahl")
+
+    return ShoppingListService.buildShoppingList(
+        body.recipeIds,
+        body.servings,
+        [(z.name, z.amount, z.unit) for z in body.onHand],
+    )
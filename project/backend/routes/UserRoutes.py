@@ -4,12 +4,14 @@ routes/users.py – Geschützte User-Endpunkte (/users/me)
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 
-from core.Auth import getCurrentUser
-from dao import AccountDAO
+from core.Auth import getAccountId, getCurrentUser
+from dao import AccountDAO, ExclusionDAO
 from services import UserService
-from core.Models import User, UpdateUser
+from services.Exclusions import MAX_EXCLUSIONS
+from core.Models import ExclusionList, User, UpdateUser
 
 router = APIRouter()
 
@@ -23,7 +25,7 @@ async def readCurrentUser(currentUser: Annotated[User, Depends(getCurrentUser)])
 @router.delete("/users/me", status_code=status.HTTP_204_NO_CONTENT)
 async def deleteCurrentUser(currentUser: Annotated[User, Depends(getCurrentUser)]):
     """Löscht das eigene Konto inkl. aller Refresh Tokens (CASCADE)."""
-    AccountDAO.deleteAccount(currentUser.email)
+    await run_in_threadpool(AccountDAO.deleteAccount, currentUser.email)
 
 
 @router.patch("/users/me")
@@ -31,9 +33,69 @@ async def updateCurrentUser(
     data: UpdateUser,
     currentUser: Annotated[User, Depends(getCurrentUser)],
 ):
-    account = AccountDAO.getAccountByEmail(currentUser.email)
     try:
-        UserService.updateUser(account["id"], account["email"], data)
+        await run_in_threadpool(
+            UserService.updateUser, getAccountId(currentUser), currentUser.email, data
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     return {"success": True}
+
+
+def _exclusionList(AccountID: int) -> dict:
+    return {
+        "ingredients": [r["displayName"] for r in ExclusionDAO.getExclusions(AccountID)]
+    }
+
+
+@router.get("/users/me/exclusions")
+async def listExclusions(currentUser: Annotated[User, Depends(getCurrentUser)]):
+    """Zutaten, deren Rezepte die Suche für diesen User nie liefert."""
+    return _exclusionList(getAccountId(currentUser))
+
+
+@router.put("/users/me/exclusions")
+async def replaceExclusions(
+    data: ExclusionList,
+    currentUser: Annotated[User, Depends(getCurrentUser)],
+):
+    """Ersetzt die komplette Ausschlussliste."""
+    names = [name.strip() for name in data.ingredients]
+    if any(not name for name in names):
+        raise HTTPException(status_code=400, detail="Zutat darf nicht leer sein")
+    if len({name.lower() for name in names}) > MAX_EXCLUSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Höchstens {MAX_EXCLUSIONS} ausgeschlossene Zutaten",
+        )
+    AccountID = getAccountId(currentUser)
+    await run_in_threadpool(ExclusionDAO.replaceExclusions, AccountID, names)
+    return _exclusionList(AccountID)
+
+
+@router.put("/users/me/exclusions/{name}", status_code=status.HTTP_204_NO_CONTENT)
+async def addExclusion(
+    name: str, currentUser: Annotated[User, Depends(getCurrentUser)]
+):
+    if not name.strip():
+        raise HTTPException(status_code=400, detail="Zutat darf nicht leer sein")
+    AccountID = getAccountId(currentUser)
+    existing = ExclusionDAO.getExclusions(AccountID)
+    if name.strip().lower() not in {r["name"] for r in existing}:
+        if len(existing) >= MAX_EXCLUSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Höchstens {MAX_EXCLUSIONS} ausgeschlossene Zutaten",
+            )
+        await run_in_threadpool(ExclusionDAO.addExclusion, AccountID, name)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.delete("/users/me/exclusions/{name}", status_code=status.HTTP_204_NO_CONTENT)
+async def removeExclusion(
+    name: str, currentUser: Annotated[User, Depends(getCurrentUser)]
+):
+    await run_in_threadpool(
+        ExclusionDAO.removeExclusion, getAccountId(currentUser), name
+    )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,47 @@
+"""
+author_service.py – Autoren-Seiten mit gecachter Rezeptanzahl
+"""
+
+import threading
+import time
+
+from core import Catalogue
+from dao import AuthorDAO
+
+RECIPE_COUNT_TTL_SECONDS = 60
+
+_lock = threading.Lock()
+# authorID -> (count, expiresAt)
+_recipeCounts: dict[int, tuple[int, float]] = {}
+
+
+def getRecipeCount(authorID: int) -> int:
+    """Anzahl der Rezepte eines Autors, pro Worker für RECIPE_COUNT_TTL_SECONDS gecacht."""
+    now = time.monotonic()
+    with _lock:
+        cached = _recipeCounts.get(authorID)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    count = AuthorDAO.countRecipesByAuthor(authorID)
+    with _lock:
+        _recipeCounts[authorID] = (count, now + RECIPE_COUNT_TTL_SECONDS)
+    return count
+
+
+def invalidateRecipeCounts(authorID: int | None = None) -> None:
+    """Verwirft den Cache für einen Autor oder (ohne ID) für alle."""
+    with _lock:
+        if authorID is None:
+            _recipeCounts.clear()
+        else:
+            _recipeCounts.pop(authorID, None)
+
+
+def getAuthorPage(authorID: int) -> dict | None:
+    author = AuthorDAO.getAuthor(authorID)
+    if author is None:
+        return None
+    return {**author, "recipeCount": getRecipeCount(authorID)}
+
+
+Catalogue.onChange(invalidateRecipeCounts)
@@ -0,0 +1,105 @@
+"""
+EmailTemplates.py – Vorkompilierte E-Mail-Templates (Text + HTML) mit HTML-Escaping
+
+Templates liegen unter templates/email/<name>.txt bzw. <name>.html und verwenden
+Platzhalter der Form {{ variable }}. Beim Laden wird jedes Template einmalig in
+statische Teile und Platzhalter zerlegt; beim Rendern werden nur noch die Werte
+eingesetzt.
+"""
+
+import html
+import logging
+import re
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates" / "email"
+
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class CompiledTemplate:
+    """Ein in statische Teile und Platzhalter zerlegtes Template."""
+
+    def __init__(self, source: str, escape: bool):
+        parts = _PLACEHOLDER_RE.split(source)
+        self.__static = tuple(parts[0::2])
+        self.__fields = tuple(parts[1::2])
+        self.__escape = escape
+        # Templates ohne Platzhalter werden nur einmal zusammengesetzt
+        self.__cached = source if not self.__fields else None
+
+    def getFields(self) -> tuple[str, ...]:
+        return self.__fields
+
+    def render(self, values: dict) -> str:
+        if self.__cached is not None:
+            return self.__cached
+        missing = [f for f in self.__fields if f not in values]
+        if missing:
+            raise KeyError(f"Fehlende Template-Variablen: {', '.join(missing)}")
+
+        out = [self.__static[0]]
+        for field, static in zip(self.__fields, self.__static[1:]):
+            value = str(values[field])
+            out.append(html.escape(value) if self.__escape else value)
+            out.append(static)
+        return "".join(out)
+
+
+class EmailTemplate:
+    """Text- und HTML-Variante einer Mail, gemeinsam gerendert."""
+
+    def __init__(self, name: str, text: CompiledTemplate, htmlPart: CompiledTemplate):
+        self.__name = name
+        self.__text = text
+        self.__html = htmlPart
+
+    def getName(self) -> str:
+        return self.__name
+
+    def render(self, **values) -> tuple[str, str]:
+        """Gibt (text, html) zurück. Werte werden nur im HTML-Teil escaped."""
+        return self.__text.render(values), self.__html.render(values)
+
+
+_templates: dict[str, EmailTemplate] = {}
+
+
+def loadTemplates(directory: Path | None = None) -> dict[str, EmailTemplate]:
+    """Lädt und kompiliert alle Templates aus dem Verzeichnis (einmalig beim Start)."""
+    directory = directory or TEMPLATE_DIR
+    loaded = {}
+    for htmlFile in sorted(directory.glob("*.html")):
+        name = htmlFile.stem
+        textFile = htmlFile.with_suffix(".txt")
+        if not textFile.exists():
+            logger.warning("Template '%s' hat keine Text-Variante", name)
+            continue
+        loaded[name] = EmailTemplate(
+            name,
+            CompiledTemplate(textFile.read_text(encoding="utf-8"), escape=False),
+            CompiledTemplate(htmlFile.read_text(encoding="utf-8"), escape=True),
+        )
+    _templates.clear()
+    _templates.update(loaded)
+    logger.info("%d E-Mail-Templates geladen", len(loaded))
+    return loaded
+
+
+def getTemplate(name: str) -> EmailTemplate:
+    if not _templates:
+        loadTemplates()
+    template = _templates.get(name)
+    if template is None:
+        raise KeyError(f"Unbekanntes E-Mail-Template: {name}")
+    return template
+
+
+def renderEmail(templateName: str, /, **values) -> tuple[str, str]:
+    """Rendert ein Template als (text, html)."""
+    return getTemplate(templateName).render(**values)
+
+
+loadTemplates()
@@ -0,0 +1,92 @@
+"""
+Exclusions.py – Ausgeschlossene Zutaten eines Accounts als Bitmap über den Katalog
+
+Eine Ausschlussliste ("nuss", "schwein") wird gegen das Zutaten-Vokabular des
+Katalog-Snapshots kompiliert: Eine Zutat ist ausgeschlossen, wenn ihr Name dem
+kanonischen Namen eines Eintrags entspricht oder als Kompositum auf ihn endet,
+ohne Rücksicht auf Groß- und Kleinschreibung ("nüsse" trifft "Haselnuss" und
+"Walnuss", aber weder "Butternusskürbis" noch "Muskatnuss"). Kurze Einträge
+wie "ei" gelten nur für genau diese Zutat, sonst fiele "Salbei" mit weg.
+Über die Rezeptlisten dieser Zutaten (CSR^T) entsteht daraus ein Bit pro
+Rezeptposition. Die Suche prüft nur noch dieses Bit und überspringt die
+ausgeschlossenen Zutaten beim Werten ganz.
+
+Kompiliert wird einmal pro Account und Snapshot (LRU, CACHE_SIZE Accounts).
+Die Liste selbst wird bei jeder Suche gelesen (eine Zeile pro Eintrag über den
+Primärschlüssel), damit eine Änderung sofort in allen Workern gilt.
+"""
+
+import threading
+from collections import OrderedDict
+
+from dao import ExclusionDAO
+from domain.canonical import canonicalName
+
+MAX_EXCLUSIONS = 50
+CACHE_SIZE = 1024
+# Kürzere Einträge treffen nur den gleichnamigen Zutatennamen
+MIN_SUFFIX_LENGTH = 4
+# Heißen wie ein Kompositum, gehören aber nicht dazu (Muskatnuss ist ein Gewürz)
+FALSE_COMPOUNDS = frozenset({"muskatnuss"})
+
+_lock = threading.Lock()
+# AccountID -> kompilierter Filter (gehört zu genau einem Snapshot)
+_filters: OrderedDict[int, "ExclusionFilter"] = OrderedDict()
+
+
+class ExclusionFilter:
+    """Ausschlüsse eines Accounts, kompiliert gegen einen Katalog-Snapshot."""
+
+    def __init__(self, snapshot, names: tuple[str, ...]):
+        self.snapshot = snapshot
+        self.names = names
+        terms = {canonicalName(name).lower() for name in names}
+        self.ingredients = frozenset(
+            j
+            for j, candidate in enumerate(snapshot.vocabulary)
+            if any(_matches(term, candidate.lower()) for term in terms)
+        )
+        bits = bytearray((snapshot.recipeCount + 7) // 8)
+        indptr, indices = snapshot.ingredientIndptr, snapshot.ingredientIndices
+        for j in self.ingredients:
+            for position in indices[indptr[j] : indptr[j + 1]]:
+                bits[position >> 3] |= 1 << (position & 7)
+        self.bits = bits
+
+    def excludes(self, position: int) -> bool:
+        return bool(self.bits[position >> 3] >> (position & 7) & 1)
+
+
+def _matches(term: str, candidate: str) -> bool:
+    if candidate == term:
+        return True
+    return (
+        len(term) >= MIN_SUFFIX_LENGTH
+        and candidate.endswith(term)
+        and candidate not in FALSE_COMPOUNDS
+    )
+
+
+def getFilter(AccountID: int, snapshot) -> ExclusionFilter | None:
+    """Filter für diesen Account und Snapshot, None ohne Ausschlüsse."""
+    names = tuple(row["name"] for row in ExclusionDAO.getExclusions(AccountID))
+    if not names:
+        return None
+    with _lock:
+        cached = _filters.get(AccountID)
+        if cached is not None and cached.snapshot is snapshot and cached.names == names:
+            _filters.move_to_end(AccountID)
+            return cached
+
+    compiled = ExclusionFilter(snapshot, names)
+    with _lock:
+        _filters[AccountID] = compiled
+        _filters.move_to_end(AccountID)
+        while len(_filters) > CACHE_SIZE:
+            _filters.popitem(last=False)
+    return compiled
+
+
+def clearCache() -> None:
+    with _lock:
+        _filters.clear()
@@ -0,0 +1,165 @@
+"""
+ExportService.py – Katalog- und Account-Export als NDJSON oder CSV, optional gzip
+
+Alle Schritte sind Generatoren (Zeilen aus ExportDAO -> Text -> ggf. gzip), der
+Speicherbedarf hängt also nicht von der Größe des Katalogs ab. Dieselben Ströme
+liefern die Export-Endpunkte und die Kommandozeile.
+
+Aufruf (aus project/backend):
+    python -m services.ExportService catalogue --format csv --gzip -o katalog.csv.gz
+    python -m services.ExportService account user@example.com -o daten.ndjson
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import zlib
+from typing import Iterable, Iterator
+
+from core import Database
+from dao import AccountDAO, ExportDAO
+
+FORMATS = ("ndjson", "csv")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+# Ausgabe wird zu Blöcken dieser Größe gesammelt, statt pro Zeile zu schreiben
+CHUNK_BYTES = 64 * 1024
+
+CATALOGUE_CSV_FIELDS = (
+    "recipeId",
+    "recipeName",
+    "description",
+    "author",
+    "durationMinutes",
+    "ingredient",
+    "amount",
+    "unit",
+)
+ACCOUNT_CSV_FIELDS = (
+    "section",
+    "id",
+    "email",
+    "name",
+    "createdAt",
+    "recipeId",
+    "recipeName",
+    "ingredient",
+    "count",
+    "lastUnit",
+    "lastUsedAt",
+)
+
+
+def toNdjson(records: Iterable[dict]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def toCsv(records: Iterable[dict], fields: tuple[str, ...]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _catalogueRows(recipes: Iterable[dict]) -> Iterator[dict]:
+    """Eine CSV-Zeile pro (Rezept, Zutat); Rezepte ohne Zutaten mit leerer Zutat."""
+    for recipe in recipes:
+        base = {
+            "recipeId": recipe["id"],
+            "recipeName": recipe["name"],
+            "description": recipe["description"],
+            "author": recipe["author"] or "",
+            "durationMinutes": recipe["durationMinutes"],
+        }
+        if not recipe["ingredients"]:
+            yield base
+        for ingredient in recipe["ingredients"]:
+            yield {
+                **base,
+                "ingredient": ingredient["name"],
+                "amount": ingredient["amount"],
+                "unit": ingredient["unit"],
+            }
+
+
+def encode(lines: Iterable[str], gzip: bool = False) -> Iterator[bytes]:
+    """UTF-8, in Blöcken von etwa CHUNK_BYTES; mit gzip fortlaufend komprimiert."""
+    compressor = zlib.compressobj(wbits=31) if gzip else None
+    pending: list[bytes] = []
+    size = 0
+    for line in lines:
+        data = line.encode("utf-8")
+        pending.append(data)
+        size += len(data)
+        if size >= CHUNK_BYTES:
+            block = b"".join(pending)
+            pending, size = [], 0
+            if compressor is not None:
+                block = compressor.compress(block)
+            if block:
+                yield block
+    block = b"".join(pending)
+    if compressor is not None:
+        block = compressor.compress(block) + compressor.flush()
+    if block:
+        yield block
+
+
+def exportCatalogue(fmt: str, gzip: bool = False) -> Iterator[bytes]:
+    recipes = ExportDAO.iterCatalogue()
+    if fmt == "csv":
+        lines = toCsv(_catalogueRows(recipes), CATALOGUE_CSV_FIELDS)
+    else:
+        lines = toNdjson(recipes)
+    return encode(lines, gzip)
+
+
+def exportAccount(AccountID: int, fmt: str, gzip: bool = False) -> Iterator[bytes]:
+    records = ExportDAO.iterAccountData(AccountID)
+    if fmt == "csv":
+        lines = toCsv(records, ACCOUNT_CSV_FIELDS)
+    else:
+        lines = toNdjson(records)
+    return encode(lines, gzip)
+
+
+def fileName(base: str, fmt: str, gzip: bool) -> str:
+    return f"{base}.{fmt}" + (".gz" if gzip else "")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="LazyCook-Daten exportieren")
+    parser.add_argument("what", choices=("catalogue", "account"))
+    parser.add_argument("email", nargs="?", help="E-Mail des Accounts (für account)")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("-o", "--output", help="Zieldatei (Standard: stdout)")
+    args = parser.parse_args(argv)
+
+    Database.initDB()
+    if args.what == "account":
+        account = AccountDAO.getAccountByEmail(args.email or "")
+        if account is None:
+            parser.error("Account nicht gefunden")
+        chunks = exportAccount(account["id"], args.format, args.gzip)
+    else:
+        chunks = exportCatalogue(args.format, args.gzip)
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+IngredientSuggest.py – Autovervollständigung für Zutaten über einen sortierten Präfix-Index
+
+Der Index wird pro Worker aus Ingredient und IngredientPopularity gebaut und über
+core.Catalogue bei Katalogänderungen sowie alle SUGGEST_RELOAD_SECONDS im
+Hintergrund neu gebaut. Jeder Eintrag ist (Schlüssel, Position), wobei der
+Schlüssel der normalisierte Name ab einem Wortanfang ist. So findet "tom" auch
+"Cherry-Tomate". Eine Abfrage ist eine bisect-Bereichssuche plus Ranking nach
+globaler Beliebtheit und braucht keine DB-Verbindung.
+"""
+
+import heapq
+import os
+import re
+from bisect import bisect_left
+
+from core import Catalogue
+from dao import IngredientDAO
+
+SUGGEST_RELOAD_SECONDS = float(os.environ.get("SUGGEST_RELOAD_SECONDS", "600"))
+DEFAULT_SUGGESTIONS = 8
+MAX_SUGGESTIONS = 25
+
+_WORD_START_RE = re.compile(r"(?<=[\s\-/(])\w")
+
+
+def normalize(text: str) -> str:
+    return " ".join((text or "").casefold().split())
+
+
+class PrefixIndex:
+    """Sortierte Schlüssel mit Verweis auf die Zutat, unveränderlich nach dem Bau."""
+
+    def __init__(self, rows: list[dict]):
+        # Beliebteste zuerst, bei Gleichstand kürzere Namen: Position = Rang
+        self.__entries = sorted(
+            (
+                {
+                    "name": r["name"],
+                    "unit": r["amountType"],
+                    "popularity": r["popularity"],
+                }
+                for r in rows
+            ),
+            key=lambda e: (-e["popularity"], len(e["name"]), normalize(e["name"])),
+        )
+        keys = []
+        for rank, entry in enumerate(self.__entries):
+            name = normalize(entry["name"])
+            keys.append((name, rank))
+            for match in _WORD_START_RE.finditer(name):
+                keys.append((name[match.start() :], rank))
+        keys.sort()
+        self.__keys = [k for k, _ in keys]
+        self.__ranks = [rank for _, rank in keys]
+        self.__names = [normalize(e["name"]) for e in self.__entries]
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def suggest(self, query: str, limit: int = DEFAULT_SUGGESTIONS) -> list[dict]:
+        prefix = normalize(query)
+        if not prefix:
+            return self.__entries[:limit]
+        start = bisect_left(self.__keys, prefix)
+        end = bisect_left(self.__keys, prefix + "\U0010ffff", start)
+        # Bei gleicher Beliebtheit gehen Treffer am Namensanfang vor Wortanfängen
+        ranks = heapq.nsmallest(
+            limit,
+            set(self.__ranks[start:end]),
+            key=lambda rank: (
+                -self.__entries[rank]["popularity"],
+                not self.__names[rank].startswith(prefix),
+                rank,
+            ),
+        )
+        return [self.__entries[rank] for rank in ranks]
+
+
+_index = Catalogue.register(
+    "ingredientSuggest",
+    lambda: PrefixIndex(IngredientDAO.getIngredientsWithPopularity()),
+    maxAgeSeconds=SUGGEST_RELOAD_SECONDS,
+)
+
+
+def getIndex() -> PrefixIndex:
+    return _index.get()
+
+
+def suggest(query: str, limit: int = DEFAULT_SUGGESTIONS) -> list[dict]:
+    return getIndex().suggest(query, max(1, min(limit, MAX_SUGGESTIONS)))
+
+
+def reset() -> None:
+    """Verwirft den Index; er wird beim nächsten Aufruf neu gebaut (z.B. in Tests)."""
+    _index.reset()
@@ -0,0 +1,139 @@
+"""
+Personalization.py – Personalisierte Nachsortierung der Suchergebnisse
+
+Aus IngredientUsage wird pro Account ein Präferenzvektor berechnet: Gewicht einer
+kanonischen Zutat (domain.canonical) = Anzahl Nutzungen, halbiert alle
+HALF_LIFE_DAYS seit der letzten Nutzung, normiert auf 0..1. Eine Präferenz gilt
+für Rezeptzutaten, deren kanonischer Name sie als ganzes Wort enthält. Der Vektor wird pro Worker für PREFERENCE_TTL_SECONDS gecacht
+und merkt sich das Gewicht jedes bereits gesehenen Zutatennamens, sodass die
+Nachsortierung nach dem ersten Request nur noch aus Dict-Zugriffen besteht.
+Nachsortiert werden nur die besten RERANK_CANDIDATES Treffer des Basis-Scorings;
+der Bonus ist so klein gewichtet, dass er Rezepte mit gleicher oder ähnlicher
+Übereinstimmung umordnet, aber keine deutlich besseren Treffer verdrängt.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from dao import IngredientDAO
+from domain.canonical import canonicalName
+from domain.recipe import Recipe
+
+HALF_LIFE_DAYS = 30
+MAX_PREFERENCES = 20
+PREFERENCE_TTL_SECONDS = 60
+RERANK_CANDIDATES = 300
+PERSONAL_WEIGHT = 0.25
+CACHE_SIZE = 1024
+
+_lock = threading.Lock()
+
+
+class PreferenceVector:
+    """Gewichte pro normalisierter Zutat plus Memo für konkrete Zutatennamen."""
+
+    def __init__(self, weights: dict[str, float]):
+        self.weights = weights
+        self.__byName: dict[str, float] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.weights)
+
+    def weightFor(self, ingredientName: str) -> float:
+        """
+        Höchstes Gewicht einer Präferenz, die als ganzes Wort im kanonischen Namen
+        steht ("zwiebel" in "rote Zwiebel", aber "ei" nicht in "Reis").
+        """
+        weight = self.__byName.get(ingredientName)
+        if weight is None:
+            words = f" {_key(ingredientName).replace('-', ' ')} "
+            weight = max(
+                (w for pref, w in self.weights.items() if f" {pref} " in words),
+                default=0.0,
+            )
+            self.__byName[ingredientName] = weight
+        return weight
+
+
+def _key(name: str) -> str:
+    return canonicalName(name).lower()
+
+
+# AccountID -> (preferences, expiresAt), höchstens CACHE_SIZE Accounts
+_preferences: OrderedDict[int, tuple[PreferenceVector, float]] = OrderedDict()
+
+
+def _ageInDays(lastUsedAt: str | None, now: datetime) -> float:
+    if not lastUsedAt:
+        return 0.0
+    try:
+        used = datetime.fromisoformat(lastUsedAt).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return 0.0
+    return max(0.0, (now - used).total_seconds() / 86400)
+
+
+def buildPreferences(rows: list[dict], now: datetime | None = None) -> PreferenceVector:
+    """Gewicht 0..1 pro kanonischem Namen (klein) aus IngredientUsage-Zeilen."""
+    now = now or datetime.now(timezone.utc)
+    weights: dict[str, float] = {}
+    for row in rows:
+        # "Tomaten" und "tomate" sind dieselbe Zutat
+        key = _key(row["name"])
+        weights[key] = weights.get(key, 0.0) + row["count"] * 0.5 ** (
+            _ageInDays(row["lastUsedAt"], now) / HALF_LIFE_DAYS
+        )
+    top = sorted(weights.items(), key=lambda kv: kv[1], reverse=True)[:MAX_PREFERENCES]
+    if not top or top[0][1] <= 0:
+        return PreferenceVector({})
+    highest = top[0][1]
+    return PreferenceVector({name: weight / highest for name, weight in top})
+
+
+def getPreferences(AccountID: int) -> PreferenceVector:
+    now = time.monotonic()
+    with _lock:
+        cached = _preferences.get(AccountID)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    preferences = buildPreferences(IngredientDAO.getIngredientUsage(AccountID))
+    with _lock:
+        _preferences[AccountID] = (preferences, now + PREFERENCE_TTL_SECONDS)
+        _preferences.move_to_end(AccountID)
+        while len(_preferences) > CACHE_SIZE:
+            _preferences.popitem(last=False)
+    return preferences
+
+
+def invalidatePreferences(AccountID: int | None = None) -> None:
+    """Verwirft den Cache für einen Account oder (ohne ID) für alle."""
+    with _lock:
+        if AccountID is None:
+            _preferences.clear()
+        else:
+            _preferences.pop(AccountID, None)
+
+
+def personalBoost(recipe: Recipe, preferences: PreferenceVector) -> float:
+    """Mittleres Präferenzgewicht der Rezeptzutaten (0..1)."""
+    ingredients = recipe.getIngredients()
+    if not ingredients:
+        return 0.0
+    return sum(preferences.weightFor(i.getName()) for i in ingredients) / len(
+        ingredients
+    )
+
+
+def rerank(recipes: list[Recipe], preferences: PreferenceVector) -> list[Recipe]:
+    """Sortiert die ersten RERANK_CANDIDATES der (bereits sortierten) Liste neu."""
+    if not preferences:
+        return recipes
+    candidates = recipes[:RERANK_CANDIDATES]
+    scores = {
+        id(r): r.getRating() + PERSONAL_WEIGHT * personalBoost(r, preferences)
+        for r in candidates
+    }
+    candidates.sort(key=lambda r: scores[id(r)], reverse=True)
+    return candidates + recipes[RERANK_CANDIDATES:]
@@ -0,0 +1,36 @@
+"""
+RecipeDuration.py – Zubereitungszeiten aller Rezepte neu schätzen
+
+addRecipe und die Migration in initDB schätzen die Zeit schon beim Anlegen
+(domain.duration). Nach Änderungen an den Erkennungsregeln oder einem Import an
+addRecipe vorbei werden mit diesem Job alle Rezepte neu berechnet.
+
+Aufruf (aus project/backend):
+    python -m services.RecipeDuration
+"""
+
+import argparse
+
+from core import Database
+from dao import RecipeDAO
+from domain.duration import estimateMinutes
+
+
+def rebuild() -> int:
+    """Schätzt alle Rezepte neu; gibt die Anzahl mit erkannter Zeitangabe zurück."""
+    durations = [
+        (estimateMinutes(r["description"]), r["id"]) for r in RecipeDAO.getAllRecipes()
+    ]
+    RecipeDAO.updateDurations(durations)
+    return sum(minutes is not None for minutes, _ in durations)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Zubereitungszeiten neu schätzen")
+    parser.parse_args(argv)
+    Database.initDB()
+    print(f"{rebuild()} Rezepte mit Zeitangabe.")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,101 @@ recipe_service.py – Geschäftslogik für Rezeptsuche
 SUCUK = Search for Uncomplicated Cooking and User-friendly Kitchen recipes
 """
 
+from typing import Iterator
+
+from core import Catalogue, CatalogueSnapshot, Database, Metrics
+from domain.canonical import canonicalName
 from domain.recipe import Recipe
 from domain.ingredient import Ingredient
 from dao import IngredientDAO, RecipeDAO
+from services import Exclusions, Personalization
 
+PAGE_SIZE = 12
+SEARCH_MAX_PAGE_SIZE = 500
 
-def findRecipes(ingredients: list, index: int) -> list[Recipe]:
-    """Sucht Rezepte anhand einer Zutatenliste, sortiert nach Übereinstimmung (paginiert)."""
-    recipes = _initRecipes()
 
-    for ingredient in ingredients:
-        _scoreRecipes(recipes, ingredient)
+def _buildSnapshot() -> CatalogueSnapshot.CatalogueSnapshot:
+    return CatalogueSnapshot.load(
+        lambda: RecipeDAO.getAllRecipesWithIngredients(), Database.getCatalogueVersion
+    )
+
+
+# Katalog als CSR-Snapshot, bei Katalogänderungen neu eingeblendet
+_catalogue = Catalogue.register("catalogueSnapshot", _buildSnapshot)
+
+
+def findRecipes(
+    ingredients: list,
+    index: int,
+    AccountID: int | None = None,
+    pageSize: int = PAGE_SIZE,
+    maxDuration: int | None = None,
+    excludeFor: int | None = None,
+) -> list[Recipe]:
+    """
+    Sucht Rezepte anhand einer Zutatenliste, sortiert nach Übereinstimmung (paginiert).
+    Mit AccountID werden die besten Treffer nach den Vorlieben des Users nachsortiert.
+    Mit maxDuration kommen nur Rezepte mit geschätzter Zeit bis dahin in Frage, mit
+    excludeFor keine Rezepte mit Zutaten aus der Ausschlussliste dieses Accounts.
+    """
+    return list(
+        iterRecipes(ingredients, index, AccountID, pageSize, maxDuration, excludeFor)
+    )
+
+
+def iterRecipes(
+    ingredients: list,
+    index: int,
+    AccountID: int | None = None,
+    pageSize: int = PAGE_SIZE,
+    maxDuration: int | None = None,
+    excludeFor: int | None = None,
+) -> Iterator[Recipe]:
+    """
+    Wie findRecipes, baut die Recipe-Objekte aber erst beim Iterieren. Außer den
+    Kandidaten der Nachsortierung liegt so immer nur ein Rezept im Speicher.
+    """
+    with Metrics.timed("search.initRecipes"):
+        snapshot = _catalogue.get()
+
+    start, end = pageSize * index, pageSize * (index + 1)
+    # Zeitfilter und Ausschlüsse grenzen die Positionen ein, bevor gewertet wird
+    exclusions = None
+    if excludeFor is not None:
+        with Metrics.timed("search.exclusions"):
+            exclusions = Exclusions.getFilter(excludeFor, snapshot)
+    allowed = None
+    if maxDuration is not None:
+        allowed = snapshot.positionsWithin(maxDuration)
+        if exclusions is not None:
+            allowed = [p for p in allowed if not exclusions.excludes(p)]
+    with Metrics.timed("search.scoring"):
+        matching = _scoreRecipes(snapshot, ingredients, allowed, exclusions)
+        reranked = AccountID is not None
+        order = _rankRecipes(
+            snapshot,
+            matching,
+            max(end, Personalization.RERANK_CANDIDATES) if reranked else end,
+            allowed,
+            exclusions,
+        )
+
+    candidates: list[Recipe] = []
+    if reranked:
+        with Metrics.timed("search.personalization"):
+            candidates = Personalization.rerank(
+                [
+                    _toRecipe(snapshot, p, matching.get(p, 0))
+                    for p in order[: Personalization.RERANK_CANDIDATES]
+                ],
+                Personalization.getPreferences(AccountID),
+            )
 
-    recipes.sort(key=lambda r: r.getRating(), reverse=True)
-    return recipes[12 * index : 12 * (index + 1)]
+    for i in range(start, min(end, len(order))):
+        if i < len(candidates):
+            yield candidates[i]
+        else:
+            yield _toRecipe(snapshot, order[i], matching.get(order[i], 0))
 
 
 def getMatchingRecipeNames(searchTerm: str) -> list[Recipe]:
@@ -31,22 +112,94 @@ def getMatchingRecipeNames(searchTerm: str) -> list[Recipe]:
     ]
 
 
-def _initRecipes() -> list[Recipe]:
-    rows = RecipeDAO.getAllRecipesWithIngredients()
-    result = []
-    for r in rows:
-        ingredients = []
-        for i in r["ingredients"]:
-            ing = Ingredient(i["name"], i["amount"])
-            ing.setAmountType(i["amountType"])
-            ingredients.append(ing)
-        result.append(Recipe(r["name"], ingredients, r["description"] or ""))
-    return result
-
-
-def _scoreRecipes(recipes: list[Recipe], ingredient) -> None:
-    for recipe in recipes:
-        for recipeIngredient in recipe.getIngredients():
-            if ingredient.getName() in recipeIngredient.getName():
-                recipe.incrementMatching()
-                recipe.setRating(recipe.getMatching() / len(recipe.getIngredients()))
+def _scoreRecipes(
+    snapshot, ingredients: list, allowed=None, exclusions=None
+) -> dict[int, int]:
+    """
+    Treffer pro Rezeptposition. Eine Zutat passt, wenn der kanonische Name des
+    Suchbegriffs ("Tomaten" -> "Tomate") im Zutatennamen vorkommt; jede passende
+    Rezeptzutat zählt einmal pro Suchbegriff.
+    Mit allowed werden nur diese Positionen gewertet, je nach Größe über ihre
+    eigenen Zutaten oder die Rezeptlisten der passenden Zutaten. Mit exclusions
+    fallen ausgeschlossene Rezepte weg (allowed ist dann schon gefiltert).
+    """
+    weights: dict[int, int] = {}
+    for ingredient in ingredients:
+        for j in snapshot.matchingIngredients(canonicalName(ingredient.getName())):
+            weights[j] = weights.get(j, 0) + 1
+    if exclusions is not None:
+        # Jedes Rezept mit einer ausgeschlossenen Zutat fällt ohnehin weg
+        for j in exclusions.ingredients.intersection(weights):
+            del weights[j]
+
+    indptr, indices = snapshot.ingredientIndptr, snapshot.ingredientIndices
+    matching: dict[int, int] = {}
+    if allowed is not None:
+        # Wenige zugelassene Rezepte: direkt deren Zutaten werten statt der
+        # (längeren) Rezeptlisten aller passenden Zutaten
+        postings = sum(indptr[j + 1] - indptr[j] for j in weights)
+        perRecipe = snapshot.linkCount / max(snapshot.recipeCount, 1)
+        if len(allowed) * perRecipe < postings:
+            rowIndptr, rowIndices = snapshot.recipeIndptr, snapshot.recipeIndices
+            for position in allowed:
+                row = rowIndices[rowIndptr[position] : rowIndptr[position + 1]]
+                score = sum(weights.get(j, 0) for j in row)
+                if score:
+                    matching[position] = score
+            return matching
+        allowed = set(allowed)
+
+    bits = exclusions.bits if exclusions is not None and allowed is None else None
+    for j, weight in weights.items():
+        for position in indices[indptr[j] : indptr[j + 1]]:
+            if allowed is not None and position not in allowed:
+                continue
+            if bits is not None and bits[position >> 3] >> (position & 7) & 1:
+                continue
+            matching[position] = matching.get(position, 0) + weight
+    return matching
+
+
+def _rankRecipes(
+    snapshot, matching: dict[int, int], limit: int, allowed=None, exclusions=None
+) -> list[int]:
+    """
+    Die ersten limit Positionen nach Rating absteigend; gleich gute behalten die
+    Katalogreihenfolge, Rezepte ohne Treffer (nur aus allowed, falls gesetzt, und
+    ohne ausgeschlossene) folgen danach.
+    """
+    indptr = snapshot.recipeIndptr
+    ratings = {p: m / (indptr[p + 1] - indptr[p]) for p, m in matching.items()}
+    ranked = sorted(ratings, key=lambda p: (-ratings[p], p))[:limit]
+    if len(ranked) < limit:
+        if allowed is not None:
+            pool = sorted(allowed)
+        elif exclusions is not None:
+            pool = (
+                p for p in range(snapshot.recipeCount) if not exclusions.excludes(p)
+            )
+        else:
+            pool = range(snapshot.recipeCount)
+        for position in pool:
+            if len(ranked) >= limit:
+                break
+            if position not in ratings:
+                ranked.append(position)
+    return ranked
+
+
+def _toRecipe(snapshot, position: int, matching: int) -> Recipe:
+    ingredients = []
+    for name, amount, unit in snapshot.recipeIngredients(position):
+        ing = Ingredient(name, amount)
+        ing.setAmountType(unit or None)
+        ingredients.append(ing)
+    recipe = Recipe(
+        snapshot.recipeNames[position], ingredients, snapshot.descriptions[position]
+    )
+    recipe.setId(snapshot.recipeIds[position])
+    recipe.setMatching(matching)
+    recipe.setDurationMinutes(snapshot.durationMinutes(position))
+    if ingredients:
+        recipe.setRating(matching / len(ingredients))
+    return recipe
@@ -0,0 +1,133 @@
+"""
+RecipeSimilarity.py – Ähnliche Rezepte über MinHash-Signaturen und LSH
+
+Offline-Job: Für jedes Rezept wird aus seinen Zutaten-IDs (Exists_from) eine
+MinHash-Signatur berechnet. Über LSH (Signatur in Bänder zerlegt, gleiche Bänder
+landen im selben Bucket) werden nur Rezepte verglichen, die sich wahrscheinlich
+ähneln; für diese Kandidaten wird die exakte Jaccard-Ähnlichkeit berechnet. Die
+besten TOP_K Nachbarn pro Rezept landen in RecipeSimilarity und werden von
+/recipes/{id}/similar ausgeliefert.
+
+Aufruf (aus project/backend), z.B. per Cron nach einem Import:
+    python -m services.RecipeSimilarity [--top-k 10] [--min-score 0.1]
+"""
+
+import argparse
+import heapq
+import logging
+import random
+import time
+from collections import defaultdict
+
+from core import Database
+from dao import SimilarityDAO
+
+logger = logging.getLogger(__name__)
+
+NUM_HASHES = 64
+BANDS = 32  # 2 Zeilen pro Band: Schwelle ungefähr (1/32)^(1/2) ≈ 0.18 Jaccard
+TOP_K = 10
+MIN_SCORE = 0.1
+# Buckets, in die sehr viele Rezepte fallen (z.B. nur "Salz" + "Pfeffer"), sagen
+# wenig aus und würden den Vergleich wieder quadratisch machen
+MAX_BUCKET_SIZE = 500
+
+_PRIME = (1 << 61) - 1
+
+
+def _hashParameters(count: int, seed: int) -> list[tuple[int, int]]:
+    rng = random.Random(seed)
+    return [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(count)]
+
+
+def minHash(ids: set[int], parameters: list[tuple[int, int]]) -> tuple[int, ...]:
+    return tuple(min((a * x + b) % _PRIME for x in ids) for a, b in parameters)
+
+
+def jaccard(a: set[int], b: set[int]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+def candidatePairs(
+    signatures: dict[int, tuple[int, ...]], bands: int = BANDS
+) -> set[tuple[int, int]]:
+    """Paare (kleinere ID zuerst), die in mindestens einem Band übereinstimmen."""
+    rows = len(next(iter(signatures.values()))) // bands if signatures else 0
+    pairs: set[tuple[int, int]] = set()
+    for band in range(bands):
+        buckets: dict[tuple[int, ...], list[int]] = defaultdict(list)
+        for rid, signature in signatures.items():
+            buckets[signature[band * rows : (band + 1) * rows]].append(rid)
+        for members in buckets.values():
+            if len(members) < 2 or len(members) > MAX_BUCKET_SIZE:
+                continue
+            members.sort()
+            for i, first in enumerate(members):
+                for second in members[i + 1 :]:
+                    pairs.add((first, second))
+    return pairs
+
+
+def computeNeighbors(
+    ingredientIds: dict[int, set[int]],
+    topK: int = TOP_K,
+    minScore: float = MIN_SCORE,
+    seed: int = 1,
+) -> dict[int, list[tuple[int, float]]]:
+    """Top-k Nachbarn pro Rezept als {rid: [(neighborId, jaccard), ...]}."""
+    parameters = _hashParameters(NUM_HASHES, seed)
+    signatures = {
+        rid: minHash(ids, parameters) for rid, ids in ingredientIds.items() if ids
+    }
+
+    heaps: dict[int, list[tuple[float, int]]] = defaultdict(list)
+
+    def offer(rid: int, neighborId: int, score: float) -> None:
+        heap = heaps[rid]
+        # Bei gleichem Score gewinnt die kleinere ID, daher -neighborId im Heap
+        entry = (score, -neighborId)
+        if len(heap) < topK:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    for first, second in candidatePairs(signatures):
+        score = jaccard(ingredientIds[first], ingredientIds[second])
+        if score < minScore:
+            continue
+        offer(first, second, score)
+        offer(second, first, score)
+
+    return {
+        rid: [(-negId, score) for score, negId in sorted(heap, reverse=True)]
+        for rid, heap in heaps.items()
+    }
+
+
+def rebuild(topK: int = TOP_K, minScore: float = MIN_SCORE) -> int:
+    """Berechnet alle Nachbarn neu und ersetzt die Tabelle. Gibt die Anzahl Zeilen zurück."""
+    start = time.perf_counter()
+    ingredientIds = SimilarityDAO.getIngredientIdsByRecipe()
+    neighbors = computeNeighbors(ingredientIds, topK, minScore)
+    count = SimilarityDAO.replaceNeighbors(neighbors)
+    logger.info(
+        "Ähnlichkeiten für %d Rezepte neu berechnet (%d Einträge, %.1f s)",
+        len(ingredientIds),
+        count,
+        time.perf_counter() - start,
+    )
+    return count
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Ähnliche Rezepte neu berechnen")
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--min-score", type=float, default=MIN_SCORE)
+    args = parser.parse_args(argv)
+    Database.initDB()
+    print(f"{rebuild(args.top_k, args.min_score)} Nachbarn gespeichert.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+ShoppingListService.py – Einkaufsliste über mehrere Rezepte
+
+Die Summen pro Zutat und Basiseinheit kommen aus einer einzigen GROUP-BY-Query
+und werden pro (Rezeptmenge, Portionen) in einem LRU-Cache gehalten. Vorräte des
+Users werden erst danach abgezogen, damit der Cache für alle User gilt.
+"""
+
+import threading
+from collections import OrderedDict
+
+from core import Catalogue
+from dao import RecipeDAO
+from domain.units import normalizeUnit
+
+MAX_RECIPES = 100
+CACHE_SIZE = 256
+
+_lock = threading.Lock()
+# (frozenset(recipeIds), servings) -> (items, missingRecipeIds)
+_cache: OrderedDict[tuple[frozenset[int], int], tuple[list[dict], list[int]]] = (
+    OrderedDict()
+)
+
+
+def _aggregate(
+    recipeIds: frozenset[int], servings: int
+) -> tuple[list[dict], list[int]]:
+    key = (recipeIds, servings)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    rids = sorted(recipeIds)
+    items = [
+        {**item, "amount": item["amount"] * servings}
+        for item in RecipeDAO.aggregateIngredients(rids)
+    ]
+    missing = sorted(recipeIds - RecipeDAO.getExistingRecipeIds(rids))
+    with _lock:
+        _cache[key] = (items, missing)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return items, missing
+
+
+def buildShoppingList(
+    recipeIds: list[int], servings: int, onHand: list[tuple[str, float, str]]
+) -> dict:
+    """
+    Einkaufsliste für die Rezepte. onHand enthält (Name, Menge, Einheit) der Vorräte;
+    sie werden bei gleichem Namen (ohne Groß/Klein) und gleicher Basiseinheit abgezogen.
+    """
+    items, missing = _aggregate(frozenset(recipeIds), servings)
+
+    available: dict[tuple[str, str], float] = {}
+    for name, amount, unit in onHand:
+        baseAmount, baseUnit = normalizeUnit(amount, unit)
+        key = (name.strip().lower(), baseUnit)
+        available[key] = available.get(key, 0.0) + baseAmount
+
+    result = []
+    for item in items:
+        amount = item["amount"] - available.get(
+            (item["name"].lower(), item["unit"]), 0.0
+        )
+        if amount > 0:
+            result.append({**item, "amount": round(amount, 2)})
+    return {"items": result, "missingRecipeIds": missing}
+
+
+def invalidate() -> None:
+    """Leert den Cache, z.B. nach Änderungen an Rezepten."""
+    with _lock:
+        _cache.clear()
+
+
+Catalogue.onChange(invalidate)
@@ -0,0 +1,112 @@
+import sys
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core.Auth import createAccessToken
+from core.Pagination import encodeCursor
+from dao.AccountDAO import createAccount
+from dao.AuthorDAO import (
+    addAuthor,
+    getOrCreateAuthor,
+    getAuthor,
+    countRecipesByAuthor,
+    getRecipesByAuthor,
+)
+from dao.RecipeDAO import addRecipe
+from services import AuthorService
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+    AuthorService.invalidateRecipeCounts()
+
+
+@pytest.fixture
+def client():
+    from LazyCookAdministration import app
+
+    createAccount("autor@example.com", "Leser", "hashedPW")
+    token = createAccessToken({"sub": "autor@example.com"})
+    return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+
+class TestAuthorDAO:
+    def testAutorAnlegen(self):
+        vid = addAuthor("Anna")
+        assert getAuthor(vid)["name"] == "Anna"
+
+    def testDoppelterName(self):
+        addAuthor("Anna")
+        assert addAuthor("Anna") is None
+
+    def testGetOrCreateIstIdempotent(self):
+        assert getOrCreateAuthor("Ben") == getOrCreateAuthor("Ben")
+
+    def testRezeptMitAutor(self):
+        vid = addAuthor("Anna")
+        addRecipe("Pasta", "", vid)
+        addRecipe("Pizza", "")
+        assert countRecipesByAuthor(vid) == 1
+
+    def testKeysetNachNameUndId(self):
+        vid = addAuthor("Anna")
+        for name in ["C", "A", "B"]:
+            addRecipe(name, "", vid)
+        first = getRecipesByAuthor(vid, None, 2)
+        assert [r["name"] for r in first] == ["A", "B"]
+        last = first[-1]
+        rest = getRecipesByAuthor(vid, (last["name"], last["id"]), 2)
+        assert [r["name"] for r in rest] == ["C"]
+
+
+class TestAuthorService:
+    def testAnzahlWirdGecacht(self):
+        vid = addAuthor("Anna")
+        addRecipe("A", "", vid)
+        assert AuthorService.getRecipeCount(vid) == 1
+        addRecipe("B", "", vid)
+        assert AuthorService.getRecipeCount(vid) == 1
+        AuthorService.invalidateRecipeCounts(vid)
+        assert AuthorService.getRecipeCount(vid) == 2
+
+
+class TestAuthorRoutes:
+    def testAutorSeite(self, client):
+        vid = addAuthor("Anna")
+        addRecipe("A", "", vid)
+        body = client.get(f"/authors/{vid}").json()
+        assert body == {"id": vid, "name": "Anna", "recipeCount": 1}
+
+    def testUnbekannterAutor(self, client):
+        assert client.get("/authors/999").status_code == 404
+        assert client.get("/authors/999/recipes").status_code == 404
+
+    def testRezepteSeitenweise(self, client):
+        vid = addAuthor("Anna")
+        for i in range(3):
+            addRecipe(f"Rezept{i}", "", vid)
+        page = client.get(f"/authors/{vid}/recipes", params={"limit": 2}).json()
+        assert [r["name"] for r in page["recipes"]] == ["Rezept0", "Rezept1"]
+        rest = client.get(
+            f"/authors/{vid}/recipes", params={"cursor": page["nextCursor"]}
+        ).json()
+        assert [r["name"] for r in rest["recipes"]] == ["Rezept2"]
+        assert rest["nextCursor"] is None
+
+    @pytest.mark.parametrize(
+        "values",
+        [[["A"], 1], [{"a": 1}, 2], ["A", "1"], ["A"], ["A", 2**63], ["A", True]],
+    )
+    def testCursorMitFalschenTypen400(self, client, values):
+        vid = addAuthor("Anna")
+        response = client.get(
+            f"/authors/{vid}/recipes", params={"cursor": encodeCursor(values)}
+        )
+        assert response.status_code == 400
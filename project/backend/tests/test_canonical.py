@@ -0,0 +1,222 @@
+import sys
+import os
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core import CatalogueSnapshot
+from dao.IngredientDAO import addIngredient, getIngredientByName
+from dao.RecipeDAO import (
+    addRecipe,
+    addIngredientToRecipe,
+    aggregateIngredients,
+    getAllIngredientsForRecipe,
+)
+from domain.canonical import canonicalName
+from domain.ingredient import Ingredient
+from services.RecipeSUCUK import findRecipes
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+
+
+class TestCanonicalName:
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            ("Blatt gefrorener Blätterteig aufgetaut aber noch kalt", "Blätterteig"),
+            ("Eiweiß leicht geschlagen", "Eiweiß"),
+            ("gehackte rote Zwiebeln", "Zwiebel"),
+            ("reife Avocado – geschält entkernt und gehackt", "Avocado"),
+            ("Olivenöl oder nach Bedarf geteilt", "Olivenöl"),
+            ("geschälte und in Scheiben geschnittene Äpfel", "Apfel"),
+            ("Prise Knoblauchpulver", "Knoblauchpulver"),
+            ("2 Dosen Kichererbsen abgetropft", "Kichererbse"),
+        ],
+    )
+    def testZubereitungFaelltWeg(self, raw, expected):
+        assert canonicalName(raw) == expected
+
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            ("Tomaten", "Tomate"),
+            ("Mandeln", "Mandel"),
+            ("Eier", "Ei"),
+            ("Portobello-Pilze", "Portobello-Pilz"),
+            ("Pinienkerne", "Pinienkern"),
+            ("Kirschen", "Kirsche"),
+            ("Mangos", "Mango"),
+        ],
+    )
+    def testSingular(self, raw, expected):
+        assert canonicalName(raw) == expected
+
+    def testAusnahmenBleiben(self):
+        for name in ("Nudeln", "Brötchen", "Kochschinken", "Sesamsamen"):
+            assert canonicalName(name) == name
+
+    def testSynonyme(self):
+        assert canonicalName("Allzweckmehl oder nach Bedarf") == "Mehl"
+        assert canonicalName("Knoblauchzehen gehackt") == "Knoblauch"
+        assert canonicalName("Jalapenopfeffer grob gehackt") == "Jalapeño"
+
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            ("Prise Paprika", "Paprikapulver"),
+            ("Paprika edelsüß", "Paprikapulver"),
+            ("geräuchertes Paprikapulver", "Paprikapulver"),
+            ("rote Paprika gewürfelt", "Paprika"),
+            ("Paprika", "Paprika"),
+        ],
+    )
+    def testGewuerzNichtGemuese(self, raw, expected):
+        assert canonicalName(raw) == expected
+
+    def testKleinschreibung(self):
+        assert canonicalName("tomaten") == "Tomate"
+        assert canonicalName("rote zwiebeln") == "rote zwiebel"
+
+    def testIdempotent(self):
+        for raw in ("geröstete Pinienkerne", "dünne Scheiben Prosciutto fein gehackt"):
+            name = canonicalName(raw)
+            assert canonicalName(name) == name
+
+
+class TestIngredientDAO:
+    def testRohnamenLandenBeiDerselbenZutat(self):
+        zid = addIngredient("Tomaten gewürfelt", "g")
+        assert addIngredient("Tomate", "Stück") == zid
+        assert getIngredientByName("Tomate") == {"id": zid, "amountType": "g"}
+        assert getIngredientByName("Tomaten gewürfelt")["id"] == zid
+        assert getIngredientByName("reife Tomaten")["id"] == zid
+
+    def testGewuerzUndGemueseGetrennt(self):
+        gemuese = addIngredient("rote Paprika gewürfelt", "Stück")
+        gewuerz = addIngredient("Prise Paprika", "g")
+        assert gemuese != gewuerz
+        assert getIngredientByName("Paprika")["id"] == gemuese
+        assert getIngredientByName("Prise Paprika")["id"] == gewuerz
+
+    def testEinheitProVerknuepfung(self):
+        zid = addIngredient("Äpfel", "Stück")
+        rid = addRecipe("Apfelkuchen", "")
+        assert addIngredientToRecipe(rid, zid, 3)
+        assert addIngredientToRecipe(rid, zid, 200, "g")
+        assert not addIngredientToRecipe(rid, zid, 1)
+        rows = sorted(getAllIngredientsForRecipe(rid), key=lambda r: r["amountType"])
+        assert [(r["name"], r["amount"], r["amountType"]) for r in rows] == [
+            ("Apfel", 3, "Stück"),
+            ("Apfel", 200, "g"),
+        ]
+        units = {r["unit"] for r in aggregateIngredients([rid])}
+        assert units == {"g", "Stück"}
+
+
+class TestMigration:
+    def _oldDatabase(self, path):
+        con = sqlite3.connect(path)
+        con.executescript("""
+            CREATE TABLE Ingredient (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                amountType VARCHAR(30) NOT NULL
+            );
+            CREATE TABLE Recipe (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                description nvarchar(20000),
+                vid INTEGER
+            );
+            CREATE TABLE Exists_from (
+                zid INTEGER NOT NULL,
+                rid INTEGER NOT NULL,
+                amount DECIMAL(10,2) NOT NULL,
+                UNIQUE (zid, rid)
+            );
+            INSERT INTO Ingredient (id, name, amountType) VALUES
+                (1, 'Tomaten gewürfelt', 'g'),
+                (2, 'Tomate', 'Stück'),
+                (3, 'reife Tomaten', 'Stück'),
+                (4, 'Salz', 'g');
+            INSERT INTO Recipe (id, name, description) VALUES
+                (1, 'Salat', ''), (2, 'Soße', '');
+            INSERT INTO Exists_from (zid, rid, amount) VALUES
+                (2, 1, 2), (3, 1, 1), (4, 1, 5), (1, 2, 400), (3, 2, 2);
+        """)
+        con.close()
+
+    def testZutatenWerdenZusammengefuehrt(self, tmp_path, monkeypatch):
+        path = tmp_path / "alt.db"
+        self._oldDatabase(path)
+        monkeypatch.setattr(Database, "DB_PATH", path)
+        Database.initDB()
+
+        con = sqlite3.connect(path)
+        try:
+            assert con.execute(
+                "SELECT id, name, amountType FROM Ingredient ORDER BY id"
+            ).fetchall() == [(2, "Tomate", "Stück"), (4, "Salz", "g")]
+            assert con.execute(
+                "SELECT zid, rid, amount, amountType FROM Exists_from ORDER BY rid, zid, amountType"
+            ).fetchall() == [
+                (2, 1, 3, "Stück"),
+                (4, 1, 5, "g"),
+                (2, 2, 2, "Stück"),
+                (2, 2, 400, "g"),
+            ]
+            assert dict(con.execute("SELECT name, zid FROM IngredientAlias")) == {
+                "Tomaten gewürfelt": 2,
+                "Tomate": 2,
+                "reife Tomaten": 2,
+                "Salz": 4,
+            }
+            assert con.execute("PRAGMA foreign_key_check").fetchall() == []
+        finally:
+            con.close()
+
+        # Zweiter Start ändert nichts mehr
+        version = Database.getCatalogueVersion()
+        Database.initDB()
+        assert Database.getCatalogueVersion() == version
+
+
+class TestSuche:
+    def testPluralFindetKanonischeZutat(self):
+        tomate = addIngredient("Tomaten", "g")
+        rid = addRecipe("Tomatensalat", "")
+        addIngredientToRecipe(rid, tomate, 300)
+        for query in ("Tomaten", "reife Tomaten", "tomaten"):
+            names = [r.getName() for r in findRecipes([Ingredient(query, 1)], 0)]
+            assert names == ["Tomatensalat"]
+
+    def testSnapshotMerktTreffer(self):
+        rows = [
+            {
+                "id": 1,
+                "name": "A",
+                "description": "",
+                "ingredients": [
+                    {"name": "Tomate", "amount": 2, "amountType": "Stück"},
+                    {"name": "Tomatenmark", "amount": 50, "amountType": "g"},
+                ],
+            }
+        ]
+        snapshot = CatalogueSnapshot.CatalogueSnapshot(
+            CatalogueSnapshot.buildSnapshot(rows, 1)
+        )
+        assert snapshot.matchingIngredients("Tomate") == (0, 1)
+        assert snapshot.matchingIngredients("Tomate") is snapshot.matchingIngredients(
+            "Tomate"
+        )
+        assert snapshot.recipeIngredients(0) == [
+            ("Tomate", 2, "Stück"),
+            ("Tomatenmark", 50, "g"),
+        ]
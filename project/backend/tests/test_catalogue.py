@@ -0,0 +1,141 @@
+import sys
+import os
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core import Catalogue
+from dao.IngredientDAO import addIngredient
+from dao.RecipeDAO import addRecipe, addIngredientToRecipe
+from domain.ingredient import Ingredient
+from services import ShoppingListService
+from services.RecipeSUCUK import findRecipes
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+    # In Tests registrierte Strukturen nicht global zurücklassen
+    monkeypatch.setattr(Catalogue, "_holders", list(Catalogue._holders))
+
+
+@pytest.fixture
+def holder():
+    calls = []
+
+    def build():
+        calls.append(Database.getCatalogueVersion())
+        return list(calls)
+
+    holder = Catalogue.register("test", build)
+    holder.calls = calls
+    return holder
+
+
+class TestCatalogueVersion:
+    def testSchreibpfadeErhoehenVersion(self):
+        start = Database.getCatalogueVersion()
+        rid = addRecipe("Pasta", "")
+        zid = addIngredient("Nudeln", "g")
+        addIngredientToRecipe(rid, zid, 100)
+        assert Database.getCatalogueVersion() == start + 3
+
+    def testFehlgeschlagenerSchreibvorgangZaehltNicht(self):
+        rid = addRecipe("Pasta", "")
+        zid = addIngredient("Nudeln", "g")
+        addIngredientToRecipe(rid, zid, 100)
+        version = Database.getCatalogueVersion()
+        assert addIngredientToRecipe(rid, zid, 100) is False
+        assert Database.getCatalogueVersion() == version
+
+
+class TestCatalogueHolder:
+    def testBautNurEinmal(self, holder):
+        assert holder.get() is holder.get()
+        assert len(holder.calls) == 1
+
+    def testRefreshOhneAenderungBautNichtNeu(self, holder):
+        holder.get()
+        Catalogue.refresh()
+        assert Catalogue.refresh() is False
+        assert len(holder.calls) == 1
+
+    def testRefreshNachAenderungTauschtAus(self, holder):
+        holder.get()
+        Catalogue.refresh()
+        old = holder.get()
+        addRecipe("Pasta", "")
+        assert Catalogue.refresh() is True
+        assert holder.get() is not old
+        assert len(holder.calls) == 2
+
+    def testNichtGebauteStrukturBleibtLazy(self, holder):
+        Catalogue.refresh()
+        addRecipe("Pasta", "")
+        Catalogue.refresh()
+        assert holder.calls == []
+
+    def testAbgelaufeneStrukturWirdNeuGebaut(self):
+        holder = Catalogue.register("ttl", lambda: object(), maxAgeSeconds=0)
+        old = holder.get()
+        Catalogue.refresh()
+        assert holder.get() is not old
+
+    def testFehlerBehaeltAltenStand(self):
+        state = {"fail": False}
+
+        def build():
+            if state["fail"]:
+                raise RuntimeError("kaputt")
+            return "alt"
+
+        holder = Catalogue.register("fehler", build)
+        holder.get()
+        Catalogue.refresh()
+        state["fail"] = True
+        addRecipe("Pasta", "")
+        Catalogue.refresh()
+        assert holder.get() == "alt"
+
+
+class TestHotReload:
+    def testSucheSiehtNeueRezepteNachRefresh(self):
+        Catalogue.refresh()
+        assert findRecipes([Ingredient("Reis", 1)], 0) == []
+
+        rid = addRecipe("Reispfanne", "")
+        addIngredientToRecipe(rid, addIngredient("Reis", "g"), 100)
+        assert findRecipes([Ingredient("Reis", 1)], 0) == []
+
+        Catalogue.refresh()
+        assert [r.getName() for r in findRecipes([Ingredient("Reis", 1)], 0)] == [
+            "Reispfanne"
+        ]
+
+    def testAenderungLeertCaches(self):
+        rid = addRecipe("Reispfanne", "")
+        addIngredientToRecipe(rid, addIngredient("Reis", "g"), 100)
+        Catalogue.refresh()
+        assert ShoppingListService.buildShoppingList([rid], 1, [])["items"]
+
+        addIngredientToRecipe(rid, addIngredient("Salz", "g"), 5)
+        Catalogue.refresh()
+        items = ShoppingListService.buildShoppingList([rid], 1, [])["items"]
+        assert {i["name"] for i in items} == {"Reis", "Salz"}
+
+    def testPollerImHintergrund(self, holder, monkeypatch):
+        monkeypatch.setattr(Catalogue, "CATALOGUE_POLL_SECONDS", 0.01)
+        holder.get()
+        Catalogue.startPolling()
+        try:
+            addRecipe("Pasta", "")
+            deadline = time.monotonic() + 2
+            while len(holder.calls) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            Catalogue.stopPolling()
+        assert len(holder.calls) == 2
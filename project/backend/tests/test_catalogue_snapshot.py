@@ -0,0 +1,125 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core import CatalogueSnapshot
+from dao.IngredientDAO import addIngredient
+from dao.RecipeDAO import addRecipe, addIngredientToRecipe
+from domain.ingredient import Ingredient
+from services.RecipeSUCUK import findRecipes
+
+ROWS = [
+    {
+        "id": 3,
+        "name": "Käsespätzle",
+        "description": "Allgäuer Art",
+        "ingredients": [
+            {"name": "Spätzle", "amount": 500, "amountType": "g"},
+            {"name": "Bergkäse", "amount": 200, "amountType": "g"},
+            {"name": "Zwiebel", "amount": 2, "amountType": "Stück"},
+        ],
+    },
+    {"id": 5, "name": "Leer", "description": None, "ingredients": []},
+    {
+        "id": 9,
+        "name": "Zwiebelsuppe",
+        "description": "",
+        "ingredients": [
+            {"name": "Zwiebel", "amount": 0.5, "amountType": "Stück"},
+            {"name": "Brühe", "amount": 1, "amountType": "l"},
+        ],
+    },
+]
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+
+
+@pytest.fixture
+def snapshotPath(tmp_path, monkeypatch):
+    path = tmp_path / "snapshot" / "catalogue.bin"
+    monkeypatch.setattr(CatalogueSnapshot, "CATALOGUE_SNAPSHOT_PATH", path)
+    return path
+
+
+class TestFormat:
+    def testRundreise(self):
+        snapshot = CatalogueSnapshot.CatalogueSnapshot(
+            CatalogueSnapshot.buildSnapshot(ROWS, 7)
+        )
+        assert snapshot.version == 7
+        assert snapshot.recipeCount == 3
+        assert list(snapshot.recipeIds) == [3, 5, 9]
+        assert snapshot.recipeNames[0] == "Käsespätzle"
+        assert snapshot.descriptions[1] == ""
+        assert snapshot.vocabulary == ["Spätzle", "Bergkäse", "Zwiebel", "Brühe"]
+        assert snapshot.recipeIngredients(1) == []
+        assert snapshot.recipeIngredients(2) == [
+            ("Zwiebel", 0.5, "Stück"),
+            ("Brühe", 1, "l"),
+        ]
+
+    def testTransponierteAdjazenz(self):
+        snapshot = CatalogueSnapshot.CatalogueSnapshot(
+            CatalogueSnapshot.buildSnapshot(ROWS, 1)
+        )
+        zwiebel = snapshot.vocabulary.index("Zwiebel")
+        start, end = (
+            snapshot.ingredientIndptr[zwiebel],
+            snapshot.ingredientIndptr[zwiebel + 1],
+        )
+        assert list(snapshot.ingredientIndices[start:end]) == [0, 2]
+
+    def testAbschnitteSindAusgerichtet(self):
+        data = CatalogueSnapshot.buildSnapshot(ROWS, 1)
+        for i in range(len(CatalogueSnapshot._SECTIONS)):
+            offset, _ = CatalogueSnapshot._SECTION.unpack_from(
+                data,
+                CatalogueSnapshot._HEADER.size + i * CatalogueSnapshot._SECTION.size,
+            )
+            assert offset % 8 == 0
+
+    def testFremdeDateiWirdAbgelehnt(self):
+        with pytest.raises(ValueError):
+            CatalogueSnapshot.CatalogueSnapshot(b"\0" * 512)
+
+
+class TestDatei:
+    def testWirdNurEinmalGeschrieben(self, snapshotPath):
+        calls = []
+
+        def loadRows():
+            calls.append(1)
+            return ROWS
+
+        first = CatalogueSnapshot.load(loadRows, lambda: 4)
+        second = CatalogueSnapshot.load(loadRows, lambda: 4)
+        assert len(calls) == 1
+        assert CatalogueSnapshot.readVersion(snapshotPath) == 4
+        assert first.vocabulary == second.vocabulary
+
+    def testNeueVersionWirdNeuEingeblendet(self, snapshotPath):
+        old = CatalogueSnapshot.load(lambda: ROWS[:1], lambda: 1)
+        new = CatalogueSnapshot.load(lambda: ROWS, lambda: 2)
+        assert (old.version, old.recipeCount) == (1, 1)
+        assert (new.version, new.recipeCount) == (2, 3)
+        # Das alte Mapping bleibt für laufende Requests lesbar
+        assert old.recipeNames[0] == "Käsespätzle"
+
+    def testSucheNutztDatei(self, snapshotPath):
+        rid = addRecipe("Zwiebelkuchen", "")
+        addIngredientToRecipe(rid, addIngredient("Zwiebel", "g"), 300)
+        assert [r.getName() for r in findRecipes([Ingredient("Zwiebel", 1)], 0)] == [
+            "Zwiebelkuchen"
+        ]
+        assert (
+            CatalogueSnapshot.readVersion(snapshotPath)
+            == Database.getCatalogueVersion()
+        )
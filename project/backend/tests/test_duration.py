@@ -0,0 +1,203 @@
+import sys
+import os
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+import services.RecipeSUCUK as RecipeSUCUK
+from core import CatalogueSnapshot
+from core.Auth import createAccessToken
+from dao.AccountDAO import createAccount
+from dao.IngredientDAO import addIngredient
+from dao.RecipeDAO import addRecipe, addIngredientToRecipe, getAllRecipesWithIngredients
+from domain.duration import estimateMinutes, formatDuration
+from domain.ingredient import Ingredient
+from services import RecipeDuration
+from services.RecipeSUCUK import findRecipes
+
+TOMATE = [Ingredient("Tomate", 1)]
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+
+
+@pytest.fixture
+def catalogue():
+    tomate = addIngredient("Tomate", "g")
+    nudeln = addIngredient("Nudeln", "g")
+    ids = {}
+    for name, description, ingredients in [
+        ("Tomatensalat", "Schneiden, etwa 5 Minuten ziehen lassen.", [tomate]),
+        ("Tomatensoße", "1 Stunde köcheln, dann 30 Minuten länger.", [tomate]),
+        ("Nudeln", "8 bis 10 Minuten kochen.", [nudeln]),
+        ("Tomatenbrot", "Belegen und servieren.", [tomate]),
+    ]:
+        ids[name] = addRecipe(name, description)
+        for zid in ingredients:
+            addIngredientToRecipe(ids[name], zid, 100)
+    return ids
+
+
+class TestEstimateMinutes:
+    def testEinzelneAngabe(self):
+        assert estimateMinutes("abdecken und kochen, etwa 5 Minuten") == 5
+
+    def testAngabenWerdenAddiert(self):
+        text = "etwa 5 Minuten kochen. Weiterkochen, etwa 5 Minuten länger."
+        assert estimateMinutes(text) == 10
+
+    def testSpanneZaehltObergrenze(self):
+        assert estimateMinutes("25 bis 30 Minuten backen") == 30
+        assert estimateMinutes("3-5 Min. köcheln") == 5
+
+    def testStundenUndZahlwoerter(self):
+        assert estimateMinutes("1 Stunde 30 Minuten garen") == 90
+        assert estimateMinutes("eine halbe Stunde ruhen lassen") == 30
+        assert estimateMinutes("ca. 1,5 Std. im Ofen") == 90
+
+    def testSekundenRundenAuf(self):
+        assert estimateMinutes("30 Sekunden pürieren") == 1
+
+    def testTageUndTemperaturZaehlenNicht(self):
+        text = "Ofen auf 200 Grad vorheizen. Bis zu 5 Tage gekühlt haltbar."
+        assert estimateMinutes(text) is None
+
+    def testOhneBeschreibung(self):
+        assert estimateMinutes(None) is None
+        assert estimateMinutes("") is None
+
+    def testAnzeige(self):
+        assert formatDuration(None) == ""
+        assert formatDuration(45) == "ca. 45 Min."
+        assert formatDuration(60) == "ca. 1 Std."
+        assert formatDuration(75) == "ca. 1 Std. 15 Min."
+
+
+class TestSpeichern:
+    def testAddRecipeSchaetztDauer(self, catalogue):
+        rows = {r["name"]: r for r in getAllRecipesWithIngredients()}
+        assert rows["Tomatensoße"]["durationMinutes"] == 90
+        assert rows["Tomatenbrot"]["durationMinutes"] is None
+
+    def testMigrationBefuelltAlteDatenbank(self, tmp_path, monkeypatch):
+        path = tmp_path / "alt.db"
+        con = sqlite3.connect(path)
+        con.execute("""
+            CREATE TABLE Recipe (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                description nvarchar(20000),
+                vid INTEGER
+            )
+        """)
+        con.execute(
+            "INSERT INTO Recipe (name, description) VALUES ('Alt', 'etwa 20 Minuten')"
+        )
+        con.commit()
+        con.close()
+
+        monkeypatch.setattr(Database, "DB_PATH", path)
+        Database.initDB()
+        con = sqlite3.connect(path)
+        try:
+            assert con.execute("SELECT durationMinutes FROM Recipe").fetchone() == (20,)
+            indexes = {row[1] for row in con.execute("PRAGMA index_list(Recipe)")}
+            assert "idx_recipe_duration" in indexes
+        finally:
+            con.close()
+
+    def testNeuberechnung(self, catalogue):
+        con = Database.getConnection()
+        con.execute("UPDATE Recipe SET durationMinutes = NULL")
+        con.commit()
+        con.close()
+        assert RecipeDuration.rebuild() == 3
+        rows = {r["name"]: r for r in getAllRecipesWithIngredients()}
+        assert rows["Nudeln"]["durationMinutes"] == 10
+
+
+class TestSnapshotIndex:
+    ROWS = [
+        {"id": 1, "name": "A", "description": "", "durationMinutes": 40},
+        {"id": 2, "name": "B", "description": "", "durationMinutes": None},
+        {"id": 3, "name": "C", "description": "", "durationMinutes": 10},
+        {"id": 4, "name": "D", "description": "", "durationMinutes": 40},
+    ]
+
+    def _snapshot(self):
+        rows = [{**r, "ingredients": []} for r in self.ROWS]
+        return CatalogueSnapshot.CatalogueSnapshot(
+            CatalogueSnapshot.buildSnapshot(rows, 1)
+        )
+
+    def testPositionenNachDauer(self):
+        snapshot = self._snapshot()
+        assert list(snapshot.positionsWithin(9)) == []
+        assert list(snapshot.positionsWithin(10)) == [2]
+        assert list(snapshot.positionsWithin(40)) == [2, 0, 3]
+
+    def testOhneSchaetzungNieImFilter(self):
+        snapshot = self._snapshot()
+        assert 1 not in snapshot.positionsWithin(10**6)
+        assert snapshot.durationMinutes(1) is None
+        assert snapshot.durationMinutes(0) == 40
+
+
+class TestSuche:
+    def testFilterVorDemRanking(self, catalogue):
+        names = [r.getName() for r in findRecipes(TOMATE, 0, maxDuration=30)]
+        assert names == ["Tomatensalat", "Nudeln"]
+
+    def testOhneFilterAlleRezepte(self, catalogue):
+        assert len(findRecipes(TOMATE, 0)) == 4
+
+    def testBewertetNurZugelasseneRezepte(self, catalogue):
+        snapshot = RecipeSUCUK._catalogue.get()
+        allowed = snapshot.positionsWithin(30)
+        matching = RecipeSUCUK._scoreRecipes(snapshot, TOMATE, allowed)
+        assert set(matching) <= set(allowed)
+        assert matching == {
+            p: 1 for p in allowed if snapshot.recipeNames[p] == "Tomatensalat"
+        }
+
+    def testRezeptTraegtDauer(self, catalogue):
+        recipe = findRecipes(TOMATE, 0, maxDuration=5)[0]
+        assert recipe.getDurationMinutes() == 5
+        assert recipe.getDuration() == "ca. 5 Min."
+
+
+class TestRoute:
+    @pytest.fixture
+    def client(self, catalogue):
+        from LazyCookAdministration import app
+
+        account = createAccount("dauer@example.com", "Dauer", "hashedPW")
+        token = createAccessToken({"sub": account["email"]})
+        return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+    def testMaxDuration(self, client):
+        response = client.post(
+            "/recipes/search",
+            json={
+                "zutaten": [{"name": "Tomate", "amount": 1, "unit": "g"}],
+                "maxDuration": 10,
+            },
+        )
+        assert response.status_code == 200
+        recipes = response.json()["rezepte"]
+        assert [r["name"] for r in recipes] == ["Tomatensalat", "Nudeln"]
+        assert recipes[0]["durationMinutes"] == 5
+        assert recipes[0]["duration"] == "ca. 5 Min."
+
+    def testUngueltigeMaxDuration(self, client):
+        response = client.post(
+            "/recipes/search", json={"zutaten": [], "maxDuration": 0}
+        )
+        assert response.status_code == 400
@@ -0,0 +1,75 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import services.EmailService as email_service_module
+from services.EmailTemplates import CompiledTemplate, renderEmail, loadTemplates
+
+
+class TestCompiledTemplate:
+    def testPlatzhalterErsetzen(self):
+        template = CompiledTemplate("Hallo {{ name }}!", escape=False)
+        assert template.render({"name": "Anna"}) == "Hallo Anna!"
+
+    def testHtmlWirdEscaped(self):
+        template = CompiledTemplate("<h2>{{name}}</h2>", escape=True)
+        assert template.render({"name": "<b>&"}) == "<h2>&lt;b&gt;&amp;</h2>"
+
+    def testTextWirdNichtEscaped(self):
+        template = CompiledTemplate("{{ name }}", escape=False)
+        assert template.render({"name": "<b>"}) == "<b>"
+
+    def testFehlendeVariable(self):
+        template = CompiledTemplate("{{ name }} {{ link }}", escape=False)
+        with pytest.raises(KeyError):
+            template.render({"name": "Anna"})
+
+    def testTemplateOhnePlatzhalter(self):
+        template = CompiledTemplate("Statisch", escape=True)
+        assert template.getFields() == ()
+        assert template.render({}) == "Statisch"
+
+
+class TestEmailTemplates:
+    def testAlleTemplatesGeladen(self):
+        templates = loadTemplates()
+        assert "passwordChanged" in templates
+        assert "passwordReset" in templates
+
+    def testResetMailEnthaeltLink(self):
+        text, html = renderEmail(
+            "passwordReset", name="Anna", resetLink="http://x/?a=1&b=2", validMinutes=30
+        )
+        assert "http://x/?a=1&b=2" in text
+        assert "http://x/?a=1&amp;b=2" in html
+
+    def testNameWirdImHtmlEscaped(self):
+        _, html = renderEmail("passwordChanged", name="<script>")
+        assert "<script>" not in html
+        assert "&lt;script&gt;" in html
+
+
+class TestBulkEmail:
+    def testEineVerbindungFuerAlleEmpfaenger(self):
+        recipients = [
+            {"email": "a@example.com", "name": "A"},
+            {"email": "b@example.com", "name": "B"},
+        ]
+        with patch.object(email_service_module, "_sendMails") as mockSend:
+            sent = email_service_module.sendBulkEmail(
+                "passwordChanged", "Betreff", recipients
+            )
+        assert sent == 2
+        mockSend.assert_called_once()
+        assert [to for to, _ in mockSend.call_args[0][0]] == [
+            "a@example.com",
+            "b@example.com",
+        ]
+
+    def testKeineEmpfaenger(self):
+        with patch.object(email_service_module, "_sendMails") as mockSend:
+            assert email_service_module.sendBulkEmail("passwordChanged", "B", []) == 0
+        mockSend.assert_not_called()
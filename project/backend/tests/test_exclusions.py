@@ -0,0 +1,203 @@
+import sys
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+import services.RecipeSUCUK as RecipeSUCUK
+from core.Auth import createAccessToken
+from dao import ExclusionDAO, ExportDAO
+from dao.AccountDAO import createAccount, deleteAccount
+from dao.IngredientDAO import addIngredient
+from dao.RecipeDAO import addRecipe, addIngredientToRecipe
+from domain.ingredient import Ingredient
+from services import Exclusions
+from services.RecipeSUCUK import findRecipes
+
+SEARCH = [Ingredient("Mehl", 1)]
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+    Exclusions.clearCache()
+
+
+@pytest.fixture
+def account():
+    return createAccount("allergie@example.com", "Allergie", "hashedPW")
+
+
+@pytest.fixture
+def catalogue():
+    ids = {name: addIngredient(name, "g") for name in ("Mehl", "Haselnuss", "Zucker")}
+    recipes = {}
+    for name, description, ingredients in [
+        ("Nusskuchen", "40 Minuten backen.", ["Mehl", "Haselnuss", "Zucker"]),
+        ("Rührkuchen", "50 Minuten backen.", ["Mehl", "Zucker"]),
+        ("Krokant", "10 Minuten rösten.", ["Haselnuss", "Zucker"]),
+        ("Brot", "60 Minuten backen.", ["Mehl"]),
+    ]:
+        recipes[name] = addRecipe(name, description)
+        for ingredient in ingredients:
+            addIngredientToRecipe(recipes[name], ids[ingredient], 100)
+    return recipes
+
+
+@pytest.fixture
+def client(account):
+    from LazyCookAdministration import app
+
+    token = createAccessToken({"sub": account["email"]})
+    return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+
+class TestExclusionDAO:
+    def testNormalisiertUndIgnoriertDuplikate(self, account):
+        ExclusionDAO.addExclusion(account["id"], " Haselnuss ")
+        ExclusionDAO.addExclusion(account["id"], "haselnuss")
+        assert ExclusionDAO.getExclusions(account["id"]) == [
+            {"name": "haselnuss", "displayName": "Haselnuss"}
+        ]
+
+    def testErsetzenUndEntfernen(self, account):
+        ExclusionDAO.replaceExclusions(account["id"], ["Erdnuss", "Schwein"])
+        ExclusionDAO.replaceExclusions(account["id"], ["Schwein", "Gluten"])
+        assert [r["name"] for r in ExclusionDAO.getExclusions(account["id"])] == [
+            "gluten",
+            "schwein",
+        ]
+        assert ExclusionDAO.removeExclusion(account["id"], "SCHWEIN")
+        assert not ExclusionDAO.removeExclusion(account["id"], "schwein")
+
+    def testWirdMitAccountGeloescht(self, account):
+        ExclusionDAO.addExclusion(account["id"], "Erdnuss")
+        deleteAccount(account["email"])
+        assert ExclusionDAO.getExclusions(account["id"]) == []
+
+    def testImDatenexport(self, account):
+        ExclusionDAO.addExclusion(account["id"], "Erdnuss")
+        records = list(ExportDAO.iterAccountData(account["id"]))
+        assert records[-1]["section"] == "exclusion"
+        assert records[-1]["ingredient"] == "Erdnuss"
+
+
+class TestExclusionFilter:
+    def testBitmapUeberRezepte(self, catalogue):
+        snapshot = RecipeSUCUK._catalogue.get()
+        compiled = Exclusions.ExclusionFilter(snapshot, ("nuss",))
+        excluded = {
+            snapshot.recipeNames[p]
+            for p in range(snapshot.recipeCount)
+            if compiled.excludes(p)
+        }
+        assert excluded == {"Nusskuchen", "Krokant"}
+        assert [snapshot.vocabulary[j] for j in compiled.ingredients] == ["Haselnuss"]
+
+    def testNurGanzeZutatennamen(self):
+        ids = {
+            name: addIngredient(name, "g")
+            for name in ("Ei", "Arborio-Reis", "Salbei", "Walnuss", "Muskatnuss")
+        }
+        for name, ingredients in [
+            ("Risotto", ["Arborio-Reis", "Salbei", "Muskatnuss"]),
+            ("Omelett", ["Ei"]),
+            ("Walnussbrot", ["Walnuss"]),
+        ]:
+            rid = addRecipe(name, "")
+            for ingredient in ingredients:
+                addIngredientToRecipe(rid, ids[ingredient], 100)
+        snapshot = RecipeSUCUK._catalogue.get()
+        compiled = Exclusions.ExclusionFilter(snapshot, ("eier", "nüsse"))
+        excluded = {
+            snapshot.recipeNames[p]
+            for p in range(snapshot.recipeCount)
+            if compiled.excludes(p)
+        }
+        assert excluded == {"Omelett", "Walnussbrot"}
+
+    def testOhneAusschluesseKeinFilter(self, account, catalogue):
+        assert Exclusions.getFilter(account["id"], RecipeSUCUK._catalogue.get()) is None
+
+    def testCacheProAccountUndSnapshot(self, account, catalogue):
+        ExclusionDAO.addExclusion(account["id"], "Haselnuss")
+        snapshot = RecipeSUCUK._catalogue.get()
+        first = Exclusions.getFilter(account["id"], snapshot)
+        assert Exclusions.getFilter(account["id"], snapshot) is first
+
+        ExclusionDAO.addExclusion(account["id"], "Zucker")
+        changed = Exclusions.getFilter(account["id"], snapshot)
+        assert changed is not first
+        assert changed.names == ("haselnuss", "zucker")
+
+
+class TestSuche:
+    def testAusgeschlosseneRezepteFehlen(self, account, catalogue):
+        ExclusionDAO.addExclusion(account["id"], "nuss")
+        names = [r.getName() for r in findRecipes(SEARCH, 0, excludeFor=account["id"])]
+        assert names == ["Brot", "Rührkuchen"]
+
+    def testAuchMitZeitfilter(self, account, catalogue):
+        ExclusionDAO.addExclusion(account["id"], "nuss")
+        names = [
+            r.getName()
+            for r in findRecipes(SEARCH, 0, maxDuration=50, excludeFor=account["id"])
+        ]
+        assert names == ["Rührkuchen"]
+
+    def testAndereAccountsUnberuehrt(self, account, catalogue):
+        other = createAccount("andere@example.com", "Andere", "hashedPW")
+        ExclusionDAO.addExclusion(account["id"], "nuss")
+        assert len(findRecipes(SEARCH, 0, excludeFor=other["id"])) == 4
+
+    def testAusgeschlosseneZutatWirdNichtGewertet(self, catalogue):
+        snapshot = RecipeSUCUK._catalogue.get()
+        compiled = Exclusions.ExclusionFilter(snapshot, ("nuss",))
+        matching = RecipeSUCUK._scoreRecipes(
+            snapshot, [Ingredient("Haselnuss", 1)], exclusions=compiled
+        )
+        assert matching == {}
+
+
+class TestRoutes:
+    def testListeBearbeiten(self, client):
+        assert client.get("/users/me/exclusions").json() == {"ingredients": []}
+        response = client.put(
+            "/users/me/exclusions", json={"ingredients": ["Erdnuss", "Schwein"]}
+        )
+        assert response.json() == {"ingredients": ["Erdnuss", "Schwein"]}
+        assert client.put("/users/me/exclusions/Gluten").status_code == 204
+        assert client.delete("/users/me/exclusions/erdnuss").status_code == 204
+        assert client.get("/users/me/exclusions").json() == {
+            "ingredients": ["Gluten", "Schwein"]
+        }
+
+    def testLeererName(self, client):
+        response = client.put("/users/me/exclusions", json={"ingredients": [" "]})
+        assert response.status_code == 400
+
+    def testObergrenze(self, client, monkeypatch):
+        import routes.UserRoutes as UserRoutes
+
+        monkeypatch.setattr(UserRoutes, "MAX_EXCLUSIONS", 2)
+        names = {"ingredients": ["A", "B", "C"]}
+        assert client.put("/users/me/exclusions", json=names).status_code == 400
+        client.put("/users/me/exclusions", json={"ingredients": ["A", "B"]})
+        assert client.put("/users/me/exclusions/C").status_code == 400
+        assert client.put("/users/me/exclusions/a").status_code == 204
+
+    def testSucheBeachtetAusschluesse(self, client, catalogue):
+        client.put("/users/me/exclusions/Haselnuss")
+        response = client.post(
+            "/recipes/search",
+            json={
+                "zutaten": [{"name": "Mehl", "amount": 1, "unit": "g"}],
+                "personalized": False,
+            },
+        )
+        names = [r["name"] for r in response.json()["rezepte"]]
+        assert sorted(names) == ["Brot", "Rührkuchen"]
@@ -0,0 +1,172 @@
+import sys
+import os
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Auth as Auth
+import core.Database as Database
+from core.Auth import createAccessToken
+from dao import ExportDAO
+from dao.AccountDAO import createAccount
+from dao.AuthorDAO import addAuthor
+from dao.FavoriteDAO import addFavorite
+from dao.IngredientDAO import addIngredient, incrementIngredientUsage
+from dao.RecipeDAO import addRecipe, addIngredientToRecipe
+from services import ExportService
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+
+
+@pytest.fixture
+def catalogue():
+    authorID = addAuthor("Oma Erna")
+    tomate = addIngredient("Tomate", "g")
+    nudeln = addIngredient("Nudeln", "g")
+    pasta = addRecipe("Pasta", "Mit Soße", authorID)
+    addIngredientToRecipe(pasta, tomate, 200)
+    addIngredientToRecipe(pasta, nudeln, 250.5)
+    salat = addRecipe("Salat", "", None)
+    addIngredientToRecipe(salat, tomate, 2)
+    leer = addRecipe("Wasser", "Nur Wasser", None)
+    return [pasta, salat, leer]
+
+
+@pytest.fixture
+def account():
+    return createAccount("export@example.com", "Export User", "hashedPW")
+
+
+@pytest.fixture
+def client(account):
+    from LazyCookAdministration import app
+
+    token = createAccessToken({"sub": account["email"]})
+    return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+
+def _ndjson(data: bytes) -> list[dict]:
+    return [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+
+class TestExportDAO:
+    def testKatalogGruppiertZutatenProRezept(self, catalogue):
+        recipes = list(ExportDAO.iterCatalogue())
+        assert [r["id"] for r in recipes] == catalogue
+        assert recipes[0]["author"] == "Oma Erna"
+        assert [i["name"] for i in recipes[0]["ingredients"]] == ["Tomate", "Nudeln"]
+        assert recipes[2]["ingredients"] == []
+
+    def testKleineBatchesLiefernDasselbe(self, catalogue):
+        assert list(ExportDAO.iterCatalogue(batchSize=1)) == list(
+            ExportDAO.iterCatalogue()
+        )
+
+    def testAccountDatenOhnePasswort(self, catalogue, account):
+        addFavorite(account["id"], catalogue[0])
+        incrementIngredientUsage(account["id"], "Tomate", "g")
+        records = list(ExportDAO.iterAccountData(account["id"]))
+        assert [r["section"] for r in records] == [
+            "account",
+            "favorite",
+            "ingredientUsage",
+        ]
+        assert records[0]["email"] == "export@example.com"
+        assert "hashedPassword" not in records[0]
+        assert records[1]["recipeName"] == "Pasta"
+        assert records[2]["ingredient"] == "Tomate"
+
+    def testAbgebrochenerExportSchliesstConnection(self, catalogue):
+        rows = ExportDAO._iterRows("SELECT id FROM Recipe", batchSize=1)
+        next(rows)
+        rows.close()
+        assert Database.openReadConnection().execute("SELECT 1").fetchone()[0] == 1
+
+
+class TestExportService:
+    def testNdjsonEinRezeptProZeile(self, catalogue):
+        data = b"".join(ExportService.exportCatalogue("ndjson"))
+        recipes = _ndjson(data)
+        assert [r["name"] for r in recipes] == ["Pasta", "Salat", "Wasser"]
+        assert recipes[0]["ingredients"][1]["amount"] == 250.5
+
+    def testCsvEineZeileProZutat(self, catalogue):
+        data = b"".join(ExportService.exportCatalogue("csv")).decode("utf-8")
+        rows = list(csv.DictReader(io.StringIO(data)))
+        assert tuple(rows[0]) == ExportService.CATALOGUE_CSV_FIELDS
+        assert [(r["recipeName"], r["ingredient"]) for r in rows] == [
+            ("Pasta", "Tomate"),
+            ("Pasta", "Nudeln"),
+            ("Salat", "Tomate"),
+            ("Wasser", ""),
+        ]
+
+    def testGzipEntpacktIdentisch(self, catalogue):
+        plain = b"".join(ExportService.exportCatalogue("ndjson"))
+        packed = b"".join(ExportService.exportCatalogue("ndjson", gzip=True))
+        assert gzip.decompress(packed) == plain
+
+    def testGrosseExporteInBloecken(self, monkeypatch):
+        monkeypatch.setattr(ExportService, "CHUNK_BYTES", 16)
+        chunks = list(ExportService.encode(f"zeile {i}\n" for i in range(10)))
+        assert len(chunks) > 1
+        assert b"".join(chunks).count(b"\n") == 10
+
+    def testKommandozeileSchreibtDatei(self, catalogue, tmp_path):
+        target = tmp_path / "katalog.csv.gz"
+        ExportService.main(
+            ["catalogue", "--format", "csv", "--gzip", "-o", str(target)]
+        )
+        assert gzip.decompress(target.read_bytes()).startswith(b"recipeId,")
+
+
+class TestExportRoutes:
+    def testKatalogNurMitAdminToken(self, client, catalogue, monkeypatch):
+        monkeypatch.setattr(Auth, "ADMIN_TOKEN", "geheim")
+        assert client.get("/export/catalogue").status_code == 403
+        response = client.get("/export/catalogue", headers={"X-Admin-Token": "geheim"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "lazycook-katalog.ndjson" in response.headers["content-disposition"]
+        assert len(_ndjson(response.content)) == 3
+
+    def testKatalogGzip(self, client, catalogue, monkeypatch):
+        monkeypatch.setattr(Auth, "ADMIN_TOKEN", "geheim")
+        response = client.get(
+            "/export/catalogue?format=csv&gzip=true",
+            headers={"X-Admin-Token": "geheim", "Accept-Encoding": "identity"},
+        )
+        assert response.headers["content-type"] == "application/gzip"
+        assert gzip.decompress(response.content).startswith(b"recipeId,")
+
+    def testEigeneDaten(self, client, catalogue, account):
+        addFavorite(account["id"], catalogue[1])
+        response = client.get("/users/me/export")
+        assert response.status_code == 200
+        records = _ndjson(response.content)
+        assert records[0]["section"] == "account"
+        assert records[1]["recipeName"] == "Salat"
+
+    def testEigeneDatenAlsCsv(self, client, account):
+        response = client.get("/users/me/export?format=csv")
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert rows[0]["email"] == "export@example.com"
+
+    def testUnbekanntesFormat(self, client):
+        assert client.get("/users/me/export?format=xml").status_code == 400
+
+    def testOhneLoginKeinExport(self):
+        from LazyCookAdministration import app
+
+        assert TestClient(app).get("/users/me/export").status_code == 401
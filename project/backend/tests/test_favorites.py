@@ -0,0 +1,199 @@
+import asyncio
+import sys
+import os
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core.Auth import createAccessToken
+from fastapi import HTTPException
+
+from core.Pagination import (
+    encodeCursor,
+    decodeCursor,
+    parseCursor,
+    clampPageSize,
+    MAX_PAGE_SIZE,
+)
+from dao.AccountDAO import createAccount
+from dao.FavoriteDAO import (
+    addFavorite,
+    removeFavorite,
+    getFavoriteIds,
+    getFavoritesPage,
+)
+from dao.RecipeDAO import addRecipe
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+
+
+@pytest.fixture
+def account():
+    return createAccount("fav@example.com", "Fav User", "hashedPW")
+
+
+@pytest.fixture
+def client(account):
+    from LazyCookAdministration import app
+
+    token = createAccessToken({"sub": account["email"]})
+    return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+
+class TestPagination:
+    def testCursorRoundtrip(self):
+        assert decodeCursor(encodeCursor(["Pasta", 3])) == ["Pasta", 3]
+
+    def testKeinCursor(self):
+        assert decodeCursor(None) is None
+
+    def testUngueltigerCursor(self):
+        with pytest.raises(ValueError):
+            decodeCursor("%%%")
+
+    def testParseCursorPrueftTypen(self):
+        assert parseCursor(encodeCursor(["Pasta", 3]), str, int) == ("Pasta", 3)
+        assert parseCursor(None, int) is None
+        for values in (["Pasta"], [3, "Pasta"], [True], [2**63], [-(2**63) - 1]):
+            with pytest.raises(HTTPException) as e:
+                parseCursor(encodeCursor(values), *[int] * len(values))
+            assert e.value.status_code == 400
+
+    def testSeitengroesseBegrenzt(self):
+        assert clampPageSize(10_000) == MAX_PAGE_SIZE
+        assert clampPageSize(0) == 1
+
+
+class TestFavoriteDAO:
+    def testHinzufuegenUndAbfragen(self, account):
+        rid = addRecipe("Pasta", "Lecker")
+        assert addFavorite(account["id"], rid) is True
+        assert getFavoriteIds(account["id"], [rid, 999]) == {rid}
+
+    def testDoppeltHinzufuegen(self, account):
+        rid = addRecipe("Pasta", "Lecker")
+        addFavorite(account["id"], rid)
+        assert addFavorite(account["id"], rid) is True
+        assert len(getFavoritesPage(account["id"], None, 10)) == 1
+
+    def testUnbekanntesRezept(self, account):
+        assert addFavorite(account["id"], 999) is False
+
+    def testEntfernen(self, account):
+        rid = addRecipe("Pasta", "Lecker")
+        addFavorite(account["id"], rid)
+        assert removeFavorite(account["id"], rid) is True
+        assert getFavoriteIds(account["id"], [rid]) == set()
+
+    def testLeereIdListe(self, account):
+        assert getFavoriteIds(account["id"], []) == set()
+
+    def testKeysetNeuesteZuerst(self, account):
+        rids = [addRecipe(f"Rezept{i}", "") for i in range(5)]
+        for rid in rids:
+            addFavorite(account["id"], rid)
+        first = getFavoritesPage(account["id"], None, 2)
+        assert [r["id"] for r in first] == [rids[4], rids[3]]
+        second = getFavoritesPage(account["id"], first[-1]["favoriteId"], 2)
+        assert [r["id"] for r in second] == [rids[2], rids[1]]
+
+    def testMigrationUebernimmtRowid(self, tmp_path, monkeypatch):
+        path = tmp_path / "alt.db"
+        monkeypatch.setattr(Database, "DB_PATH", path)
+        Database.initDB()
+        account = createAccount("alt@example.com", "Alt", "hashedPW")
+        rids = [addRecipe(f"Rezept{i}", "") for i in range(3)]
+        Database.closeWriter()
+        con = sqlite3.connect(path)
+        con.executescript("""
+            DROP TABLE Favorites;
+            CREATE TABLE Favorites (
+                AccountID INTEGER NOT NULL,
+                rid INTEGER NOT NULL,
+                UNIQUE (AccountID, rid)
+            );
+        """)
+        con.executemany(
+            "INSERT INTO Favorites (rowid, AccountID, rid) VALUES (?, ?, ?)",
+            [(10 + i, account["id"], rid) for i, rid in enumerate(rids)],
+        )
+        con.commit()
+        con.close()
+
+        Database.initDB()
+        page = getFavoritesPage(account["id"], 12, 10)
+        assert [(r["favoriteId"], r["id"]) for r in page] == [
+            (11, rids[1]),
+            (10, rids[0]),
+        ]
+        addFavorite(account["id"], addRecipe("Neu", ""))
+        assert getFavoritesPage(account["id"], None, 1)[0]["favoriteId"] == 13
+
+
+class TestFavoriteRoutes:
+    def testSeitenweiseAuflisten(self, client):
+        rids = [addRecipe(f"Rezept{i}", "") for i in range(3)]
+        for rid in rids:
+            assert client.put(f"/favorites/{rid}").status_code == 204
+
+        page = client.get("/favorites", params={"limit": 2}).json()
+        assert [f["id"] for f in page["favorites"]] == [rids[2], rids[1]]
+        assert page["nextCursor"] is not None
+
+        rest = client.get(
+            "/favorites", params={"limit": 2, "cursor": page["nextCursor"]}
+        ).json()
+        assert [f["id"] for f in rest["favorites"]] == [rids[0]]
+        assert rest["nextCursor"] is None
+
+    def testSchreibtAusserhalbDesEventLoops(self, client, monkeypatch):
+        import dao.FavoriteDAO as FavoriteDAO
+
+        original = FavoriteDAO.addFavorite
+        calls = []
+
+        def addFavorite(AccountID, recipeId):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            calls.append(recipeId)
+            return original(AccountID, recipeId)
+
+        monkeypatch.setattr(FavoriteDAO, "addFavorite", addFavorite)
+        rid = addRecipe("Pasta", "")
+        assert client.put(f"/favorites/{rid}").status_code == 204
+        assert calls == [rid]
+
+    def testUnbekanntesRezept404(self, client):
+        assert client.put("/favorites/999").status_code == 404
+
+    def testEntfernen(self, client):
+        rid = addRecipe("Pasta", "")
+        client.put(f"/favorites/{rid}")
+        assert client.delete(f"/favorites/{rid}").status_code == 204
+        assert client.get("/favorites").json()["favorites"] == []
+
+    def testUngueltigerCursor400(self, client):
+        assert client.get("/favorites", params={"cursor": "%%%"}).status_code == 400
+
+    @pytest.mark.parametrize(
+        "values", [[[1]], [{"a": 1}], ["12"], [], [1, 2], [2**63], [False]]
+    )
+    def testCursorMitFalschenTypen400(self, client, values):
+        response = client.get("/favorites", params={"cursor": encodeCursor(values)})
+        assert response.status_code == 400
+
+    def testSucheMarkiertFavoriten(self, client):
+        rid = addRecipe("Pasta", "")
+        addRecipe("Pizza", "")
+        client.put(f"/favorites/{rid}")
+        rezepte = client.post("/recipes/search", json={"zutaten": []}).json()["rezepte"]
+        flags = {r["name"]: r["isFavorite"] for r in rezepte}
+        assert flags == {"Pasta": True, "Pizza": False}
@@ -0,0 +1,155 @@
+import sys
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core import Metrics
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+    with Database.getDB() as con:
+        con.execute("CREATE TABLE Item (name TEXT PRIMARY KEY)")
+    yield
+    Database.closeWriter()
+
+
+def _insert(name: str) -> int:
+    with Database.getDB() as con:
+        cur = con.cursor()
+        cur.execute("INSERT INTO Item (name) VALUES (?)", (name,))
+        return cur.lastrowid
+
+
+def _names() -> set[str]:
+    con = sqlite3.connect(str(Database.DB_PATH))
+    try:
+        return {row[0] for row in con.execute("SELECT name FROM Item")}
+    finally:
+        con.close()
+
+
+def _commitStats() -> tuple[float, int]:
+    """(Summe Vorgänge, Anzahl Commits) aus dem Group-Commit-Histogramm."""
+    text = Metrics.renderPrometheus()
+    total = commits = 0
+    for line in text.splitlines():
+        if line.startswith("lazycook_db_group_commit_ops_sum"):
+            total = float(line.split()[-1])
+        elif line.startswith("lazycook_db_group_commit_ops_count"):
+            commits = int(line.split()[-1])
+    return total, commits
+
+
+class TestGroupCommit:
+    def testNachRueckkehrSichtbar(self):
+        _insert("a")
+        assert _names() == {"a"}
+
+    def testFehlerRolltNurEigenenVorgangZurueck(self):
+        _insert("a")
+        with pytest.raises(sqlite3.IntegrityError):
+            _insert("a")
+        _insert("b")
+        assert _names() == {"a", "b"}
+
+    def testAusnahmeImBodyVerwirftSchreibvorgang(self):
+        with pytest.raises(ValueError):
+            with Database.getDB() as con:
+                con.execute("INSERT INTO Item (name) VALUES ('x')")
+                raise ValueError("abbrechen")
+        assert _names() == set()
+
+    def testVerschachtelterAufruf(self):
+        with Database.getDB() as con:
+            con.execute("INSERT INTO Item (name) VALUES ('aussen')")
+            _insert("innen")
+        assert _names() == {"aussen", "innen"}
+
+    def testParalleleSchreiberTeilenSichCommits(self):
+        Metrics.reset()
+        threads = 16
+        perThread = 20
+        barrier = threading.Barrier(threads)
+        errors = []
+
+        def worker(n):
+            barrier.wait()
+            try:
+                for i in range(perThread):
+                    _insert(f"{n}-{i}")
+            except Exception as e:
+                errors.append(e)
+
+        pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+
+        assert errors == []
+        assert len(_names()) == threads * perThread
+        total, commits = _commitStats()
+        assert total == threads * perThread
+        assert commits < total
+
+    def testFehlerEinesSchreibersTrifftAndereNicht(self):
+        _insert("doppelt")
+        barrier = threading.Barrier(8)
+        results = {}
+
+        def worker(name):
+            barrier.wait()
+            try:
+                _insert(name)
+                results[name] = "ok"
+            except sqlite3.IntegrityError:
+                results[name] = "fehler"
+
+        names = ["doppelt"] + [f"neu{i}" for i in range(7)]
+        pool = [threading.Thread(target=worker, args=(n,)) for n in names]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+
+        assert results.pop("doppelt") == "fehler"
+        assert set(results.values()) == {"ok"}
+        assert _names() == set(names)
+
+
+class TestSperreAndererProzesse:
+    def testWartetAufFremdeSchreibsperre(self, monkeypatch):
+        monkeypatch.setattr(Database, "DB_BUSY_TIMEOUT_MS", 20)
+        Database.closeWriter()
+        other = sqlite3.connect(
+            str(Database.DB_PATH), isolation_level=None, check_same_thread=False
+        )
+        other.execute("BEGIN IMMEDIATE")
+        released = threading.Timer(0.1, lambda: other.execute("COMMIT"))
+        released.start()
+        try:
+            start = time.monotonic()
+            _insert("spaeter")
+            assert time.monotonic() - start >= 0.05
+        finally:
+            released.join()
+            other.close()
+        assert _names() == {"spaeter"}
+
+
+class TestOhneGroupCommit:
+    def testEinzelneTransaktionen(self, monkeypatch):
+        monkeypatch.setattr(Database, "DB_GROUP_COMMIT", False)
+        _insert("a")
+        with pytest.raises(sqlite3.IntegrityError):
+            _insert("a")
+        assert _names() == {"a"}
@@ -0,0 +1,84 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from dao.AccountDAO import createAccount
+from dao.IngredientDAO import (
+    incrementIngredientUsage,
+    getGlobalTopIngredients,
+    getTopIngredientsWithFallback,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+
+
+@pytest.fixture
+def accounts():
+    return [
+        createAccount(f"user{i}@example.com", f"User {i}", "hashedPW")["id"]
+        for i in range(3)
+    ]
+
+
+class TestGlobalePopularitaet:
+    def testZaehltUeberAlleAccounts(self, accounts):
+        for accountId in accounts:
+            incrementIngredientUsage(accountId, "Tomate", "g")
+        incrementIngredientUsage(accounts[0], "Basilikum", "g")
+        top = getGlobalTopIngredients(limit=5)
+        assert [(r["displayName"], r["count"]) for r in top] == [
+            ("Tomate", 3),
+            ("Basilikum", 1),
+        ]
+
+    def testNormalisierterName(self, accounts):
+        incrementIngredientUsage(accounts[0], "Tomate", "g")
+        incrementIngredientUsage(accounts[1], "  tomate ", "Stück")
+        top = getGlobalTopIngredients()
+        assert len(top) == 1
+        assert top[0]["count"] == 2
+        assert top[0]["lastUnit"] == "Stück"
+
+    def testKanonischerNameStattFreitext(self, accounts):
+        incrementIngredientUsage(accounts[0], "TOMATEN aus dem Garten", "g")
+        incrementIngredientUsage(accounts[1], "tomate", "g")
+        top = getGlobalTopIngredients()
+        assert [r["displayName"] for r in top] == ["Tomate"]
+
+    def testBackfillAusBestehendenZaehlern(self, accounts):
+        incrementIngredientUsage(accounts[0], "Reis", "g")
+        incrementIngredientUsage(accounts[1], "Reis", "g")
+        with Database.getDB() as con:
+            con.execute("DELETE FROM IngredientPopularity")
+        Database.initDB()
+        assert getGlobalTopIngredients()[0]["count"] == 2
+
+
+class TestColdStart:
+    def testNeuerAccountBekommtGlobaleVorschlaege(self, accounts):
+        incrementIngredientUsage(accounts[0], "Nudeln", "g")
+        neu = createAccount("neu@example.com", "Neu", "hashedPW")["id"]
+        rows = getTopIngredientsWithFallback(neu, limit=5)
+        assert [r["displayName"] for r in rows] == ["Nudeln"]
+
+    def testDuplikatNachNormalisiertemNamen(self, accounts):
+        incrementIngredientUsage(accounts[0], "Tomaten", "g")
+        incrementIngredientUsage(accounts[1], "tomate", "g")
+        incrementIngredientUsage(accounts[2], "tomate", "g")
+        rows = getTopIngredientsWithFallback(accounts[0], limit=3)
+        assert [r["displayName"] for r in rows] == ["Tomaten"]
+
+    def testEigeneZuerstOhneDuplikate(self, accounts):
+        incrementIngredientUsage(accounts[0], "Nudeln", "g")
+        incrementIngredientUsage(accounts[1], "Nudeln", "g")
+        incrementIngredientUsage(accounts[1], "Käse", "g")
+        rows = getTopIngredientsWithFallback(accounts[0], limit=3)
+        assert [r["displayName"] for r in rows] == ["Nudeln", "Käse"]
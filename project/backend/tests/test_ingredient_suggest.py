@@ -0,0 +1,109 @@
+import sys
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core.Auth import createAccessToken
+from dao.AccountDAO import createAccount
+from dao.IngredientDAO import addIngredient, incrementIngredientUsage
+from services import IngredientSuggest
+from services.IngredientSuggest import PrefixIndex
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+    IngredientSuggest.reset()
+    yield
+    IngredientSuggest.reset()
+
+
+def _row(name, popularity=0, unit="g"):
+    return {"name": name, "amountType": unit, "popularity": popularity}
+
+
+class TestPrefixIndex:
+    def testPraefixOhneGrossKlein(self):
+        index = PrefixIndex([_row("Tomate"), _row("Tofu"), _row("Zwiebel")])
+        assert [r["name"] for r in index.suggest("TO")] == ["Tofu", "Tomate"]
+
+    def testWortanfangImNamen(self):
+        index = PrefixIndex([_row("Cherry-Tomate"), _row("rote Zwiebel")])
+        assert [r["name"] for r in index.suggest("tom")] == ["Cherry-Tomate"]
+        assert [r["name"] for r in index.suggest("zwie")] == ["rote Zwiebel"]
+
+    def testKeineTrefferMittenImWort(self):
+        index = PrefixIndex([_row("Tomate")])
+        assert index.suggest("mate") == []
+
+    def testBeliebtesteZuerst(self):
+        index = PrefixIndex([_row("Salz", 1), _row("Sahne", 10), _row("Senf", 5)])
+        assert [r["name"] for r in index.suggest("s")] == ["Sahne", "Senf", "Salz"]
+
+    def testNamensanfangVorWortanfang(self):
+        index = PrefixIndex([_row("gehackte Tomate"), _row("Tomatenmark")])
+        assert [r["name"] for r in index.suggest("tom")] == [
+            "Tomatenmark",
+            "gehackte Tomate",
+        ]
+
+    def testLeereAnfrageLiefertBeliebteste(self):
+        index = PrefixIndex([_row("Ei", 3), _row("Milch", 7)])
+        assert [r["name"] for r in index.suggest("", limit=1)] == ["Milch"]
+
+    def testSchnellGenugFuerJedenTastendruck(self):
+        rows = [_row(f"Zutat {i} Sorte {i % 37}", i % 50) for i in range(5000)]
+        index = PrefixIndex(rows)
+        start = time.perf_counter()
+        for _ in range(100):
+            index.suggest("z")
+        assert (time.perf_counter() - start) / 100 < 0.005
+
+
+class TestSuggestService:
+    def testPopularitaetAusIngredientUsage(self):
+        addIngredient("Reis", "g")
+        addIngredient("Rosmarin", "g")
+        account = createAccount("s@example.com", "S", "hashedPW")
+        incrementIngredientUsage(account["id"], "rosmarin", "g")
+        assert [r["name"] for r in IngredientSuggest.suggest("r")] == [
+            "Rosmarin",
+            "Reis",
+        ]
+
+    def testPopularitaetMitUmlaut(self):
+        addIngredient("Olivenöl", "ml")
+        addIngredient("Öl", "ml")
+        account = createAccount("u@example.com", "U", "hashedPW")
+        incrementIngredientUsage(account["id"], "Öl", "ml")
+        assert [r["name"] for r in IngredientSuggest.suggest("öl")] == ["Öl"]
+        assert IngredientSuggest.suggest("öl")[0]["popularity"] == 1
+
+    def testIndexWirdNurEinmalGebaut(self):
+        addIngredient("Reis", "g")
+        assert len(IngredientSuggest.suggest("r")) == 1
+        addIngredient("Rosmarin", "g")
+        assert len(IngredientSuggest.suggest("r")) == 1
+        IngredientSuggest.reset()
+        assert len(IngredientSuggest.suggest("r")) == 2
+
+
+class TestSuggestRoute:
+    def testEndpunkt(self):
+        from LazyCookAdministration import app
+
+        addIngredient("Paprika", "Stück")
+        account = createAccount("route@example.com", "R", "hashedPW")
+        token = createAccessToken({"sub": account["email"]})
+        client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+        response = client.get("/ingredients/suggest", params={"q": "pap"})
+        assert response.status_code == 200
+        assert response.json() == {
+            "ingredients": [{"name": "Paprika", "unit": "Stück"}]
+        }
@@ -0,0 +1,112 @@
+import sys
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Auth as Auth
+import core.Database as Database
+import core.Metrics as Metrics
+from routes.MetricsRoutes import router as metrics_router
+
+
+@pytest.fixture(autouse=True)
+def resetMetrics(monkeypatch):
+    monkeypatch.setattr(Metrics, "METRICS_DIR", None)
+    Metrics.reset()
+    yield
+    Metrics.reset()
+
+
+def makeApp() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(Metrics.MetricsMiddleware)
+
+    @app.get("/items/{itemId}")
+    async def readItem(itemId: int):
+        return {"id": itemId}
+
+    return app
+
+
+class TestHistogramm:
+    def testBucketsSindKumulativ(self):
+        Metrics.observe("m", {"a": "b"}, 0.02)
+        text = Metrics.renderPrometheus()
+        assert 'm_bucket{a="b",le="0.01"} 0' in text
+        assert 'm_bucket{a="b",le="0.025"} 1' in text
+        assert 'm_bucket{a="b",le="+Inf"} 1' in text
+        assert 'm_count{a="b"} 1' in text
+
+    def testLabelsWerdenEscaped(self):
+        Metrics.observe("m", {"a": 'x"y'}, 0.1)
+        assert 'a="x\\"y"' in Metrics.renderPrometheus()
+
+
+class TestMiddleware:
+    def testRouteTemplateStattPfad(self):
+        client = TestClient(makeApp())
+        client.get("/items/1")
+        client.get("/items/2")
+        text = Metrics.renderPrometheus()
+        assert 'route="/items/{itemId}"' in text
+        assert "/items/1" not in text
+
+    def testUnbekannteRoute(self):
+        TestClient(makeApp()).get("/gibtsnicht")
+        assert 'route="unmatched"' in Metrics.renderPrometheus()
+
+
+class TestSqlTiming:
+    def testStatementsWerdenGemessen(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+        con = Database.getConnection()
+        try:
+            con.execute("SELECT 1")
+            con.cursor().execute("SELECT 2")
+        finally:
+            con.close()
+        text = Metrics.renderPrometheus()
+        assert (
+            'lazycook_db_statement_duration_seconds_count{operation="SELECT"} 2' in text
+        )
+
+
+class TestMultiprocess:
+    def testDateienWerdenZusammengefuehrt(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Metrics, "METRICS_DIR", str(tmp_path))
+        (tmp_path / "metrics-99999.json").write_text(
+            '[{"metric": "m", "labels": [], "buckets": [1.0], '
+            '"counts": [2], "sum": 1.5, "count": 2}]'
+        )
+        Metrics.observe("m", {}, 0.5, buckets=(1.0,))
+        text = Metrics.renderPrometheus()
+        assert "m_count 3" in text
+
+
+class TestMetricsEndpoint:
+    def makeClient(self, monkeypatch) -> TestClient:
+        monkeypatch.setattr(Auth, "ADMIN_TOKEN", "geheim")
+        app = FastAPI()
+        app.include_router(metrics_router)
+        return TestClient(app)
+
+    def testOhneTokenGesperrt(self, monkeypatch):
+        assert self.makeClient(monkeypatch).get("/metrics").status_code == 403
+
+    @pytest.mark.parametrize(
+        "headers",
+        [{"X-Admin-Token": "geheim"}, {"Authorization": "Bearer geheim"}],
+    )
+    def testMitToken(self, monkeypatch, headers):
+        response = self.makeClient(monkeypatch).get("/metrics", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+    def testFalscherBearer(self, monkeypatch):
+        client = self.makeClient(monkeypatch)
+        response = client.get("/metrics", headers={"Authorization": "Bearer falsch"})
+        assert response.status_code == 403
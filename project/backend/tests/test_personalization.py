@@ -0,0 +1,164 @@
+import sys
+import os
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core.Auth import createAccessToken
+from core.Models import RecipeSearchRequest
+from dao.AccountDAO import createAccount
+from dao.IngredientDAO import (
+    addIngredient,
+    getIngredientUsage,
+    incrementIngredientUsage,
+)
+from dao.RecipeDAO import addIngredientToRecipe, addRecipe
+from domain.ingredient import Ingredient
+from domain.recipe import Recipe
+from services import Personalization
+from services.Personalization import PreferenceVector, buildPreferences, rerank
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def _usage(name, count, lastUsedAt="2026-06-01 00:00:00"):
+    return {"name": name, "count": count, "lastUsedAt": lastUsedAt}
+
+
+def _recipe(name, ingredients, rating):
+    recipe = Recipe(name, [Ingredient(i, 1.0) for i in ingredients], "")
+    recipe.setRating(rating)
+    return recipe
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+    Personalization.invalidatePreferences()
+    yield
+    Personalization.invalidatePreferences()
+
+
+class TestBuildPreferences:
+    def testNormiertAufEins(self):
+        prefs = buildPreferences([_usage("reis", 4), _usage("salz", 2)], NOW)
+        assert prefs.weights == {"reis": 1.0, "salz": 0.5}
+
+    def testAlteNutzungVerliertGewicht(self):
+        prefs = buildPreferences(
+            [_usage("reis", 4, "2026-05-02 00:00:00"), _usage("salz", 4)], NOW
+        )
+        assert prefs.weights["salz"] == 1.0
+        assert prefs.weights["reis"] == pytest.approx(0.5)
+
+    def testOhneNutzungLeer(self):
+        assert not buildPreferences([], NOW)
+
+    def testGewichtUeberTeilstring(self):
+        prefs = PreferenceVector({"zwiebel": 1.0, "tomate": 0.5})
+        assert prefs.weightFor("rote Zwiebel") == 1.0
+        assert prefs.weightFor("Mehl") == 0.0
+
+    def testKurzePraeferenzNurAlsGanzesWort(self):
+        prefs = PreferenceVector({"ei": 1.0, "öl": 0.5})
+        assert prefs.weightFor("Eier") == 1.0
+        assert prefs.weightFor("Reis") == 0.0
+        assert prefs.weightFor("Weizenmehl") == 0.0
+        assert prefs.weightFor("Brötchen") == 0.0
+        assert prefs.weightFor("Öl") == 0.5
+
+    def testPluralWirdZusammengefasst(self):
+        prefs = buildPreferences([_usage("Tomaten", 2), _usage("tomate", 2)], NOW)
+        assert prefs.weights == {"tomate": 1.0}
+
+
+class TestRerank:
+    def testBonusEntscheidetBeiGleichstand(self):
+        recipes = [
+            _recipe("Pizza", ["Teig", "Käse"], 0.5),
+            _recipe("Reispfanne", ["Reis", "Käse"], 0.5),
+        ]
+        result = rerank(recipes, PreferenceVector({"reis": 1.0}))
+        assert [r.getName() for r in result] == ["Reispfanne", "Pizza"]
+
+    def testDeutlichBessererTrefferBleibtVorne(self):
+        recipes = [
+            _recipe("Pizza", ["Teig"], 1.0),
+            _recipe("Reispfanne", ["Reis", "Teig"], 0.5),
+        ]
+        result = rerank(recipes, PreferenceVector({"reis": 1.0}))
+        assert result[0].getName() == "Pizza"
+
+    def testNurKandidatenWerdenUmsortiert(self, monkeypatch):
+        monkeypatch.setattr(Personalization, "RERANK_CANDIDATES", 2)
+        recipes = [
+            _recipe("A", ["Teig"], 0.5),
+            _recipe("B", ["Teig"], 0.5),
+            _recipe("C", ["Reis"], 0.5),
+        ]
+        result = rerank(recipes, PreferenceVector({"reis": 1.0}))
+        assert [r.getName() for r in result] == ["A", "B", "C"]
+
+    def testOhnePraeferenzenUnveraendert(self):
+        recipes = [_recipe("A", ["Teig"], 0.2), _recipe("B", ["Reis"], 0.2)]
+        assert rerank(recipes, PreferenceVector({})) is recipes
+
+
+class TestPreferenceCache:
+    def testGecachtBisInvalidiert(self):
+        account = createAccount("p@example.com", "P", "hashedPW")
+        incrementIngredientUsage(account["id"], "Reis", "g")
+        first = Personalization.getPreferences(account["id"])
+        assert first.weights == {"reis": 1.0}
+
+        incrementIngredientUsage(account["id"], "Salz", "g")
+        assert Personalization.getPreferences(account["id"]) is first
+
+        Personalization.invalidatePreferences(account["id"])
+        assert set(Personalization.getPreferences(account["id"]).weights) == {
+            "reis",
+            "salz",
+        }
+
+    def testCacheBegrenzt(self, monkeypatch):
+        monkeypatch.setattr(Personalization, "CACHE_SIZE", 2)
+        for AccountID in (1, 2, 3):
+            Personalization.getPreferences(AccountID)
+        assert list(Personalization._preferences) == [2, 3]
+
+
+class TestSuchePersonalisiert:
+    def testStandardmaessigAus(self):
+        assert RecipeSearchRequest(zutaten=[]).personalized is False
+
+    def testNutzungZaehltErstNachDemRanking(self, monkeypatch):
+        from LazyCookAdministration import app
+
+        account = createAccount("r@example.com", "R", "hashedPW")
+        rid = addRecipe("Reispfanne", "")
+        addIngredientToRecipe(rid, addIngredient("Reis", "g"), 200)
+        seen = []
+        original = Personalization.getPreferences
+
+        def spy(AccountID):
+            seen.append(getIngredientUsage(AccountID))
+            return original(AccountID)
+
+        monkeypatch.setattr(Personalization, "getPreferences", spy)
+        token = createAccessToken({"sub": account["email"]})
+        client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+        response = client.post(
+            "/recipes/search",
+            json={
+                "zutaten": [{"name": "Reis", "amount": 1, "unit": "g"}],
+                "personalized": True,
+            },
+        )
+        assert response.status_code == 200
+        assert seen == [[]]
+        assert [r["name"] for r in getIngredientUsage(account["id"])] == ["reis"]
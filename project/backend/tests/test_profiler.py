@@ -0,0 +1,118 @@
+import asyncio
+import sys
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Auth as Auth
+import core.Profiler as Profiler
+
+
+@pytest.fixture(autouse=True)
+def profileDir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Profiler, "PROFILE_DIR", tmp_path)
+    monkeypatch.setattr(Profiler, "PROFILE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(Auth, "ADMIN_TOKEN", "geheim")
+    return tmp_path
+
+
+def busyWait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def makeClient() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(Profiler.ProfilingMiddleware)
+
+    @app.get("/langsam")
+    async def slow():
+        busyWait(0.05)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+class TestProfilingMiddleware:
+    def testOhneHeaderKeinProfil(self, profileDir):
+        assert makeClient().get("/langsam").status_code == 200
+        assert list(profileDir.iterdir()) == []
+
+    def testFalscherTokenKeinProfil(self, profileDir):
+        makeClient().get("/langsam", headers={"X-Profile": "falsch"})
+        assert list(profileDir.iterdir()) == []
+
+    def testMitHeaderWirdProfilGeschrieben(self, profileDir):
+        makeClient().get("/langsam", headers={"X-Profile": "geheim"})
+        folded = list(profileDir.glob("*.folded"))
+        assert len(folded) == 1
+        assert "test_profiler.busyWait" in folded[0].read_text()
+        assert len(list(profileDir.glob("*.speedscope.json"))) == 1
+
+    def testSchreibtAusserhalbDesEventLoops(self, profileDir, monkeypatch):
+        original = Profiler.writeProfile
+        calls = []
+
+        def writeProfile(*args):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            calls.append(args[1:3])
+            return original(*args)
+
+        monkeypatch.setattr(Profiler, "writeProfile", writeProfile)
+        makeClient().get("/langsam", headers={"X-Profile": "geheim"})
+        assert calls == [("GET", "/langsam")]
+
+    def testSamplingRate(self, profileDir, monkeypatch):
+        monkeypatch.setattr(Profiler, "PROFILE_SAMPLE_RATE", 1.0)
+        makeClient().get("/langsam")
+        assert len(list(profileDir.glob("*.folded"))) == 1
+
+
+class TestStackSampler:
+    def testNurWennIsoliert(self):
+        sampler = Profiler.StackSampler(
+            Profiler.threading.get_ident(), 1, isolated=lambda: False
+        )
+        sampler.start()
+        busyWait(0.03)
+        assert sampler.stop() == Profiler.Counter()
+
+    def testFramesProFunktion(self):
+        sampler = Profiler.StackSampler(Profiler.threading.get_ident(), 1)
+        sampler.start()
+        busyWait(0.03)
+        stacks = sampler.stop()
+        # Alle Samples in busyWait ergeben denselben Frame, egal welche Zeile lief
+        leaves = {stack[-1] for stack in stacks if stack[-1][0].endswith(".busyWait")}
+        assert len(leaves) == 1
+        assert next(iter(leaves))[0].endswith("test_profiler.busyWait")
+
+
+class TestRetention:
+    def testAlteProfileWerdenGeloescht(self, profileDir, monkeypatch):
+        monkeypatch.setattr(Profiler, "PROFILE_KEEP", 2)
+        stacks = Profiler.Counter({(("f", "a.py", 1),): 3})
+        for i in range(4):
+            Profiler.writeProfile(stacks, "GET", f"/p{i}", 5.0)
+            time.sleep(0.01)
+        assert len(list(profileDir.glob("*.folded"))) == 2
+        assert len(list(profileDir.glob("*.speedscope.json"))) == 2
+
+
+class TestFormate:
+    def testCollapsed(self):
+        stacks = Profiler.Counter({(("a", "x.py", 1), ("b", "x.py", 2)): 4})
+        assert Profiler.toCollapsed(stacks) == "a;b 4\n"
+
+    def testSpeedscope(self):
+        stacks = Profiler.Counter({(("a", "x.py", 1), ("b", "x.py", 2)): 4})
+        profile = Profiler.toSpeedscope(stacks, "GET /", 5.0)
+        assert profile["profiles"][0]["samples"] == [[0, 1]]
+        assert profile["profiles"][0]["weights"] == [20.0]
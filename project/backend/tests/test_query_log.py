@@ -0,0 +1,123 @@
+import sys
+import os
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Auth as Auth
+import core.Database as Database
+import core.QueryLog as QueryLog
+from routes.DebugRoutes import router as debug_router
+
+
+@pytest.fixture(autouse=True)
+def queryLog(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    monkeypatch.setattr(QueryLog, "QUERY_LOG_PATH", tmp_path / "querylog.db")
+    monkeypatch.setattr(QueryLog, "SLOW_QUERY_MS", 0.0)
+    monkeypatch.setattr(QueryLog, "LOG_IDLE_SECONDS", 0.01)
+    Database.initDB()
+    QueryLog.reset()
+    yield
+    QueryLog.reset()
+
+
+def runQuery(sql: str, params=()):
+    with Database.getDB() as con:
+        return con.cursor().execute(sql, params).fetchall()
+
+
+class TestParameterShape:
+    def testTupel(self):
+        assert QueryLog.parameterShape((1, "a", None)) == "(int, str, NoneType)"
+
+    def testWerteWerdenNichtProtokolliert(self):
+        assert "geheim" not in QueryLog.parameterShape(("geheim",))
+
+
+class TestFullScans:
+    def testScanOhneIndex(self):
+        assert QueryLog.fullScans(["SCAN Recipe"]) == ["Recipe"]
+
+    def testIndexSucheIstKeinScan(self):
+        plan = ["SEARCH Recipe USING INDEX sqlite_autoindex_Recipe_1 (name=?)"]
+        assert QueryLog.fullScans(plan) == []
+
+
+class TestSlowQueryLog:
+    def testLangsameQueryWirdProtokolliert(self):
+        runQuery("SELECT id FROM Recipe WHERE description = ?", ("x",))
+        offenders = QueryLog.getTopOffenders()
+        entry = next(o for o in offenders if "description" in o["sql"])
+        assert entry["paramShape"] == "(str)"
+        assert entry["fullScans"] == ["Recipe"]
+
+    def testPlanNurEinmalErfasst(self):
+        runQuery("SELECT id FROM Recipe WHERE name = ?", ("a",))
+        runQuery("SELECT id FROM Recipe WHERE name = ?", ("b",))
+        entry = next(o for o in QueryLog.getTopOffenders() if "name = ?" in o["sql"])
+        assert entry["count"] == 2
+        assert entry["fullScans"] == []
+
+    def testErgebnisBleibtErhalten(self):
+        with Database.getDB() as con:
+            cur = con.cursor()
+            cur.execute("INSERT INTO Author (name) VALUES (?)", ("A",))
+            cur.execute("SELECT name FROM Author")
+            assert cur.fetchone()["name"] == "A"
+
+    def testFehlerWirdTrotzdemProtokolliert(self):
+        with pytest.raises(sqlite3.OperationalError):
+            runQuery("SELECT id FROM GibtEsNicht WHERE x = ?", (1,))
+        assert any("GibtEsNicht" in o["sql"] for o in QueryLog.getTopOffenders())
+
+    def testSchreibtGesammelt(self, monkeypatch):
+        connects = []
+        connectLog = QueryLog._connectLog
+
+        def countingConnect():
+            connects.append(1)
+            return connectLog()
+
+        # Ohne Hintergrund-Thread bleibt alles in der Queue bis flush()
+        monkeypatch.setattr(QueryLog, "_writeLoop", lambda: None)
+        if QueryLog._writer is not None:
+            QueryLog._writer.join()
+        QueryLog.flush()
+        monkeypatch.setattr(QueryLog, "_connectLog", countingConnect)
+        for name in ("a", "b", "c"):
+            runQuery("SELECT id FROM Recipe WHERE name = ?", (name,))
+        assert connects == []
+        QueryLog.flush()
+        assert len(connects) == 1
+        entry = next(o for o in QueryLog.getTopOffenders() if "name = ?" in o["sql"])
+        assert entry["count"] == 3
+
+    def testDeaktiviert(self, monkeypatch):
+        monkeypatch.setattr(QueryLog, "SLOW_QUERY_MS", None)
+        runQuery("SELECT 1")
+        assert QueryLog.getTopOffenders() == []
+
+
+class TestDebugEndpoint:
+    def makeClient(self) -> TestClient:
+        app = FastAPI()
+        app.include_router(debug_router)
+        return TestClient(app)
+
+    def testOhneTokenGesperrt(self, monkeypatch):
+        monkeypatch.setattr(Auth, "ADMIN_TOKEN", "geheim")
+        assert self.makeClient().get("/debug/slow-queries").status_code == 403
+
+    def testMitToken(self, monkeypatch):
+        monkeypatch.setattr(Auth, "ADMIN_TOKEN", "geheim")
+        runQuery("SELECT id FROM Recipe WHERE description = ?", ("x",))
+        response = self.makeClient().get(
+            "/debug/slow-queries", headers={"X-Admin-Token": "geheim"}
+        )
+        assert response.status_code == 200
+        assert response.json()["fullScans"]
@@ -0,0 +1,193 @@
+import sys
+import os
+import sqlite3
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+import core.RateLimit as RateLimit
+from core.RateLimit import MemoryStore, SQLiteStore, RateLimiter, LoginThrottle
+
+
+@pytest.fixture(autouse=True)
+def freshStore(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    monkeypatch.setattr(RateLimit, "RATE_LIMIT_ENABLED", True)
+    Database.initDB()
+    RateLimit.setStore(MemoryStore())
+    yield
+    RateLimit.setStore(None)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteStore(tmp_path / "ratelimit.db")
+    return MemoryStore()
+
+
+class TestTokenBucket:
+    def testBurstBisKapazitaet(self, store):
+        results = [store.consume("k", 3, 0.001) for _ in range(4)]
+        assert results[:3] == [0.0, 0.0, 0.0]
+        assert results[3] > 0
+
+    def testSchluesselSindGetrennt(self, store):
+        store.consume("a", 1, 0.001)
+        assert store.consume("b", 1, 0.001) == 0.0
+
+    def testNachfuellen(self, store):
+        store.consume("k", 1, 1000)
+        time.sleep(0.01)
+        assert store.consume("k", 1, 1000) == 0.0
+
+
+class TestSlidingWindow:
+    def testZaehlen(self, store):
+        store.addToWindow("k")
+        store.addToWindow("k")
+        assert store.countInWindow("k", 60) == 2
+
+    def testAbgelaufeneEintraege(self, store):
+        store.addToWindow("k")
+        assert store.countInWindow("k", 0) == 0
+
+    def testLeeren(self, store):
+        store.addToWindow("k")
+        store.clearWindow("k")
+        assert store.countInWindow("k", 60) == 0
+
+    def testRestzeitBisZumAblauf(self, store):
+        assert store.windowRetryAfter("k", 60, 2) == 0
+        store.addToWindow("k")
+        time.sleep(0.05)
+        store.addToWindow("k")
+        retryAfter = store.windowRetryAfter("k", 60, 2)
+        # Erst der ältere Eintrag muss ablaufen, dann ist wieder Platz
+        assert 59 < retryAfter < 59.99
+        assert store.windowRetryAfter("k", 60, 3) == 0
+
+    def testVolleSpeicherVerdraengenAeltesteFenster(self, monkeypatch):
+        monkeypatch.setattr(RateLimit, "_MAX_MEMORY_KEYS", 3)
+        store = MemoryStore()
+        for key in ("a", "b", "c", "d"):
+            store.addToWindow(key)
+        assert store.countInWindow("a", 60) == 0
+        assert [store.countInWindow(k, 60) for k in ("b", "c", "d")] == [1, 1, 1]
+
+    def testSqliteRaeumtAlteZeilenAuf(self, tmp_path, monkeypatch):
+        path = tmp_path / "ratelimit.db"
+        store = SQLiteStore(path)
+        store.consume("alt", 5, 1)
+        store.addToWindow("alt")
+        con = sqlite3.connect(path)
+        con.execute("UPDATE RateBucket SET updatedAt = 0")
+        con.execute("UPDATE RateEvent SET at = 0")
+        con.commit()
+        monkeypatch.setattr(RateLimit, "_SWEEP_INTERVAL_SECONDS", 0)
+        store.consume("neu", 5, 1)
+        store.addToWindow("neu")
+        assert [r[0] for r in con.execute("SELECT key FROM RateBucket")] == ["neu"]
+        assert [r[0] for r in con.execute("SELECT key FROM RateEvent")] == ["neu"]
+        con.close()
+
+
+class TestClientIp:
+    @pytest.mark.parametrize(
+        "hops, forwarded, expected",
+        [
+            (1, "", "10.0.0.1"),
+            (1, "203.0.113.7", "203.0.113.7"),
+            # Links steht, was der Client selbst mitgeschickt hat
+            (1, "1.2.3.4, 203.0.113.7", "203.0.113.7"),
+            (2, "1.2.3.4, 203.0.113.7, 10.0.0.2", "203.0.113.7"),
+            (2, "203.0.113.7", "10.0.0.1"),
+        ],
+    )
+    def testRechtesterVertrauenswuerdigerEintrag(
+        self, monkeypatch, hops, forwarded, expected
+    ):
+        monkeypatch.setattr(RateLimit, "TRUST_PROXY_HEADERS", True)
+        monkeypatch.setattr(RateLimit, "TRUSTED_PROXY_HOPS", hops)
+        assert RateLimit.forwardedClient(forwarded, "10.0.0.1") == expected
+
+    def testOhneVertrauenZaehltNurDieVerbindung(self):
+        assert RateLimit.forwardedClient("1.2.3.4", "10.0.0.1") == "10.0.0.1"
+
+    def testGefaelschterHeaderUmgehtLimitNicht(self, monkeypatch):
+        from LazyCookAdministration import app
+
+        monkeypatch.setattr(RateLimit, "TRUST_PROXY_HEADERS", True)
+        client = TestClient(app)
+        form = {"username": "niemand@example.com", "password": "Falsch1!"}
+        codes = [
+            client.post(
+                "/auth/login",
+                data=form,
+                headers={"X-Forwarded-For": f"198.51.100.{i}, 203.0.113.7"},
+            ).status_code
+            for i in range(6)
+        ]
+        assert codes[5] == 429
+
+
+class TestLimiter:
+    def testLimitWirft429(self):
+        limiter = RateLimiter("test", capacity=1, perMinute=1)
+        limiter.check("1.2.3.4")
+        with pytest.raises(Exception) as exc:
+            limiter.check("1.2.3.4")
+        assert exc.value.status_code == 429
+        assert int(exc.value.headers["Retry-After"]) >= 1
+
+    def testDeaktiviert(self, monkeypatch):
+        monkeypatch.setattr(RateLimit, "RATE_LIMIT_ENABLED", False)
+        limiter = RateLimiter("test", capacity=1, perMinute=1)
+        limiter.check("x")
+        limiter.check("x")
+
+    def testLoginThrottleNurFehlversuche(self):
+        throttle = LoginThrottle(maxFailures=2, windowSeconds=60)
+        throttle.recordFailure("A@example.com", "1.2.3.4")
+        throttle.check("a@example.com", "1.2.3.4")
+        throttle.recordFailure("a@example.com", "1.2.3.4")
+        with pytest.raises(Exception) as exc:
+            throttle.check("a@example.com", "1.2.3.4")
+        assert exc.value.status_code == 429
+        assert 1 <= int(exc.value.headers["Retry-After"]) <= 60
+        throttle.reset("a@example.com", "1.2.3.4")
+        throttle.check("a@example.com", "1.2.3.4")
+
+    def testLoginThrottleSperrtInhaberNichtAus(self):
+        throttle = LoginThrottle(maxFailures=2, windowSeconds=60)
+        for _ in range(2):
+            throttle.recordFailure("a@example.com", "6.6.6.6")
+        with pytest.raises(Exception):
+            throttle.check("a@example.com", "6.6.6.6")
+        throttle.check("a@example.com", "1.2.3.4")
+
+
+class TestAuthRoutes:
+    def testLoginWirdNachFehlversuchenGesperrt(self):
+        from LazyCookAdministration import app
+
+        client = TestClient(app)
+        form = {"username": "niemand@example.com", "password": "Falsch1!"}
+        codes = [client.post("/auth/login", data=form).status_code for _ in range(6)]
+        assert codes[:5] == [401] * 5
+        assert codes[5] == 429
+
+    def testForgotPasswordProAccount(self):
+        from LazyCookAdministration import app
+
+        client = TestClient(app)
+        body = {"email": "niemand@example.com"}
+        codes = [
+            client.post("/auth/forgot-password", json=body).status_code
+            for _ in range(4)
+        ]
+        assert codes == [200, 200, 200, 429]
@@ -0,0 +1,138 @@
+import sys
+import os
+import inspect
+import sqlite3
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from dao import AccountDAO, AuthorDAO, ExclusionDAO, ExportDAO, FavoriteDAO
+from dao import IngredientDAO, RecipeDAO, SimilarityDAO
+from dao.RecipeDAO import addRecipe, getRecipe
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+    yield
+    Database.closeReader()
+
+
+class TestReadConnection:
+    def testIstSchreibgeschuetzt(self):
+        con = Database.getReadConnection()
+        assert con.execute("PRAGMA query_only").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            con.execute("INSERT INTO Author (name) VALUES ('x')")
+
+    def testWirdProThreadWiederverwendet(self):
+        first = Database.getReadConnection()
+        first.close()
+        assert Database.getReadConnection() is first
+
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(Database.getReadConnection())
+        )
+        thread.start()
+        thread.join()
+        assert other[0] is not first
+
+    def testNeuerPfadOeffnetNeu(self, tmp_path, monkeypatch):
+        first = Database.getReadConnection()
+        monkeypatch.setattr(Database, "DB_PATH", tmp_path / "zweite.db")
+        Database.initDB()
+        assert Database.getReadConnection() is not first
+
+    def testSiehtCommitteteSchreibvorgaenge(self):
+        Database.getReadConnection()
+        rid = addRecipe("Pasta", "")
+        assert getRecipe(rid)["name"] == "Pasta"
+
+    def testOffenerLeserBlockiertSchreiberNicht(self):
+        for name in ("A", "B", "C"):
+            addRecipe(name, "")
+        reading, written = threading.Event(), threading.Event()
+
+        def reader():
+            cursor = Database.getReadConnection().execute("SELECT name FROM Recipe")
+            cursor.fetchone()  # Lesetransaktion bleibt offen
+            reading.set()
+            written.wait(5)
+            Database.closeReader()
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        reading.wait(5)
+        try:
+            rid = addRecipe("D", "")
+        finally:
+            written.set()
+            thread.join()
+        assert getRecipe(rid)["name"] == "D"
+
+
+class TestReplikat:
+    def testLesenVomReplikat(self, tmp_path, monkeypatch):
+        addRecipe("Vorher", "")
+        replica = tmp_path / "replica.db"
+        source = sqlite3.connect(str(Database.DB_PATH))
+        target = sqlite3.connect(str(replica))
+        source.backup(target)
+        source.close()
+        target.close()
+
+        monkeypatch.setattr(Database, "DB_READ_PATH", replica)
+        rid = addRecipe("Nachher", "")
+        assert getRecipe(rid) is None
+        assert getRecipe(1)["name"] == "Vorher"
+
+
+class TestAnnotationen:
+    def testAlleDaoFunktionenSindAnnotiert(self):
+        for module in (
+            AccountDAO,
+            AuthorDAO,
+            ExclusionDAO,
+            ExportDAO,
+            FavoriteDAO,
+            IngredientDAO,
+            RecipeDAO,
+            SimilarityDAO,
+        ):
+            for name, fn in inspect.getmembers(module, inspect.isfunction):
+                if fn.__module__ == module.__name__ and not name.startswith("_"):
+                    assert getattr(fn, "dbAccess", None) in ("read", "write"), name
+
+    def testSchreibenInLesenderFunktionIstVerboten(self):
+        @Database.reads
+        def sneaky():
+            with Database.getDB() as con:
+                con.execute("DELETE FROM Recipe")
+
+        with pytest.raises(RuntimeError):
+            sneaky()
+
+    def testSchreibenInLesendemGeneratorIstVerboten(self):
+        @Database.reads
+        def sneaky():
+            yield 1
+            with Database.getDB() as con:
+                con.execute("DELETE FROM Recipe")
+            yield 2
+
+        rows = sneaky()
+        assert next(rows) == 1
+        # Zwischen den Schritten darf der Aufrufer schreiben
+        addRecipe("Pasta", "")
+        with pytest.raises(RuntimeError):
+            next(rows)
+
+    def testLesenInSchreibenderFunktionIstErlaubt(self):
+        rid = addRecipe("Pasta", "")
+        with Database.getDB():
+            assert getRecipe(rid)["name"] == "Pasta"
@@ -0,0 +1,100 @@
+import sys
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core.Auth import createAccessToken
+from core.Pagination import encodeCursor
+from dao.AccountDAO import createAccount
+from dao.IngredientDAO import addIngredient
+from dao.RecipeDAO import (
+    addRecipe,
+    addIngredientToRecipe,
+    getAllRecipesPaginated,
+    getIngredientsForRecipes,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+
+
+@pytest.fixture
+def recipes():
+    names = ["Pasta", "Auflauf", "Chili", "Eintopf", "Bratkartoffeln"]
+    return {name: addRecipe(name, f"{name} lecker") for name in names}
+
+
+@pytest.fixture
+def client():
+    from LazyCookAdministration import app
+
+    account = createAccount("browse@example.com", "Browse User", "hashedPW")
+    token = createAccessToken({"sub": account["email"]})
+    return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+
+class TestGetAllRecipesPaginated:
+    def testErsteSeiteAlphabetisch(self, recipes):
+        rows = getAllRecipesPaginated(None, 2)
+        assert [r["name"] for r in rows] == ["Auflauf", "Bratkartoffeln"]
+
+    def testFolgeseiteNachCursor(self, recipes):
+        rows = getAllRecipesPaginated(("Bratkartoffeln", recipes["Bratkartoffeln"]), 2)
+        assert [r["name"] for r in rows] == ["Chili", "Eintopf"]
+
+    def testNutztIndexStattScan(self, recipes):
+        con = Database.getConnection()
+        try:
+            plan = [
+                row[3]
+                for row in con.execute(
+                    "EXPLAIN QUERY PLAN SELECT r.id FROM Recipe r "
+                    "WHERE (r.name, r.id) > (?, ?) ORDER BY r.name, r.id LIMIT ?",
+                    ("Chili", 1, 12),
+                )
+            ]
+        finally:
+            con.close()
+        assert not any("TEMP B-TREE" in line for line in plan)
+        assert any("sqlite_autoindex_Recipe" in line for line in plan)
+
+    def testZutatenMehrererRezepte(self, recipes):
+        zid = addIngredient("Tomate", "g")
+        addIngredientToRecipe(recipes["Pasta"], zid, 200)
+        result = getIngredientsForRecipes([recipes["Pasta"], recipes["Chili"]])
+        assert result[recipes["Pasta"]][0]["name"] == "Tomate"
+        assert result[recipes["Chili"]] == []
+
+
+class TestBrowseRoute:
+    def testAlleSeitenOhneLueckenUndDuplikate(self, client, recipes):
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            body = client.get("/recipes", params=params).json()
+            seen.extend(r["name"] for r in body["rezepte"])
+            cursor = body["nextCursor"]
+            if cursor is None:
+                break
+        assert seen == sorted(recipes)
+
+    def testUngueltigerCursor(self, client):
+        assert client.get("/recipes", params={"cursor": "%%%"}).status_code == 400
+        for values in (["Pasta"], ["Pasta", 2**63], ["Pasta", 1.5]):
+            bad = encodeCursor(values)
+            assert client.get("/recipes", params={"cursor": bad}).status_code == 400
+
+    def testOhneLoginAbgelehnt(self):
+        from LazyCookAdministration import app
+
+        assert TestClient(app).get("/recipes").status_code == 401
@@ -0,0 +1,87 @@
+import sys
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core.Auth import createAccessToken
+from dao.AccountDAO import createAccount
+from dao.IngredientDAO import addIngredient
+from dao.RecipeDAO import addRecipe, addIngredientToRecipe
+from dao.SimilarityDAO import getSimilarRecipes
+from services import RecipeSimilarity
+from services.RecipeSimilarity import computeNeighbors, jaccard
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+
+
+@pytest.fixture
+def catalogue():
+    zids = {name: addIngredient(name, "g") for name in "ABCDEFGHIJ"}
+    recipes = {
+        "Pasta": "ABCD",
+        "Pasta Deluxe": "ABCDE",
+        "Lasagne": "ABCF",
+        "Obstsalat": "GHIJ",
+    }
+    rids = {}
+    for name, ingredients in recipes.items():
+        rids[name] = addRecipe(name, "")
+        for letter in ingredients:
+            addIngredientToRecipe(rids[name], zids[letter], 100)
+    return rids
+
+
+class TestComputeNeighbors:
+    def testJaccard(self):
+        assert jaccard({1, 2, 3}, {2, 3, 4}) == 0.5
+        assert jaccard(set(), set()) == 0.0
+
+    def testIdentischeMengenSindNachbarn(self):
+        neighbors = computeNeighbors({1: {1, 2, 3}, 2: {1, 2, 3}, 3: {7, 8, 9}})
+        assert neighbors[1] == [(2, 1.0)]
+        assert neighbors[2] == [(1, 1.0)]
+        assert 3 not in neighbors
+
+    def testSortiertUndBegrenzt(self):
+        sets = {1: set(range(10)), 2: set(range(9)), 3: set(range(8)), 4: set(range(7))}
+        neighbors = computeNeighbors(sets, topK=2)
+        assert [n for n, _ in neighbors[1]] == [2, 3]
+
+    def testDeterministisch(self):
+        sets = {i: {i, i + 1, i + 2, 100} for i in range(50)}
+        assert computeNeighbors(sets) == computeNeighbors(sets)
+
+
+class TestRebuild:
+    def testNachbarnGespeichert(self, catalogue):
+        RecipeSimilarity.rebuild()
+        similar = getSimilarRecipes(catalogue["Pasta"])
+        assert [r["name"] for r in similar] == ["Pasta Deluxe", "Lasagne"]
+        assert similar[0]["score"] == pytest.approx(0.8)
+
+    def testRebuildErsetztAlteEintraege(self, catalogue):
+        RecipeSimilarity.rebuild()
+        RecipeSimilarity.rebuild(topK=1)
+        assert len(getSimilarRecipes(catalogue["Pasta"])) == 1
+
+
+class TestSimilarRoute:
+    def testEndpunkt(self, catalogue):
+        from LazyCookAdministration import app
+
+        RecipeSimilarity.rebuild()
+        account = createAccount("sim@example.com", "Sim", "hashedPW")
+        token = createAccessToken({"sub": account["email"]})
+        client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+        body = client.get(f"/recipes/{catalogue['Lasagne']}/similar").json()
+        assert [r["name"] for r in body["rezepte"]][0] == "Pasta"
+        assert client.get("/recipes/9999/similar").status_code == 404
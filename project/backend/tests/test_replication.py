@@ -0,0 +1,351 @@
+import sys
+import os
+import asyncio
+import json
+import socket
+import sqlite3
+import subprocess
+import time
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core import RateLimit, Replication
+from core.Auth import createAccessToken
+from dao.AccountDAO import createAccount
+from dao.IngredientDAO import addIngredient
+from dao.RecipeDAO import addIngredientToRecipe, addRecipe, getRecipe
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+TOKEN = "replication-test-token"
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "primary.db")
+    monkeypatch.setattr(Database, "DB_READ_PATH", None)
+    monkeypatch.setattr(Database, "WRITES_ALLOWED", True)
+    monkeypatch.setattr(Replication, "REPLICATION_TOKEN", TOKEN)
+    monkeypatch.setattr(Replication, "REPLICATION_PRIMARY_URL", "http://primary")
+    monkeypatch.setattr(Replication, "_source", Replication._SnapshotSource())
+    Database.initDB()
+    yield
+    Database.closeWriter()
+    Database.closeReader()
+
+
+def _serveSnapshots(requests: list):
+    """MockTransport, der wie /replication/snapshot des Primary antwortet."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        assert request.headers[Replication.TOKEN_HEADER] == TOKEN
+        path, etag = Replication.getSnapshot()
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, content=path.read_bytes(), headers={"ETag": etag})
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+class TestSnapshot:
+    def testOhneAenderungGleicherSnapshot(self):
+        addRecipe("Pasta", "")
+        first = Replication.getSnapshot()
+        assert Replication.getSnapshot() == first
+
+    def testNachCommitNeuerSnapshot(self):
+        first = Replication.getSnapshot()
+        addRecipe("Pasta", "")
+        path, etag = Replication.getSnapshot()
+        assert etag != first[1]
+        con = sqlite3.connect(str(path))
+        try:
+            assert con.execute("SELECT name FROM Recipe").fetchall() == [("Pasta",)]
+            assert con.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        finally:
+            con.close()
+
+    def testOhneZugangsdaten(self):
+        account = createAccount("geheim@example.com", "Geheim", "hashedPW")
+        con = Database.getConnection()
+        con.execute(
+            "INSERT INTO RefreshToken (AccountID, token, expiresAt) VALUES (?, ?, ?)",
+            (account["id"], "refresh-geheim", "2999-01-01"),
+        )
+        con.execute(
+            "INSERT INTO PasswordResetToken (kontoID, tokenHash, expiresAt) "
+            "VALUES (?, ?, ?)",
+            (account["id"], "reset-geheim", "2999-01-01"),
+        )
+        con.commit()
+        con.close()
+
+        path, _ = Replication.getSnapshot()
+        con = sqlite3.connect(str(path))
+        try:
+            assert con.execute(
+                "SELECT email, hashedPassword FROM Account"
+            ).fetchall() == [("geheim@example.com", "")]
+            assert con.execute("SELECT COUNT(*) FROM RefreshToken").fetchone() == (0,)
+            assert con.execute(
+                "SELECT COUNT(*) FROM PasswordResetToken"
+            ).fetchone() == (0,)
+        finally:
+            con.close()
+        data = path.read_bytes()
+        assert b"hashedPW" not in data and b"refresh-geheim" not in data
+
+    def testGeteiltUndAufgeraeumt(self, tmp_path, monkeypatch):
+        directory = tmp_path / "replication"
+        # Letzter Commit lange vor dem ersten Snapshot
+        past = time.time_ns() - 10_000_000_000
+        os.utime(Database.DB_PATH, ns=(past, past))
+        os.utime(f"{Database.DB_PATH}-wal", ns=(past, past))
+        first = Replication.getSnapshot()
+        # Ein zweiter Worker übernimmt die Datei, statt selbst zu kopieren
+        with monkeypatch.context() as m:
+            m.setattr(
+                Replication._SnapshotSource,
+                "_SnapshotSource__create",
+                lambda self, directory: pytest.fail("neu erzeugt"),
+            )
+            assert Replication._SnapshotSource().get() == first
+        for name in ("B", "C"):
+            addRecipe(name, "")
+            latest = Replication.getSnapshot()
+        assert latest[0].name == f"primary-{latest[1][:16]}.db"
+        assert not first[0].exists()
+        assert len(list(directory.glob("primary-*.db"))) == 2
+
+
+class TestPull:
+    def testReplikatLiestVomSnapshot(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Replication, "REPLICATION_DIR", tmp_path / "replica")
+        rid = addRecipe("Pasta", "")
+        requests = []
+        with _serveSnapshots(requests) as client:
+            assert Replication.pullOnce(client) is True
+        assert Database.DB_READ_PATH.parent == tmp_path / "replica"
+        assert getRecipe(rid)["name"] == "Pasta"
+
+    def testUnveraendertWirdNichtNeuGeladen(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Replication, "REPLICATION_DIR", tmp_path / "replica")
+        requests = []
+        with _serveSnapshots(requests) as client:
+            Replication.pullOnce(client)
+            # Innerhalb des Intervalls fragt niemand beim Primary nach
+            assert Replication.pullOnce(client) is False
+            assert len(requests) == 1
+            assert Replication.pullOnce(client, force=True) is False
+        assert requests[-1].headers["If-None-Match"]
+
+    def testAtomarerWechselAufNeuenSnapshot(self, tmp_path, monkeypatch):
+        directory = tmp_path / "replica"
+        monkeypatch.setattr(Replication, "REPLICATION_DIR", directory)
+        with _serveSnapshots([]) as client:
+            Replication.pullOnce(client)
+            old = Database.DB_READ_PATH
+            oldReader = Database.getReadConnection()
+            rid = addRecipe("Pasta", "")
+            assert Replication.pullOnce(client, force=True) is True
+            addRecipe("Pizza", "")
+            Replication.pullOnce(client, force=True)
+        assert getRecipe(rid)["name"] == "Pasta"
+        assert Database.getReadConnection() is not oldReader
+        # Nur der aktuelle und der vorige Snapshot bleiben liegen
+        assert not old.exists()
+        assert len(list(directory.glob("replica-*.db"))) == 2
+
+    def testBeschaedigteUebertragungWirdVerworfen(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Replication, "REPLICATION_DIR", tmp_path / "replica")
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(
+                200, content=b"kaputt", headers={"ETag": "x"}
+            )
+        )
+        with httpx.Client(transport=transport) as client:
+            with pytest.raises(ValueError):
+                Replication.pullOnce(client)
+        assert Database.DB_READ_PATH is None
+
+
+class TestWeiterleitung:
+    def _forward(self, monkeypatch, handler, headers=()):
+        monkeypatch.setattr(Replication, "REPLICATION_ROLE", "replica")
+        middleware = Replication.ReplicaForwardMiddleware(app=None)
+        middleware._ReplicaForwardMiddleware__client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://primary"
+        )
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/auth/login",
+            "query_string": b"",
+            "headers": [(k.encode(), v.encode()) for k, v in headers],
+            "client": ("203.0.113.7", 50000),
+        }
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"{}", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(middleware(scope, receive, send))
+        return sent
+
+    def testClientAdresseWirdMitgeschickt(self, monkeypatch):
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers["x-forwarded-for"])
+            return httpx.Response(200, json={})
+
+        self._forward(monkeypatch, handler, [("x-forwarded-for", "1.2.3.4")])
+        assert seen == ["203.0.113.7"]
+
+        # Hinter einem Proxy: dessen Eintrag zählt, nicht der des Clients
+        monkeypatch.setattr(RateLimit, "TRUST_PROXY_HEADERS", True)
+        self._forward(
+            monkeypatch, handler, [("x-forwarded-for", "1.2.3.4, 198.51.100.9")]
+        )
+        assert seen[-1] == "198.51.100.9"
+
+    def testPrimaryNichtErreichbar(self, monkeypatch):
+        def handler(request):
+            raise httpx.ConnectError("weg", request=request)
+
+        sent = self._forward(monkeypatch, handler)
+        assert sent[0]["status"] == 502
+        assert json.loads(sent[1]["body"]) == {"detail": "Primary nicht erreichbar"}
+
+
+class TestSchreibsperre:
+    def testReplikatSchreibtNichtLokal(self, monkeypatch):
+        monkeypatch.setattr(Database, "WRITES_ALLOWED", False)
+        with pytest.raises(RuntimeError):
+            addRecipe("Pasta", "")
+
+
+# ── Mehrere lokale Prozesse ────────────────────────────────────
+
+
+def _freePort() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start(port: int, env: dict) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "LazyCookAdministration:app"]
+        + ["--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND,
+        env={**os.environ, **env},
+    )
+    _waitFor(lambda: httpx.get(f"http://127.0.0.1:{port}/health/ready").is_success)
+    return process
+
+
+def _waitFor(check, timeout: float = 20) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if check():
+                return
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            raise AssertionError("Zeitüberschreitung")
+        time.sleep(0.1)
+
+
+def _usageCount(path) -> int:
+    con = sqlite3.connect(str(path))
+    try:
+        return con.execute("SELECT COUNT(*) FROM IngredientUsage").fetchone()[0]
+    finally:
+        con.close()
+
+
+class TestMehrereProzesse:
+    def testPrimaryUndReplikat(self, tmp_path):
+        account = createAccount("koch@example.com", "Koch", "x")
+        rid = addRecipe("Pasta", "")
+        addIngredientToRecipe(rid, addIngredient("Nudeln", "g"), 250)
+        Database.closeWriter()
+
+        primaryPort, replicaPort = _freePort(), _freePort()
+        common = {
+            "REPLICATION_TOKEN": TOKEN,
+            "REPLICATION_INTERVAL_SECONDS": "0.2",
+            "CATALOGUE_POLL_SECONDS": "0.2",
+            "RATE_LIMIT_ENABLED": "0",
+        }
+        processes = []
+        try:
+            processes.append(
+                _start(
+                    primaryPort,
+                    {
+                        **common,
+                        "REPLICATION_ROLE": "primary",
+                        "DB_PATH": str(Database.DB_PATH),
+                        "REPLICATION_DIR": str(tmp_path / "primary-snapshots"),
+                    },
+                )
+            )
+            processes.append(
+                _start(
+                    replicaPort,
+                    {
+                        **common,
+                        "REPLICATION_ROLE": "replica",
+                        "REPLICATION_PRIMARY_URL": f"http://127.0.0.1:{primaryPort}",
+                        "DB_PATH": str(tmp_path / "replica-local.db"),
+                        "REPLICATION_DIR": str(tmp_path / "replica-snapshots"),
+                    },
+                )
+            )
+            token = createAccessToken({"sub": "koch@example.com"})
+            replica = httpx.Client(
+                base_url=f"http://127.0.0.1:{replicaPort}",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+            # Lesen bedient das Replikat selbst
+            names = [r["name"] for r in replica.get("/recipes").json()["rezepte"]]
+            assert names == ["Pasta"]
+
+            # Schreiben landet beim Primary
+            assert replica.put(f"/favorites/{rid}").status_code == 204
+            con = sqlite3.connect(str(Database.DB_PATH))
+            try:
+                assert con.execute(
+                    "SELECT rid FROM Favorites WHERE AccountID = ?", (account["id"],)
+                ).fetchall() == [(rid,)]
+            finally:
+                con.close()
+
+            # Suche läuft lokal, die Nutzung geht an den Primary
+            search = replica.post(
+                "/recipes/search",
+                json={"zutaten": [{"name": "Nudeln", "amount": 1, "unit": "g"}]},
+            )
+            assert [r["name"] for r in search.json()["rezepte"]] == ["Pasta"]
+            _waitFor(lambda: _usageCount(Database.DB_PATH) == 1)
+
+            # Neue Rezepte auf dem Primary erreichen das Replikat
+            addRecipe("Pizza", "")
+            Database.closeWriter()
+            _waitFor(lambda: len(replica.get("/recipes").json()["rezepte"]) == 2)
+        finally:
+            # Replikat zuerst, sonst meldet sein Poller den fehlenden Primary
+            for process in reversed(processes):
+                process.terminate()
+                process.wait(timeout=10)
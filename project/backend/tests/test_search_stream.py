@@ -0,0 +1,157 @@
+import sys
+import os
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core.Auth import createAccessToken
+from dao.AccountDAO import createAccount
+from dao.FavoriteDAO import addFavorite
+from dao.IngredientDAO import addIngredient
+from dao.RecipeDAO import addRecipe, addIngredientToRecipe
+from routes import RecipeRoutes
+
+SEARCH = {"zutaten": [{"name": "Tomate", "amount": 1, "unit": "g"}]}
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+
+
+@pytest.fixture
+def account():
+    return createAccount("stream@example.com", "Stream User", "hashedPW")
+
+
+@pytest.fixture
+def client(account):
+    from LazyCookAdministration import app
+
+    token = createAccessToken({"sub": account["email"]})
+    return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+
+@pytest.fixture
+def recipes():
+    tomate = addIngredient("Tomate", "g")
+    salz = addIngredient("Salz", "g")
+    rids = []
+    for i in range(60):
+        rid = addRecipe(f"Rezept {i:02d}", "")
+        addIngredientToRecipe(rid, tomate, 100)
+        if i % 2:
+            addIngredientToRecipe(rid, salz, 5)
+        rids.append(rid)
+    return rids
+
+
+def _ndjson(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestNdjson:
+    def testTopIngredientsZuerstDannRezepteDannEnde(self, client, recipes):
+        response = client.post(
+            "/recipes/search",
+            json={**SEARCH, "pageSize": 40},
+            headers={"Accept": "application/x-ndjson"},
+        )
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = _ndjson(response)
+        assert events[0]["type"] == "topIngredients"
+        assert events[0]["topIngredients"][0]["name"] == "Tomate"
+        assert [e["type"] for e in events[1:-1]] == ["recipe"] * 40
+        assert events[-1] == {"type": "end", "count": 40}
+
+    def testGleicheReihenfolgeWieOhneStreaming(self, client, recipes):
+        body = {**SEARCH, "pageSize": 25, "index": 1, "personalized": False}
+        plain = client.post("/recipes/search", json=body).json()["rezepte"]
+        streamed = [
+            e["recipe"]
+            for e in _ndjson(
+                client.post(
+                    "/recipes/search",
+                    json=body,
+                    headers={"Accept": "application/x-ndjson"},
+                )
+            )
+            if e["type"] == "recipe"
+        ]
+        assert streamed == plain
+        assert len(plain) == 25
+
+    def testFavoritenUeberBlockgrenzenHinweg(self, client, account, recipes):
+        for rid in recipes:
+            addFavorite(account["id"], rid)
+        events = _ndjson(
+            client.post(
+                "/recipes/search",
+                json={**SEARCH, "pageSize": 60},
+                headers={"Accept": "application/x-ndjson"},
+            )
+        )
+        assert all(e["recipe"]["isFavorite"] for e in events if e["type"] == "recipe")
+
+
+class TestAccept:
+    @pytest.mark.parametrize(
+        "accept, expected",
+        [
+            ("application/x-ndjson", "application/x-ndjson"),
+            ("text/event-stream;q=0.9, */*;q=0.5", "text/event-stream"),
+            ("application/x-ndjson;q=0, application/json", None),
+            ("application/json, application/x-ndjson;q=0.5", None),
+            ("*/*", None),
+            ("", None),
+        ],
+    )
+    def testQWerte(self, accept, expected):
+        assert RecipeRoutes._streamFormat(accept) == expected
+
+    def testQNullStreamtNicht(self, client, recipes):
+        response = client.post(
+            "/recipes/search",
+            json=SEARCH,
+            headers={"Accept": "application/x-ndjson;q=0, application/json"},
+        )
+        assert response.headers["content-type"].startswith("application/json")
+
+
+class TestSse:
+    def testEreignisse(self, client, recipes):
+        response = client.post(
+            "/recipes/search",
+            json={**SEARCH, "pageSize": 3},
+            headers={"Accept": "text/event-stream"},
+        )
+        assert response.headers["content-type"].startswith("text/event-stream")
+        blocks = response.text.strip().split("\n\n")
+        assert [b.split("\n")[0] for b in blocks] == [
+            "event: topIngredients",
+            "event: recipe",
+            "event: recipe",
+            "event: recipe",
+            "event: end",
+        ]
+        assert json.loads(blocks[-1].split("data: ")[1]) == {"count": 3}
+
+
+class TestPageSize:
+    def testStandardBleibtZwoelf(self, client, recipes):
+        assert len(client.post("/recipes/search", json=SEARCH).json()["rezepte"]) == 12
+
+    def testZuGrosseSeiteWirdBegrenzt(self, client, recipes, monkeypatch):
+        monkeypatch.setattr(RecipeRoutes, "SEARCH_MAX_PAGE_SIZE", 5)
+        response = client.post("/recipes/search", json={**SEARCH, "pageSize": 1000})
+        assert response.status_code == 200
+        assert len(response.json()["rezepte"]) == 5
+
+    def testZuKleineSeiteWirdBegrenzt(self, client, recipes):
+        response = client.post("/recipes/search", json={**SEARCH, "pageSize": 0})
+        assert len(response.json()["rezepte"]) == 1
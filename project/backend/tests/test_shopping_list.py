@@ -0,0 +1,127 @@
+import sys
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core.Auth import createAccessToken
+from dao.AccountDAO import createAccount
+from dao.IngredientDAO import addIngredient
+from dao.RecipeDAO import addRecipe, addIngredientToRecipe, aggregateIngredients
+from domain.units import normalizeUnit
+from services import ShoppingListService
+
+
+@pytest.fixture(autouse=True)
+def isolatedDb(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    Database.initDB()
+    ShoppingListService.invalidate()
+    yield
+    ShoppingListService.invalidate()
+
+
+@pytest.fixture
+def recipes():
+    mehl = addIngredient("Mehl", "g")
+    milch = addIngredient("Milch", "l")
+    ei = addIngredient("Ei", "Stück")
+    pfannkuchen = addRecipe("Pfannkuchen", "")
+    addIngredientToRecipe(pfannkuchen, mehl, 200)
+    addIngredientToRecipe(pfannkuchen, milch, 0.5)
+    addIngredientToRecipe(pfannkuchen, ei, 2)
+    kuchen = addRecipe("Kuchen", "")
+    addIngredientToRecipe(kuchen, mehl, 300)
+    addIngredientToRecipe(kuchen, ei, 4)
+    return {"Pfannkuchen": pfannkuchen, "Kuchen": kuchen}
+
+
+def _byName(items):
+    return {item["name"]: item for item in items}
+
+
+class TestUnits:
+    def testUmrechnung(self):
+        assert normalizeUnit(1.5, "kg") == (1500.0, "g")
+        assert normalizeUnit(2, "EL") == (30.0, "ml")
+        assert normalizeUnit(3, "Stück") == (3, "Stück")
+
+
+class TestAggregateIngredients:
+    def testSummeUeberRezepte(self, recipes):
+        items = _byName(aggregateIngredients(list(recipes.values())))
+        assert items["Mehl"]["amount"] == 500
+        assert items["Mehl"]["recipeIds"] == sorted(recipes.values())
+        assert items["Ei"] == {
+            "name": "Ei",
+            "unit": "Stück",
+            "amount": 6,
+            "recipeIds": sorted(recipes.values()),
+        }
+
+    def testEinheitNormalisiert(self, recipes):
+        items = _byName(aggregateIngredients([recipes["Pfannkuchen"]]))
+        assert items["Milch"]["unit"] == "ml"
+        assert items["Milch"]["amount"] == 500
+
+
+class TestBuildShoppingList:
+    def testPortionenUndVorraete(self, recipes):
+        result = ShoppingListService.buildShoppingList(
+            list(recipes.values()), 2, [("mehl", 0.5, "kg"), ("Ei", 12, "Stück")]
+        )
+        items = _byName(result["items"])
+        assert items["Mehl"]["amount"] == 500
+        assert "Ei" not in items
+        assert items["Milch"]["amount"] == 1000
+
+    def testAndereEinheitWirdNichtAbgezogen(self, recipes):
+        result = ShoppingListService.buildShoppingList(
+            [recipes["Kuchen"]], 1, [("Mehl", 2, "Stück")]
+        )
+        assert _byName(result["items"])["Mehl"]["amount"] == 300
+
+    def testUnbekannteRezepte(self, recipes):
+        result = ShoppingListService.buildShoppingList([recipes["Kuchen"], 9999], 1, [])
+        assert result["missingRecipeIds"] == [9999]
+
+    def testErgebnisGecacht(self, recipes, monkeypatch):
+        rids = list(recipes.values())
+        ShoppingListService.buildShoppingList(rids, 1, [])
+
+        def fail(*args):
+            raise AssertionError("Cache nicht benutzt")
+
+        monkeypatch.setattr(ShoppingListService.RecipeDAO, "aggregateIngredients", fail)
+        ShoppingListService.buildShoppingList(list(reversed(rids)), 1, [])
+        with pytest.raises(AssertionError):
+            ShoppingListService.buildShoppingList(rids, 3, [])
+
+
+class TestShoppingListRoute:
+    @pytest.fixture
+    def client(self):
+        from LazyCookAdministration import app
+
+        account = createAccount("shop@example.com", "Shop", "hashedPW")
+        token = createAccessToken({"sub": account["email"]})
+        return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+    def testEndpunkt(self, client, recipes):
+        response = client.post(
+            "/shopping-list",
+            json={
+                "recipeIds": list(recipes.values()),
+                "servings": 1,
+                "onHand": [{"name": "Milch", "amount": 200, "unit": "ml"}],
+            },
+        )
+        assert response.status_code == 200
+        assert _byName(response.json()["items"])["Milch"]["amount"] == 300
+
+    def testOhneRezepte(self, client):
+        response = client.post("/shopping-list", json={"recipeIds": []})
+        assert response.status_code == 400
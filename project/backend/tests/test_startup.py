@@ -0,0 +1,95 @@
+import sys
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.Database as Database
+from core import Catalogue, Metrics, Startup
+from dao.RecipeDAO import addRecipe
+
+
+@pytest.fixture(autouse=True)
+def isolatedStartup(tmp_path, monkeypatch):
+    monkeypatch.setattr(Database, "DB_PATH", tmp_path / "test.db")
+    monkeypatch.setattr(Startup, "_timings", {})
+    monkeypatch.setattr(Startup, "_warmedInPid", None)
+    monkeypatch.setattr(Startup, "_forkedAt", None)
+    monkeypatch.setattr(Startup, "_ready", False)
+    monkeypatch.setattr(Catalogue, "_holders", list(Catalogue._holders))
+    Metrics.reset()
+    yield
+    Metrics.reset()
+
+
+@pytest.fixture
+def holder():
+    calls = []
+    holder = Catalogue.register("test", lambda: calls.append(1) or len(calls))
+    holder.calls = calls
+    return holder
+
+
+class TestWarmUp:
+    def testBautAlleStrukturenVorDemErstenRequest(self, holder):
+        Startup.warmUp()
+        assert holder.isBuilt()
+        assert holder.calls == [1]
+        assert Startup._timings["warmUp"] > 0
+
+    def testOhnePreloadWaermtDerWorkerSelbstAuf(self, holder):
+        Startup.startWorker()
+        assert holder.isBuilt()
+        assert not Startup.isPreloaded()
+
+    def testNachPreloadWirdNichtErneutAufgewaermt(self, holder, monkeypatch):
+        Startup.warmUp()
+        # Wie nach dem Fork: der Master hat eine andere PID
+        monkeypatch.setattr(Startup, "_warmedInPid", os.getpid() + 1)
+        Startup.afterFork()
+        Startup.startWorker()
+        assert holder.calls == [1]
+        assert Startup.isPreloaded()
+
+    def testAenderungZwischenPreloadUndPollerWirdErkannt(self, holder):
+        Startup.warmUp()
+        addRecipe("Pasta", "")
+        Catalogue.startPolling()
+        Catalogue.stopPolling()
+        assert Catalogue.refresh() is True
+        assert holder.calls == [1, 1]
+
+
+class TestReadiness:
+    def testNichtBereitVorDemAufwaermen(self):
+        from LazyCookAdministration import app
+
+        response = TestClient(app).get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+
+    def testBereitNachLifespan(self):
+        from LazyCookAdministration import app
+
+        with TestClient(app) as client:
+            response = client.get("/health/ready")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        assert "warmUp" in body["timingsMs"]
+        assert not Startup.isReady()
+
+    def testLiveOhneAufwaermen(self):
+        from LazyCookAdministration import app
+
+        assert TestClient(app).get("/health/live").json() == {"status": "ok"}
+
+    def testStartzeitenAlsMetrik(self):
+        Startup.recordImport(0.3)
+        Startup.warmUp()
+        Startup.markReady()
+        text = Metrics.renderPrometheus()
+        assert 'lazycook_startup_duration_seconds_count{phase="import"} 1' in text
+        assert 'lazycook_startup_duration_seconds_count{phase="warmUp"} 1' in text